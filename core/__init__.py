@@ -2,6 +2,15 @@
 from .news import News
 from .status import Status
 from .settings import Settings
-from core.hq.hq_manager import HQManager
-from core.hq.hq_window import HQWindow
 
+
+def __getattr__(name):
+    # the HQ is imported on first use (see tools.lazyimport)
+    if name == 'HQManager':
+        from core.hq.hq_manager import HQManager
+        return HQManager
+    if name == 'HQWindow':
+        from core.hq.hq_window import HQWindow
+        return HQWindow
+
+    raise AttributeError("module 'core' has no attribute '%s'" % name)
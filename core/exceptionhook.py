@@ -3,8 +3,6 @@ import sys
 import time
 import traceback
 
-from PyQt5 import QtWidgets, QtCore
-
 
 def exception_log_and_kill_hook(exctype, value, tb, joan_module, events):
     # trigger the event to transition the module to ERROR state
@@ -33,6 +31,9 @@ def exception_log_and_kill_hook(exctype, value, tb, joan_module, events):
             joan_module)
 
     try:
+        # Qt is imported here, not at the top (see tools.lazyimport)
+        from PyQt5 import QtWidgets, QtCore
+
         app = QtWidgets.QApplication(sys.argv)
         message_box = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Critical, 'An error occurred', dialog_message)
         message_box.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
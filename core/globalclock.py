@@ -0,0 +1,31 @@
+import ctypes
+import multiprocessing as mp
+import time
+
+
+class GlobalClock:
+    """
+    Master clock for the lock-step mode of JOAN (see HQManager.enable_lock_step). The clock holds a common epoch in shared memory; every module process
+    ticks on the grid epoch + phase offset + n * time step, such that all modules step in phase (e.g. hardware, then carla interface, then haptic
+    controllers, then recorder) instead of each on a free-running clock. perf_counter_ns is a system-wide monotonic clock, so no barrier is needed.
+    """
+
+    def __init__(self, time_step_in_ms):
+        """
+        :param time_step_in_ms: time step of the global tick, the time steps of all modules should be a multiple of it
+        """
+        self.time_step_in_ns = int(time_step_in_ms * 1e6)
+        self._epoch = mp.RawValue(ctypes.c_int64, 0)
+
+    def start(self):
+        """
+        Start a new grid, called before the module processes are started
+        """
+        self._epoch.value = time.perf_counter_ns()
+
+    @property
+    def epoch(self):
+        """
+        perf_counter_ns() at which the grid starts
+        """
+        return self._epoch.value
@@ -0,0 +1,158 @@
+import logging
+import time
+
+from PyQt5 import QtCore
+
+from core.statesenum import State
+from modules.joanmodules import JOANModules
+
+logger = logging.getLogger('joan.headless')
+
+
+class HeadlessRunner:
+    """
+    Runs trials without the GUI, once per condition of an experiment or once with the current settings, and reports the status of every module to
+    the 'joan.headless' logger. See headless.py for the command line interface.
+    """
+    poll_interval_in_s = 0.01
+
+    def __init__(self, hq_manager, trial_duration_in_s=None, status_interval_in_s=1.0, ready_timeout_in_s=60.0):
+        """
+        :param hq_manager: HQManager(headless=True) with all modules added
+        :param trial_duration_in_s: duration of a trial, after which the modules are stopped; None to run until a module stops all modules (e.g. at
+        the end of a scenario) or the runner is interrupted (Ctrl+C)
+        :param status_interval_in_s: time between the status reports of a running trial
+        :param ready_timeout_in_s: maximum time the modules may take to get ready, the trial fails otherwise
+        """
+        self.hq_manager = hq_manager
+        self.trial_duration_in_s = trial_duration_in_s
+        self.status_interval_in_s = status_interval_in_s
+        self.ready_timeout_in_s = ready_timeout_in_s
+
+    @property
+    def _process_modules(self):
+        return {module: module_manager for module, module_manager in self.hq_manager.instantiated_modules.items()
+                if module_manager.use_state_machine_and_process}
+
+    def run_experiment(self, experiment_path):
+        """
+        Run a trial for every condition in the active condition sequence of an experiment, the transitions in between are executed as in the GUI
+        :param experiment_path: path of the experiment JSON file
+        :return: number of failed trials
+        """
+        experiment_manager = self.hq_manager.instantiated_modules.get(JOANModules.EXPERIMENT_MANAGER)
+        if experiment_manager is None:
+            experiment_manager = self.hq_manager.add_module(JOANModules.EXPERIMENT_MANAGER)
+
+        experiment_manager.load_experiment(experiment_path)
+        missing_modules = [str(module) for module in experiment_manager.current_experiment.modules_included
+                           if module not in self.hq_manager.instantiated_modules]
+        if missing_modules:
+            raise ValueError('The experiment includes modules that were not added: ' + ', '.join(missing_modules))
+
+        failed_trials = 0
+        while True:
+            previous_condition_index = experiment_manager.active_condition_index
+            if not experiment_manager.transition_to_next_condition() or experiment_manager.active_condition_index == previous_condition_index:
+                break  # end of the condition sequence
+
+            if not self.run_trial(experiment_manager.active_condition.name):
+                failed_trials += 1
+
+        return failed_trials
+
+    def run_trial(self, name='trial'):
+        """
+        Run one trial with the current settings: get all modules ready, run them and stop them
+        :param name: name of the trial in the log, e.g. the condition
+        :return: True if no module went to the error state
+        """
+        logger.info('%s: initializing', name)
+        self.hq_manager.initialize_modules()
+        if not self._all_modules_in(State.INITIALIZED):
+            return self._fail(name)
+
+        logger.info('%s: getting ready', name)
+        t0 = time.perf_counter()
+        self.hq_manager.get_ready_modules()
+        getting_ready = self._wait_until(lambda: self.hq_manager.modules_are_ready and
+                                         all(module_manager.state_machine.current_state is not State.INITIALIZED
+                                             for module_manager in self._process_modules.values()), self.ready_timeout_in_s)
+        if not getting_ready or not self._all_modules_in(State.READY):
+            if not getting_ready:
+                logger.error('%s: the modules did not get ready within %.0f s', name, self.ready_timeout_in_s)
+            return self._fail(name)
+        logger.info('%s: ready in %.2f s', name, time.perf_counter() - t0)
+
+        self.hq_manager.start_modules()
+        logger.info('%s: running%s', name, ' for %.0f s' % self.trial_duration_in_s if self.trial_duration_in_s else '')
+        t0 = time.perf_counter()
+        next_status_time = t0 + self.status_interval_in_s
+        try:
+            while self._all_modules_in(State.RUNNING):
+                now = time.perf_counter()
+                if self.trial_duration_in_s and now - t0 >= self.trial_duration_in_s:
+                    break
+                if now >= next_status_time:
+                    self.log_status()
+                    next_status_time += self.status_interval_in_s
+
+                self._process_events()
+        finally:
+            # also when interrupted (Ctrl+C), such that the processes end and the data is saved
+            succeeded = not any(module_manager.state_machine.current_state is State.ERROR for module_manager in self._process_modules.values())
+            self.log_status()
+            self.hq_manager.stop_modules()
+
+        if not succeeded:
+            return self._fail(name)
+
+        logger.info('%s: finished after %.1f s', name, time.perf_counter() - t0)
+        return True
+
+    def log_status(self):
+        """
+        Report the state, mean loop frequency, overruns and latest metrics of every module
+        """
+        for module, module_manager in self._process_modules.items():
+            status = [str(module_manager.state_machine.current_state)]
+            shared_variables = module_manager.shared_variables
+            if shared_variables is not None:
+                status.append('%.1f Hz' % shared_variables.mean_running_frequency)
+                status.append('%d overruns' % shared_variables.overrun_count)
+            status.extend('%s=%s' % (key, value) for key, value in module_manager.metrics.items())
+
+            logger.info('  %s: %s', module, ', '.join(status))
+
+    def _fail(self, name):
+        for module, module_manager in self._process_modules.items():
+            if module_manager.state_machine.current_state is State.ERROR:
+                logger.error('%s: %s is in the error state. %s', name, module, module_manager.state_machine.state_message)
+
+        self.hq_manager.stop_modules()
+        logger.error('%s: failed', name)
+        return False
+
+    def _all_modules_in(self, state):
+        return all(module_manager.state_machine.current_state is state for module_manager in self._process_modules.values())
+
+    def _process_events(self):
+        """
+        Deliver the Qt events (messages of the processes, stop requests, the get-ready timer of the HQ) and sleep until the next poll
+        """
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(self.poll_interval_in_s)
+
+    def _wait_until(self, condition, timeout_in_s):
+        """
+        :param condition: callable
+        :param timeout_in_s: maximum time to wait
+        :return: True if the condition was met before the timeout
+        """
+        end_time = time.perf_counter() + timeout_in_s
+        while not condition():
+            if time.perf_counter() >= end_time:
+                return False
+            self._process_events()
+
+        return True
@@ -1,15 +1,18 @@
 """Action class for JOAN menu"""
+import json
 import os
+import time
 
 from PyQt5 import QtCore
 from PyQt5.QtCore import pyqtSignal
 
 from core import News
 from core import Settings
+from core.globalclock import GlobalClock
 from core.hq.centralstatemonitor import CentralStateMonitor
-from core.hq.hq_window import HQWindow
 from core.signals import Signals
 from core.statesenum import State
+from core.tickscheduler import OverrunPolicy
 from modules.joanmodules import JOANModules
 
 
@@ -19,12 +22,16 @@ class HQManager(QtCore.QObject):
     """
     signal_stop_all_modules = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, headless=False):
         """
         Initialize
+        :param headless: if True, there is no HQ window and the modules have no dialogs, such that JOAN can run without a QApplication (only a
+        QCoreApplication), e.g. from a script or on a server, see headless.py
         """
         super(QtCore.QObject, self).__init__()
 
+        self.headless = headless
+
         self.central_state_monitor = CentralStateMonitor()
 
         # News
@@ -40,9 +47,34 @@ class HQManager(QtCore.QObject):
         # dictionary to keep track of the instantiated modules
         self._instantiated_modules = {}
 
-        # create window, show it
-        self.window = HQWindow(self)
-        self.window.show()
+        # CPU cores that are reserved for modules in high-rate mode
+        self._reserved_cpu_cores = set()
+
+        # master clock of the lock-step mode (None = every module runs on its own clock), see enable_lock_step
+        self.global_clock = None
+
+        # number of spans kept per module process for the trace export (0 = no span tracing), see enable_span_tracing
+        self.span_buffer_length = 0
+
+        # keep the module processes alive between trials, see enable_warm_restart
+        self.warm_restart = False
+
+        # modules that are getting ready (see get_ready_modules), and the timer that checks their progress without blocking the GUI
+        self._modules_getting_ready = []
+        self._get_ready_timer = QtCore.QTimer()
+        self._get_ready_timer.setInterval(20)
+        self._get_ready_timer.timeout.connect(self._check_get_ready_progress)
+
+        # if True, the timing statistics of all modules are saved to JSON when the modules are stopped (toggled in the View menu)
+        self.save_timing_statistics = False
+
+        # create window, show it (the window is imported here, such that Qt widgets are not loaded in headless mode)
+        if headless:
+            self.window = None
+        else:
+            from core.hq.hq_window import HQWindow
+            self.window = HQWindow(self)
+            self.window.show()
 
         # connect signals: signal_stop_all_modules, which can be called from the modules to stop all other modules
         self.signal_stop_all_modules.connect(self.stop_modules)
@@ -58,53 +90,295 @@ class HQManager(QtCore.QObject):
 
     def get_ready_modules(self):
         """
-        Get all modules ready
+        Get all modules ready, in parallel: the processes of all modules are started at once and get ready in the background, except for modules that
+        have to wait for other modules (ModuleManager.get_ready_after), which are started as soon as those are ready. Returns immediately; the progress is
+        shown in the HQ window.
         """
-        for _, module in self._instantiated_modules.items():
-            if module.use_state_machine_and_process:
-                module.state_machine.request_state_change(State.READY)
+        self._modules_getting_ready = [module_manager for module_manager in self._instantiated_modules.values()
+                                       if module_manager.use_state_machine_and_process and module_manager.state_machine.current_state is State.INITIALIZED]
+
+        # the processes read each other's shared variables, so either all resident processes are restarted warm or none are
+        if self.warm_restart and not all(module_manager.can_restart_warm() for module_manager in self._modules_getting_ready):
+            for module_manager in self._modules_getting_ready:
+                module_manager.end_resident_process()
+
+        self._check_get_ready_progress()
+        if self._modules_getting_ready:
+            self._get_ready_timer.start()
+
+    @property
+    def modules_are_ready(self):
+        """
+        True if the processes of all modules finished their get_ready
+        """
+        return all(module_manager.process_is_ready for module_manager in self._instantiated_modules.values())
+
+    def _check_get_ready_progress(self):
+        """
+        Get the modules ready whose dependencies are ready and show the progress, called periodically while modules are getting ready
+        """
+        waiting_for = []
+        for module_manager in self._modules_getting_ready:
+            current_state = module_manager.state_machine.current_state
+            if current_state is State.INITIALIZED:
+                dependencies = [self._instantiated_modules[module] for module in module_manager.get_ready_after if module in self._instantiated_modules]
+                if all(dependency.state_machine.current_state is State.READY and dependency.process_is_ready for dependency in dependencies):
+                    module_manager.state_machine.request_state_change(State.READY)
+                    current_state = module_manager.state_machine.current_state
+
+            if current_state is State.INITIALIZED or (current_state is State.READY and not module_manager.process_is_ready):
+                waiting_for.append(str(module_manager.module))
+
+        if self.window:
+            self.window.show_get_ready_progress(len(self._modules_getting_ready) - len(waiting_for), len(self._modules_getting_ready), waiting_for)
+
+        if not waiting_for:
+            # all ready, or some failed (the central state monitor stops the other modules then)
+            self._get_ready_timer.stop()
+            self._modules_getting_ready = []
 
     def start_modules(self):
         """
         Initialize modules
         """
+        if self.global_clock:
+            self.global_clock.start()
+
         for _, module in self._instantiated_modules.items():
             if module.use_state_machine_and_process:
                 module.state_machine.request_state_change(State.RUNNING)
 
     def stop_modules(self):
         """
-        Stop all modules
+        Stop all modules, the timing statistics are saved (if enabled) when a module was running
         """
+        was_running = False
         for _, module in self._instantiated_modules.items():
             if module.use_state_machine_and_process:
+                was_running |= module.state_machine.current_state is State.RUNNING
                 module.state_machine.request_state_change(State.STOPPED)
 
-    def add_module(self, module: JOANModules, parent=None, time_step_in_ms=100):
+        if self.save_timing_statistics and was_running:
+            self._save_timing_statistics()
+
+    def _save_timing_statistics(self):
+        """
+        Save the timing statistics (histograms of the loop period, execution time and sleep overshoot, overruns) of all modules of the last trial
+        to a JSON file in the timing_statistics directory
+        """
+        timing_statistics = {}
+        for module, module_manager in self._instantiated_modules.items():
+            if module_manager.use_state_machine_and_process and module_manager.shared_variables:
+                shared_variables = module_manager.shared_variables
+                timing_statistics[str(module)] = {'time_step_in_ms': module_manager._time_step_in_ms,
+                                                  'mean_running_frequency': shared_variables.mean_running_frequency,
+                                                  'overrun_count': shared_variables.overrun_count,
+                                                  'skipped_tick_count': shared_variables.skipped_tick_count,
+                                                  'histograms_in_ns': {name: histogram.as_dict() for name, histogram in
+                                                                       shared_variables.timing_histograms().items()}}
+
+        latency_chains = self.latency_chains()
+        if latency_chains:
+            timing_statistics['latency_chains'] = {chain: [dict(latency.as_dict(), name=name) for name, latency in hops] for chain, hops in latency_chains}
+
+        if timing_statistics:
+            directory = os.path.join(os.getcwd(), 'timing_statistics')
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            file_path = os.path.join(directory, 'timing_statistics_' + time.strftime('%d-%m-%Y_%Hh%Mm%Ss') + '.json')
+            with open(file_path, 'w') as file:
+                json.dump(timing_statistics, file, indent=4)
+
+            print('Timing statistics saved to', file_path)
+
+    def latency_chains(self):
+        """
+        Find the latency traces of every input-vehicle-controller chain, based on the agents of the carla interface and their selected input and
+        haptic controller (see core.latencytrace)
+        :return: list of (name of the chain, list of (name of the hop, TraceLatency)), with the hops in the order of the chain
+        """
+        shared_variables = {module: module_manager.shared_variables for module, module_manager in self._instantiated_modules.items()
+                            if module_manager.use_state_machine_and_process and module_manager.shared_variables}
+        carla_interface_settings = self.central_settings.get_settings(JOANModules.CARLA_INTERFACE)
+        if JOANModules.CARLA_INTERFACE not in shared_variables or not carla_interface_settings:
+            return []
+
+        inputs = getattr(shared_variables.get(JOANModules.HARDWARE_MANAGER), 'inputs', {})
+        haptic_controllers = getattr(shared_variables.get(JOANModules.HAPTIC_CONTROLLER_MANAGER), 'haptic_controllers', {})
+
+        chains = []
+        for identifier, agent_settings in carla_interface_settings.agents.items():
+            selected_input = getattr(agent_settings, 'selected_input', 'None')
+            selected_controller = getattr(agent_settings, 'selected_controller', 'None')
+            agent = shared_variables[JOANModules.CARLA_INTERFACE].agents.get(identifier)
+            if selected_input not in inputs or agent is None or 'input_trace' not in agent.trace_latencies():
+                continue
+
+            hops = [(identifier, agent.trace_latencies()['input_trace'])]
+            if selected_controller in haptic_controllers:
+                controller_latencies = haptic_controllers[selected_controller].trace_latencies()
+                if 'input_trace' in controller_latencies:
+                    hops.append((selected_controller, controller_latencies['input_trace']))
+                    if 'torque_trace' in inputs[selected_input].trace_latencies():
+                        hops.append((selected_input, inputs[selected_input].trace_latencies()['torque_trace']))
+
+            chains.append((' > '.join([selected_input] + [name for name, _ in hops if name != selected_input]), hops))
+
+        return chains
+
+    def add_module(self, module: JOANModules, parent=None, time_step_in_ms=100, history_length=0, overrun_policy=OverrunPolicy.CATCH_UP, spin_time_in_ms=1.0,
+                   high_rate=False, cpu_cores=None, nice=None, real_time=False, phase_offset_in_ms=0):
         """
         Add a module
         :param module: module type, from JOANModules enum
         :param name: optional
         :param parent: optional, if None, then self.window
         :param time_step_in_ms: self-explanatory
+        :param history_length: number of ticks the module keeps in its shared history, such that readers never miss a tick (0 = no history)
+        :param overrun_policy: what the module process does when a tick takes longer than the time step (catch up, skip or re-phase)
+        :param spin_time_in_ms: last part of the wait for the next tick that is busy-waited instead of slept, for accurate timing
+        :param high_rate: opt-in for time steps smaller than 10 ms (down to 1 ms); the module busy-waits and gets a CPU core of its own (with real-time
+        priority) if one is available and no cpu_cores are given
+        :param cpu_cores: CPU cores the module process may run on (e.g. {2, 3}), None for all cores
+        :param nice: nice level of the module process (-20 highest priority, 19 lowest), None for the default
+        :param real_time: if True, run the module process with real-time scheduling (SCHED_FIFO, Linux only, if permitted)
+        :param phase_offset_in_ms: in lock-step mode, offset of the ticks of this module with respect to the global tick (see enable_lock_step)
         :return:
         """
+        if time_step_in_ms < 10 and not high_rate:
+            raise ValueError('The time step of a JOAN module cannot be smaller than 10 ms (> 100 Hz), unless the module is added with high_rate=True.')
+        if time_step_in_ms < 1:
+            raise ValueError('The time step of a JOAN module cannot be smaller than 1 ms (> 1 kHz).')
+        if self.headless and module.manager.requires_gui:
+            raise ValueError('The %s module cannot be used in headless mode, it needs its dialog.' % module)
+
         if not parent:
             parent = self.window
 
         module_manager = module.manager(news=self.news, central_settings=self.central_settings, signals=self.signals,
-                                        central_state_monitor=self.central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                                        central_state_monitor=self.central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent,
+                                        headless=self.headless)
+        module_manager.history_length = history_length
+        module_manager.overrun_policy = overrun_policy
+        module_manager.spin_time_in_ms = spin_time_in_ms
+        module_manager.high_rate = high_rate
+        module_manager.cpu_cores = cpu_cores
+        module_manager.nice = nice
+        module_manager.real_time = real_time
+        module_manager.phase_offset_in_ms = phase_offset_in_ms
+        module_manager.span_buffer_length = self.span_buffer_length
+        module_manager.warm_restart = self.warm_restart
+        if self.global_clock:
+            self._subscribe_to_global_clock(module_manager)
+        if high_rate and cpu_cores is None:
+            module_manager.cpu_cores = self._reserve_cpu_core()
+            module_manager.real_time = real_time or module_manager.cpu_cores is not None
 
         if module_manager.use_state_machine_and_process:
             self.central_state_monitor.register_state_machine(module, module_manager.state_machine)
 
-        self.window.add_module(module_manager)
+        if self.window:
+            self.window.add_module(module_manager)
 
         # add instantiated module to dictionary
         self._instantiated_modules[module] = module_manager
 
         return module_manager
 
+    def enable_lock_step(self, time_step_in_ms):
+        """
+        Lock-step mode: all module processes tick on one global clock instead of each on its own, such that they step in phase. The order within a
+        global tick is set with the phase_offset_in_ms of each module, e.g. hardware manager 0 ms, carla interface 2 ms, haptic controller manager
+        4 ms and data recorder 6 ms, such that a full sense-compute-actuate chain finishes within one time step with a predictable latency.
+        :param time_step_in_ms: time step of the global tick; the time steps of all modules should be a multiple of it
+        """
+        self.global_clock = GlobalClock(time_step_in_ms)
+        for module_manager in self._instantiated_modules.values():
+            self._subscribe_to_global_clock(module_manager)
+
+    def enable_span_tracing(self, buffer_length=65536):
+        """
+        Record the spans of every tick (read_from_shared_variables, do_while_running, write_to_shared_variables) and all user spans (see
+        core.spanrecorder.span) of all module processes in a ring buffer per process, such that export_trace() can show what every process was doing
+        when a module overran. Takes effect when the modules get ready.
+        :param buffer_length: number of spans kept per process
+        """
+        self.span_buffer_length = buffer_length
+        for module_manager in self._instantiated_modules.values():
+            module_manager.span_buffer_length = buffer_length
+
+    def enable_warm_restart(self):
+        """
+        Keep the module processes alive between trials, they are reset with the new settings (see ModuleProcess.reset) instead of started anew.
+        All processes are started anew if any module cannot be restarted warm, e.g. because agents or inputs were added.
+        """
+        self.warm_restart = True
+        for module_manager in self._instantiated_modules.values():
+            module_manager.warm_restart = True
+
+    def export_trace(self):
+        """
+        Merge the span recorders of all module processes into one Chrome trace-event JSON file in the traces directory, which can be opened in
+        Perfetto (ui.perfetto.dev) or chrome://tracing
+        :return: path of the file, None if no spans were recorded
+        """
+        trace_events = []
+        for module, module_manager in self._instantiated_modules.items():
+            if module_manager.use_state_machine_and_process and module_manager.span_recorder:
+                trace_events.extend(module_manager.span_recorder.to_trace_events(str(module)))
+
+        if not trace_events:
+            print('No spans recorded, enable span tracing (enable_span_tracing) before the modules get ready.')
+            return None
+
+        directory = os.path.join(os.getcwd(), 'traces')
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        file_path = os.path.join(directory, 'trace_' + time.strftime('%d-%m-%Y_%Hh%Mm%Ss') + '.json')
+        with open(file_path, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file)
+
+        print('Trace saved to', file_path)
+        return file_path
+
+    def stop_profilers(self):
+        """
+        Stop the profilers of all module processes (see ModuleManager.start_profiler), their results are saved
+        """
+        for module_manager in self._instantiated_modules.values():
+            if module_manager.use_state_machine_and_process:
+                module_manager.stop_profiler()
+
+    def _subscribe_to_global_clock(self, module_manager):
+        if not module_manager.use_state_machine_and_process:
+            return
+
+        global_time_step_in_ms = self.global_clock.time_step_in_ns * 1e-6
+        if round(module_manager._time_step_in_ms / global_time_step_in_ms, 6) % 1:
+            raise ValueError('In lock-step mode, the time step of %s (%s ms) should be a multiple of the global time step (%s ms).' %
+                             (module_manager.module, module_manager._time_step_in_ms, global_time_step_in_ms))
+        if not 0 <= module_manager.phase_offset_in_ms < module_manager._time_step_in_ms:
+            raise ValueError('The phase offset of %s should be at least 0 and smaller than its time step.' % module_manager.module)
+
+        module_manager.global_clock = self.global_clock
+
+    def _reserve_cpu_core(self):
+        """
+        Reserve a CPU core for a module in high-rate mode, starting at the highest core. At least one core is left for the GUI and other modules.
+        :return: set with the reserved core, or None if no core is available (or the OS does not support CPU affinity)
+        """
+        if not hasattr(os, 'sched_getaffinity'):
+            return None
+
+        available_cores = sorted(os.sched_getaffinity(0) - self._reserved_cpu_cores)
+        if len(available_cores) < 2:
+            return None
+
+        self._reserved_cpu_cores.add(available_cores[-1])
+        return {available_cores[-1]}
+
     def remove_module(self, module: JOANModules):
         """
         Remove module by name
@@ -117,6 +391,9 @@ class HQManager(QtCore.QObject):
         Quit JOAN
         """
         self.stop_modules()
+        for module_manager in self._instantiated_modules.values():
+            if module_manager.use_state_machine_and_process:
+                module_manager.end_resident_process()
         QtCore.QCoreApplication.quit()
 
     @property
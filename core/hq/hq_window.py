@@ -3,8 +3,10 @@ import os
 from PyQt5 import QtCore, QtGui, QtWidgets, uic
 from PyQt5.QtCore import QSize
 
+from core.moduleprofiler import ProfilerTypes
 from core.statesenum import State
 from core.status import Status
+from .latencymonitordialog import LatencyMonitorDialog
 from .performancemonitordialog import PerformanceMonitorDialog
 from .settingsoverviewdialog import SettingsOverviewDialog
 from modules.joanmodules import JOANModules
@@ -64,6 +66,13 @@ class HQWindow(QtWidgets.QMainWindow):
         self._main_widget.btn_stop.setFixedSize(QSize(110, 110))
         self._main_widget.btn_stop.clicked.connect(self.stop)
 
+        # progress of getting the modules ready (in parallel, see HQManager.get_ready_modules)
+        self._get_ready_progress_bar = QtWidgets.QProgressBar()
+        self._get_ready_progress_bar.setMaximumWidth(150)
+        self._get_ready_progress_bar.setFormat('%v / %m ready')
+        self._get_ready_progress_bar.hide()
+        self.statusBar().addPermanentWidget(self._get_ready_progress_bar)
+
         # dictionary to store all the module widgets
         self._module_cards = {}
 
@@ -75,6 +84,14 @@ class HQWindow(QtWidgets.QMainWindow):
         self._view_menu.addAction('Show all current settings..', self.show_settings_overview)
 
         self._view_menu.addAction('Show performance monitor..', self.show_performance_monitor)
+        self._view_menu.addAction('Show latency monitor..', self.show_latency_monitor)
+        self._view_menu.addAction('Export trace of module processes', self.manager.export_trace)
+        self._view_menu.addAction('Profile module process..', self.show_profiler_dialog)
+        self._view_menu.addAction('Stop profiling', self.manager.stop_profilers)
+        save_timing_statistics_action = self._view_menu.addAction('Save timing statistics when stopping')
+        save_timing_statistics_action.setCheckable(True)
+        save_timing_statistics_action.setChecked(self.manager.save_timing_statistics)
+        save_timing_statistics_action.toggled.connect(self._set_save_timing_statistics)
 
     def initialize(self):
         self.manager.initialize_modules()
@@ -84,6 +101,23 @@ class HQWindow(QtWidgets.QMainWindow):
         self.manager.get_ready_modules()
         self._main_widget.repaint()
 
+    def show_get_ready_progress(self, number_of_ready_modules, number_of_modules, waiting_for):
+        """
+        Show how many modules are ready, called by the manager while the modules get ready
+        :param number_of_ready_modules: number of modules whose process is ready
+        :param number_of_modules: number of modules that are getting ready
+        :param waiting_for: names of the modules that are not ready yet
+        """
+        if waiting_for:
+            self._get_ready_progress_bar.setMaximum(number_of_modules)
+            self._get_ready_progress_bar.setValue(number_of_ready_modules)
+            self._get_ready_progress_bar.show()
+            self.statusBar().showMessage('Getting ready: ' + ', '.join(waiting_for))
+        else:
+            self._get_ready_progress_bar.hide()
+            self.statusBar().clearMessage()
+            self.update_central_control_buttons_enabled()
+
     def start(self):
         self.manager.start_modules()
         self._main_widget.repaint()  # repaint is essential to show the states
@@ -181,7 +215,7 @@ class HQWindow(QtWidgets.QMainWindow):
         if combined_state is State.INITIALIZED:
             self._main_widget.btn_get_ready.setEnabled(True)
         elif combined_state is State.READY:
-            self._main_widget.btn_start.setEnabled(True)
+            self._main_widget.btn_start.setEnabled(self.manager.modules_are_ready)
         elif combined_state is State.STOPPED:
             self._main_widget.btn_initialize.setEnabled(True)
 
@@ -216,3 +250,30 @@ class HQWindow(QtWidgets.QMainWindow):
 
     def show_performance_monitor(self):
         PerformanceMonitorDialog(self.manager.instantiated_modules, parent=self)
+
+    def show_latency_monitor(self):
+        LatencyMonitorDialog(self.manager, parent=self)
+
+    def show_profiler_dialog(self):
+        running_modules = {str(module): module_manager for module, module_manager in self.manager.instantiated_modules.items()
+                           if module_manager.use_state_machine_and_process and module_manager.state_machine.current_state is State.RUNNING}
+        if not running_modules:
+            QtWidgets.QMessageBox.information(self, 'Profile module process', 'A module process can only be profiled while the modules are running.')
+            return
+
+        module_name, ok = QtWidgets.QInputDialog.getItem(self, 'Profile module process', 'Module:', list(running_modules), 0, False)
+        if not ok:
+            return
+
+        profiler_name, ok = QtWidgets.QInputDialog.getItem(self, 'Profile module process', 'Profiler:', [str(profiler_type) for profiler_type in ProfilerTypes],
+                                                           1, False)
+        if not ok:
+            return
+
+        duration_in_s, ok = QtWidgets.QInputDialog.getInt(self, 'Profile module process', 'Duration (s):', 10, 1, 3600)
+        if ok:
+            profiler_type = next(profiler_type for profiler_type in ProfilerTypes if str(profiler_type) == profiler_name)
+            running_modules[module_name].start_profiler(profiler_type, duration_in_s)
+
+    def _set_save_timing_statistics(self, checked):
+        self.manager.save_timing_statistics = checked
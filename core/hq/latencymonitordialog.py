@@ -0,0 +1,41 @@
+import os
+
+from PyQt5 import QtWidgets, QtCore, uic
+from .performancemonitordialog import PerformanceMonitorDialog
+
+
+class LatencyMonitorDialog(QtWidgets.QDialog):
+    """
+    Shows the latency of every hop of every input-vehicle-controller chain (see HQManager.latency_chains), and the total latency from the moment the
+    input was sampled
+    """
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/latencymonitor_dialog.ui"), self)
+
+        self.manager = manager
+
+        self._update_gui()
+        self.tableWidget.resizeColumnsToContents()
+
+        self.update_timer = QtCore.QTimer()
+        self.update_timer.setSingleShot(False)
+        self.update_timer.setInterval(1000)
+        self.update_timer.timeout.connect(self._update_gui)
+        self.update_timer.start()
+
+        self.show()
+
+    def _update_gui(self):
+        # the chains change when agents, inputs or controllers are added or selected, so the table is rebuilt every time
+        rows = [(chain, str(latency.hop), name, latency) for chain, hops in self.manager.latency_chains() for name, latency in hops]
+
+        self.tableWidget.setRowCount(len(rows))
+        for row, (chain, hop, name, latency) in enumerate(rows):
+            self.tableWidget.setItem(row, 0, QtWidgets.QTableWidgetItem(chain))
+            self.tableWidget.setItem(row, 1, QtWidgets.QTableWidgetItem(hop))
+            self.tableWidget.setItem(row, 2, QtWidgets.QTableWidgetItem(name))
+            self.tableWidget.setItem(row, 3, QtWidgets.QTableWidgetItem(PerformanceMonitorDialog.percentiles_as_string(latency.hop_latency, 1e-6, 'ms')))
+            self.tableWidget.setItem(row, 4, QtWidgets.QTableWidgetItem(PerformanceMonitorDialog.percentiles_as_string(latency.total_latency, 1e-6, 'ms')))
+            self.tableWidget.setItem(row, 5, QtWidgets.QTableWidgetItem(str(latency.total_latency.count)))
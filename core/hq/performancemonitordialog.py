@@ -19,8 +19,13 @@ class PerformanceMonitorDialog(QtWidgets.QDialog):
             self.tableWidget.setItem(row, 1, QtWidgets.QTableWidgetItem("- Hz"))
             self.tableWidget.setItem(row, 2, QtWidgets.QTableWidgetItem("- Hz"))
             self.tableWidget.setItem(row, 3, QtWidgets.QTableWidgetItem("- Hz"))
+            self.tableWidget.setItem(row, 4, QtWidgets.QTableWidgetItem("-"))
+            for column in range(5, 9):
+                self.tableWidget.setItem(row, column, QtWidgets.QTableWidgetItem("-"))
             row += 1
 
+        self.tableWidget.resizeColumnsToContents()
+
         self._update_gui()
         self.update_timer = QtCore.QTimer()
         self.update_timer.setSingleShot(False)
@@ -46,7 +51,50 @@ class PerformanceMonitorDialog(QtWidgets.QDialog):
                 else:
                     self.tableWidget.item(row, 1).setBackground(QtGui.QBrush(QtCore.Qt.NoBrush))
 
+                self.tableWidget.setItem(row, 4, QtWidgets.QTableWidgetItem(module.shared_variables.process_priority))
+
+                histograms = module.shared_variables.timing_histograms()
+                self.tableWidget.setItem(row, 5, QtWidgets.QTableWidgetItem(self.percentiles_as_string(histograms['period'], 1e-6, 'ms')))
+                self.tableWidget.setItem(row, 6, QtWidgets.QTableWidgetItem(self.percentiles_as_string(histograms['execution_time'], 1e-6, 'ms')))
+                self.tableWidget.setItem(row, 7, QtWidgets.QTableWidgetItem(self.percentiles_as_string(histograms['sleep_overshoot'], 1e-3, 'us')))
+                self.tableWidget.setItem(row, 8, QtWidgets.QTableWidgetItem("%d (%d skipped)" % (module.shared_variables.overrun_count,
+                                                                                              module.shared_variables.skipped_tick_count)))
+                if module.shared_variables.overrun_count:
+                    self.tableWidget.item(row, 8).setBackground(QtGui.QBrush(QtCore.Qt.red))
+
             else:
                 self.tableWidget.setItem(row, 1, QtWidgets.QTableWidgetItem("- Hz"))
                 self.tableWidget.setItem(row, 2, QtWidgets.QTableWidgetItem("%.1f Hz" % (1000 / module._time_step_in_ms)))
                 self.tableWidget.setItem(row, 3, QtWidgets.QTableWidgetItem("- Hz"))
+                self.tableWidget.setItem(row, 4, QtWidgets.QTableWidgetItem(self._configured_priority(module)))
+
+    @staticmethod
+    def _configured_priority(module):
+        """
+        :return: string with the CPU affinity and priority settings of a module that are applied when its process starts
+        """
+        settings = []
+        if module.cpu_cores:
+            settings.append('CPU %s' % ', '.join(str(core) for core in sorted(module.cpu_cores)))
+        if module.real_time:
+            settings.append('real-time')
+        if module.nice is not None:
+            settings.append('nice %d' % module.nice)
+        if module.high_rate:
+            settings.append('high-rate')
+
+        return ', '.join(settings) or 'default'
+
+    @staticmethod
+    def percentiles_as_string(histogram, scale, unit):
+        """
+        :param histogram: LatencyHistogram
+        :param scale: factor from ns to the unit
+        :param unit: unit string
+        :return: 'p50 / p99 / p99.9 / max unit'
+        """
+        if not histogram.count:
+            return "-"
+
+        values = [histogram.percentile(50), histogram.percentile(99), histogram.percentile(99.9), histogram.max]
+        return " / ".join("%.2f" % (value * scale) for value in values) + " " + unit
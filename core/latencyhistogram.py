@@ -0,0 +1,94 @@
+import ctypes
+import math
+import multiprocessing as mp
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in shared memory, with logarithmic buckets: bucket 0 holds everything below 1 us, after that there are
+    buckets_per_octave buckets for every doubling of the duration (about 9% wide with 8 buckets per octave), up to ~17 s. The exact maximum is kept
+    as well. There is one writer (a module process, once per tick) and any number of readers (e.g. the performance monitor), no locks are used.
+    """
+    buckets_per_octave = 8
+    number_of_octaves = 24
+    number_of_buckets = buckets_per_octave * number_of_octaves + 2  # + below 1 us + overflow
+
+    def __init__(self):
+        self._buffer = mp.RawArray(ctypes.c_uint64, self.number_of_buckets + 1)  # last element: maximum (ns)
+        self._bind()
+
+    def _bind(self):
+        array = np.frombuffer(self._buffer, dtype=np.uint64)
+        self._counts = array[:-1]
+        self._max = array[-1:]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_counts']
+        del state['_max']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind()
+
+    def add(self, duration_in_ns):
+        """
+        Count one duration, should only be called by the writer
+        :param duration_in_ns: duration (ns)
+        """
+        if duration_in_ns < 1000:
+            index = 0
+        else:
+            index = min(int(math.log2(duration_in_ns * 1e-3) * self.buckets_per_octave) + 1, self.number_of_buckets - 1)
+
+        self._counts[index] += 1
+        if duration_in_ns > self._max[0]:
+            self._max[0] = int(duration_in_ns)
+
+    def clear(self):
+        """
+        Remove all counted durations, should only be called while nothing is added
+        """
+        self._counts[:] = 0
+        self._max[0] = 0
+
+    @classmethod
+    def bucket_upper_bound(cls, index):
+        """
+        :return: upper bound of a bucket (ns)
+        """
+        return 1000 * 2 ** (index / cls.buckets_per_octave)
+
+    @property
+    def count(self):
+        return int(self._counts.sum())
+
+    @property
+    def max(self):
+        return int(self._max[0])
+
+    def percentile(self, percentage):
+        """
+        :param percentage: e.g. 99.9
+        :return: upper bound of the bucket that holds the percentile (ns), never more than the maximum; 0 if the histogram is empty
+        """
+        cumulative_counts = np.cumsum(self._counts)
+        if not cumulative_counts[-1]:
+            return 0
+
+        index = int(np.searchsorted(cumulative_counts, cumulative_counts[-1] * percentage / 100))
+        return min(self.bucket_upper_bound(index), self.max)
+
+    def as_dict(self):
+        """
+        :return: dict with the count, p50, p99, p99.9 and max (ns) and the non-empty buckets (upper bound in ns: count), for saving to JSON
+        """
+        return {'count': self.count,
+                'p50': self.percentile(50),
+                'p99': self.percentile(99),
+                'p99.9': self.percentile(99.9),
+                'max': self.max,
+                'buckets': {'%.0f' % self.bucket_upper_bound(index): int(count) for index, count in enumerate(self._counts) if count}}
@@ -0,0 +1,120 @@
+import time
+from ctypes import c_uint64
+from enum import IntEnum
+
+from core.latencyhistogram import LatencyHistogram
+from core.sharedfield import SharedField
+
+
+class TraceHop(IntEnum):
+    """
+    Hops of the input-vehicle-controller chain, in the order in which a sample passes them. A trace holds the time (perf_counter_ns) of every hop.
+    """
+    INPUT_SAMPLED = 0  # the input (keyboard, joystick, SensoDrive) wrote a new sample
+    CONTROL_APPLIED = 1  # the carla interface applied the input to the vehicle
+    TORQUE_COMPUTED = 2  # the haptic controller computed the torque from the vehicle state
+    TORQUE_APPLIED = 3  # the torque was handed to the steering wheel
+
+    def __str__(self):
+        return {TraceHop.INPUT_SAMPLED: 'Input sampled',
+                TraceHop.CONTROL_APPLIED: 'Control applied',
+                TraceHop.TORQUE_COMPUTED: 'Torque computed',
+                TraceHop.TORQUE_APPLIED: 'Torque applied'}[self]
+
+
+def trace_fields(name):
+    """
+    Shared fields of a trace: <name>_sequence (id of the input sample the trace belongs to) and <name>_times (time of every TraceHop, 0 if not passed)
+    :param name: name of the trace, e.g. 'input_trace'
+    :return: tuple of SharedFields, to be added to _shared_fields
+    """
+    return (SharedField(name + '_sequence', c_uint64, internal=True),
+            SharedField(name + '_times', c_uint64, (len(TraceHop),), units='ns', internal=True))
+
+
+def start_trace(shared_variables, name):
+    """
+    Stamp a new input sample: increments the sequence id and sets the origin time (TraceHop.INPUT_SAMPLED). Called by the producer of the sample.
+    :param shared_variables: shared variables of the producer, with the fields of trace_fields(name)
+    :param name: name of the trace
+    """
+    times = shared_variables.view(name + '_times', writable=True)
+    times[:] = 0
+    times[TraceHop.INPUT_SAMPLED] = time.perf_counter_ns()
+    shared_variables.view(name + '_sequence', writable=True)[...] += 1
+
+
+def carry_trace(source, source_name, destination, destination_name, hop, latency=None):
+    """
+    Carry a trace forward from the shared variables a consumer read to the shared variables it writes, and stamp the time of this hop
+    :param source: shared variables (or snapshot) the consumer read the sample from
+    :param source_name: name of the trace in source
+    :param destination: shared variables the consumer writes, may be the same object as source (to stamp the last hop of a chain)
+    :param destination_name: name of the trace in destination
+    :param hop: TraceHop passed by the consumer
+    :param latency: TraceLatency that records the latencies of this hop, optional
+    :return: True if the trace belongs to a new input sample
+    """
+    sequence = int(source.view(source_name + '_sequence'))
+    now = time.perf_counter_ns()
+
+    times = destination.view(destination_name + '_times', writable=True)
+    times[:] = source.view(source_name + '_times')
+    times[hop] = now
+    destination.view(destination_name + '_sequence', writable=True)[...] = sequence
+
+    if latency is None:
+        return sequence != 0
+
+    return latency.add(sequence, times)
+
+
+class TraceLatency:
+    """
+    Latency histograms (in shared memory) of one hop of a trace: the time since the previous hop that was passed, and the total time since the input
+    was sampled. Created with the shared variables of the consumer and filled by the consumer process (see carry_trace), once per input sample.
+    """
+
+    def __init__(self, hop):
+        """
+        :param hop: TraceHop
+        """
+        self.hop = hop
+        self.hop_latency = LatencyHistogram()
+        self.total_latency = LatencyHistogram()
+        self._last_sequence = 0
+
+    def add(self, sequence, times):
+        """
+        Count the latencies of a trace, if it belongs to a new input sample
+        :param sequence: sequence id of the trace
+        :param times: times of the trace, with this hop stamped
+        :return: True if the trace belongs to a new input sample
+        """
+        if not sequence or sequence == self._last_sequence:
+            return False
+
+        self._last_sequence = sequence
+
+        previous_times = [int(t) for t in times[:self.hop] if t]
+        if previous_times:
+            self.hop_latency.add(int(times[self.hop]) - previous_times[-1])
+        if times[TraceHop.INPUT_SAMPLED]:
+            self.total_latency.add(int(times[self.hop]) - int(times[TraceHop.INPUT_SAMPLED]))
+
+        return True
+
+    def clear(self):
+        """
+        Remove all counted latencies
+        """
+        self.hop_latency.clear()
+        self.total_latency.clear()
+
+    def as_dict(self):
+        """
+        :return: dict with the hop and total latency histograms, for saving to JSON
+        """
+        return {'hop': str(self.hop),
+                'hop_latency': self.hop_latency.as_dict(),
+                'total_latency': self.total_latency.as_dict()}
@@ -2,25 +2,38 @@ import os
 import sys
 
 from PyQt5 import QtCore
-from PyQt5.QtCore import pyqtSignal, Qt, QTimer
+from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtWidgets import QApplication
 import multiprocessing as mp
 
 from core.module_exceptionmonitor import ModuleExceptionMonitor
+from core.module_messagemonitor import ModuleMessageMonitor
 from core.module_process import ProcessEvents
+from core.modulemessages import ModuleMessage, ModuleMessageTypes
+from core.spanrecorder import SpanRecorder
 from core.statemachine import StateMachine
 from core.statesenum import State
+from core.tickscheduler import OverrunPolicy
 from modules.joanmodules import JOANModules
 
 
 class ModuleManager(QtCore.QObject):
     loaded_signal = pyqtSignal()
+    message_signal = pyqtSignal(object)  # every ModuleMessage of the process, after it has been handled by handle_message
+
+    # modules whose processes have to be ready before the process of this module gets ready (e.g. because it reads their shared variables in its
+    # get_ready), see HQManager.get_ready_modules. All other modules get ready in parallel.
+    get_ready_after = ()
+
+    # True for modules that only show something (e.g. plots) and cannot be used without their dialog, see HQManager(headless=True)
+    requires_gui = False
 
     def __init__(self, module: JOANModules, news, central_settings, signals, central_state_monitor, time_step_in_ms=100, use_state_machine_and_process=True,
-                 parent=None):
+                 parent=None, headless=False):
         super(QtCore.QObject, self).__init__()
 
         self.module = module
+        self.headless = headless
         self.signals = signals
         self.central_state_monitor = central_state_monitor
 
@@ -28,6 +41,32 @@ class ModuleManager(QtCore.QObject):
 
         # time step
         self._time_step_in_ms = time_step_in_ms
+
+        # number of ticks kept in the shared history of this module (0 = no history), see SharedVariables.enable_history
+        self.history_length = 0
+
+        # pacing of the process loop, see TickScheduler
+        self.overrun_policy = OverrunPolicy.CATCH_UP
+        self.spin_time_in_ms = 1.0
+
+        # high-rate mode for time steps < 10 ms, CPU cores the process runs on (None = all), nice level and real-time scheduling, see ModuleProcess
+        self.high_rate = False
+        self.cpu_cores = None
+        self.nice = None
+        self.real_time = False
+
+        # lock-step mode: global clock the process ticks on and its phase offset, see HQManager.enable_lock_step
+        self.global_clock = None
+        self.phase_offset_in_ms = 0
+
+        # number of spans kept in the span recorder of the process (0 = no span tracing), see HQManager.enable_span_tracing
+        self.span_buffer_length = 0
+        self.span_recorder = None
+
+        # keep the process alive between trials and reset it instead of starting a new one, see HQManager.enable_warm_restart
+        self.warm_restart = False
+        self._resident_shared_variables = None  # shared variables the resident process was started with
+        self._resident_process_options = None  # options the resident process was started with, see _process_options()
         self.use_state_machine_and_process = use_state_machine_and_process
 
         self.news = news
@@ -61,8 +100,8 @@ class ModuleManager(QtCore.QObject):
             self._events = None
             self._exception_monitor = None
 
-        # create the dialog
-        self.module_dialog = module.dialog(self, parent=parent)
+        # create the dialog, in headless mode there is none (module_dialog is None)
+        self.module_dialog = None if headless else module.dialog(self, parent=parent)
 
         # create settings
         if module.settings:
@@ -77,16 +116,18 @@ class ModuleManager(QtCore.QObject):
         else:
             self.module_settings = None
 
-        self.module_dialog._handle_state_change()
+        if self.module_dialog:
+            self.module_dialog._handle_state_change()
 
-        # create a pipe for communication of messages to/from
+        # create a pipe for communication of messages to/from, messages of the process are delivered as soon as they arrive (see handle_message)
         self.pipe_manager, self.pipe_process = mp.Pipe()
-        self.pipe_poller = QTimer()
-        self.pipe_poller.setInterval(1000)  # check every second
-        self.pipe_poller.timeout.connect(self.check_pipe_messages)
+        self.metrics = {}  # latest values of the METRICS messages of the process
+        self._message_monitor = ModuleMessageMonitor(self.pipe_manager)
+        self._message_monitor.message_received.connect(self.handle_message)
 
         self.signals.write_signal(self.module, self.loaded_signal)
-        self.signals.all_signals[self.module].connect(self.module_dialog.update_dialog)
+        if self.module_dialog:
+            self.signals.all_signals[self.module].connect(self.module_dialog.update_dialog)
 
     def initialize(self):
         """
@@ -104,29 +145,128 @@ class ModuleManager(QtCore.QObject):
             self.shared_variables.state = self.state_machine.current_state.value
 
     def get_ready(self):
+        """
+        Create and start the process, or reset the resident process in warm restart mode (see can_restart_warm). Does not wait until the process is
+        ready (see process_is_ready), such that all modules can get ready in parallel.
+        """
         if self.use_state_machine_and_process:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            self.pipe_poller.start()
-            self._process = self.module.process(self.module,
-                                                time_step_in_ms=self._time_step_in_ms,
-                                                news=self.news,
-                                                settings=self.module_settings,
-                                                events=self._events,
-                                                settings_singleton=self.singleton_settings,
-                                                pipe_comm=self.pipe_process)
-
-            # Start the process, run() will wait until start_event is set
-            if self._process and not self._process.is_alive():
-                self._process.start()
-
-            self._events.process_is_ready.wait()
+            if self.can_restart_warm():
+                self._restart_warm()
+            else:
+                self.end_resident_process()
+                self._start_process()
 
             self.shared_variables.state = self.state_machine.current_state.value
-            QApplication.restoreOverrideCursor()
+
+    def _start_process(self):
+        # the history has to be created before the process is, all shared variables objects of this module exist at this point
+        if self.history_length:
+            self.shared_variables.enable_history(self.history_length)
+
+        # the span recorder is kept over trials, such that a trace can be exported after the modules are stopped
+        if self.span_buffer_length and (self.span_recorder is None or self.span_recorder.length != self.span_buffer_length):
+            self.span_recorder = SpanRecorder(self.span_buffer_length)
+
+        self._process = self.module.process(self.module,
+                                            time_step_in_ms=self._time_step_in_ms,
+                                            news=self.news,
+                                            settings=self.module_settings,
+                                            events=self._events,
+                                            settings_singleton=self.singleton_settings,
+                                            pipe_comm=self.pipe_process)
+        self._process.scheduler.overrun_policy = self.overrun_policy
+        self._process.scheduler.spin_time_in_ns = int(self.spin_time_in_ms * 1e6)
+        self._process.high_rate = self.high_rate
+        self._process.cpu_cores = self.cpu_cores
+        self._process.nice = self.nice
+        self._process.real_time = self.real_time
+        self._process.global_clock = self.global_clock
+        self._process.phase_offset_in_ns = int(self.phase_offset_in_ms * 1e6)
+        self._process.span_recorder = self.span_recorder
+        self._process.warm_restart = self.warm_restart
+
+        if self.warm_restart:
+            self._resident_shared_variables = self.shared_variables
+            self._resident_process_options = self._process_options()
+
+        # Start the process, run() will wait until start_event is set
+        if self._process and not self._process.is_alive():
+            self._process.start()
+
+    def _restart_warm(self):
+        """
+        Reset the resident process for the next trial: it keeps its shared variables, which take over the initial values of the new shared variables
+        of this trial, and gets the new settings through the pipe (see ModuleProcess.reset)
+        """
+        self._resident_shared_variables.adopt(self.shared_variables)
+        self.shared_variables = self._resident_shared_variables
+        self.news.write_news(self.module, self.shared_variables)
+
+        self._events.process_is_idle.clear()
+        self.pipe_manager.send({"warm_restart": self.settings_for_process()})
+
+    def _process_options(self):
+        """
+        :return: the options that are fixed when the process is started, a warm restart is only possible if they did not change
+        """
+        return (self.history_length, self.span_buffer_length, self.overrun_policy, self.spin_time_in_ms, self.high_rate, self.cpu_cores, self.nice,
+                self.real_time, self.global_clock, self.phase_offset_in_ms)
+
+    def settings_for_process(self):
+        """
+        :return: the settings of this module as they are sent to the resident process for a warm restart, must be picklable without the process
+        being started (e.g. without multiprocessing events)
+        """
+        return self.module_settings.as_dict()
+
+    def can_restart_warm(self):
+        """
+        True if the process of the last trial is still alive and waits for a warm restart, and the shared variables of this trial have the same layout
+        (e.g. the same agents) as the ones the process was started with
+        """
+        return (self.warm_restart and self.has_resident_process and self._resident_shared_variables is not None and
+                getattr(self, 'shared_variables', None) is not None and
+                self._resident_shared_variables.has_same_layout(self.shared_variables) and
+                self._resident_process_options == self._process_options())
+
+    @property
+    def has_resident_process(self):
+        """
+        True if the process of the last trial is still alive and waits for a warm restart
+        """
+        return self._process is not None and self._process.is_alive() and self._events.process_is_idle.is_set()
+
+    def end_resident_process(self):
+        """
+        End the process that was kept alive for a warm restart, if any, e.g. because the next trial needs a new process (cold start) or JOAN quits
+        """
+        if self.has_resident_process:
+            self.pipe_manager.send({"quit": True})
+            self._process.join()
+
+        self._events.process_is_idle.clear()
+        self._resident_shared_variables = None
+        self._resident_process_options = None
+
+    @property
+    def process_is_ready(self):
+        """
+        True if the process finished its get_ready (also when it failed, the module then goes to ERROR), or if this module has no process
+        """
+        return not self.use_state_machine_and_process or self._events.process_is_ready.is_set()
+
+    def wait_until_process_is_ready(self, timeout=None):
+        """
+        Block until the process finished its get_ready
+        :param timeout: maximum time to wait (s), None to wait forever
+        :return: True if the process is ready
+        """
+        return not self.use_state_machine_and_process or self._events.process_is_ready.wait(timeout)
 
     def start(self):
         if self.use_state_machine_and_process:
-            self.module_dialog.start()
+            if self.module_dialog:
+                self.module_dialog.start()
 
             self._events.start.set()
 
@@ -134,7 +274,8 @@ class ModuleManager(QtCore.QObject):
 
     def stop(self):
         if self.use_state_machine_and_process:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
+            if not self.headless:
+                QApplication.setOverrideCursor(Qt.WaitCursor)
             try:
                 self.shared_variables.state = self.state_machine.current_state.value
             except AttributeError:
@@ -143,20 +284,24 @@ class ModuleManager(QtCore.QObject):
             # send stop state to process and wait for the process to stop
             self.stop_dialog_timer()
 
-            self.pipe_poller.stop()
-
-            # wait for the process to stop
+            # wait for the process to stop, in warm restart mode the process stays alive and waits for the next trial
             if self._process:
                 if self._process.is_alive():
                     if not self._events.start.is_set():
                         self._events.start.set()
-                    self._process.join()
+                    if self.warm_restart:
+                        while self._process.is_alive() and not self._events.process_is_idle.wait(0.1):
+                            pass
+                    else:
+                        self._process.join()
 
-            print('Process terminated:', self.module)
-            QApplication.restoreOverrideCursor()
+            print('Process idle:' if self.warm_restart and self._process and self._process.is_alive() else 'Process terminated:', self.module)
+            if not self.headless:
+                QApplication.restoreOverrideCursor()
 
     def stop_dialog_timer(self):
-        self.module_dialog.update_timer.stop()
+        if self.module_dialog:
+            self.module_dialog.update_timer.stop()
 
     def clean_up(self):
         if self.use_state_machine_and_process:
@@ -173,16 +318,45 @@ class ModuleManager(QtCore.QObject):
     def load_from_file(self, settings_file_to_load):
         self.module_settings.load_from_file(settings_file_to_load)
 
-    def check_pipe_messages(self):
-        if self.pipe_manager.poll():
-            message = self.pipe_manager.recv()
-            # expects a dict
-            if message["stop_all_modules"]:
+    def handle_message(self, message):
+        """
+        Handle a message of the process (in the Qt thread), see ModuleProcess.send_message
+        :param message: ModuleMessage, or a dict {"stop_all_modules": True} (older scenarios)
+        """
+        if isinstance(message, dict):
+            if not message.get("stop_all_modules"):
+                return
+            message = ModuleMessage.create(ModuleMessageTypes.STOP_ALL_MODULES, self.module)
+
+        if message.message_type is ModuleMessageTypes.STOP_ALL_MODULES:
+            # a process may keep requesting the stop until it sees that it is stopped, only the first request counts
+            if self.state_machine and self.state_machine.current_state is State.RUNNING:
                 self.signals.read_signal("stop_all_modules").emit()
+        elif message.message_type is ModuleMessageTypes.LOG:
+            print('%s: %s' % (self.module, message.payload))
+        elif message.message_type is ModuleMessageTypes.METRICS:
+            self.metrics.update(message.payload)
+        elif message.message_type is ModuleMessageTypes.SCENARIO_EVENT:
+            print('%s, scenario event: %s' % (self.module, message.payload))
 
-    def check_pipe_messages(self):
-        if self.pipe_manager.poll():
-            message = self.pipe_manager.recv()
-            # expects a dict
-            if message["stop_all_modules"]:
-                self.signals.read_signal("stop_all_modules").emit()
+        self.message_signal.emit(message)
+
+    def start_profiler(self, profiler_type, duration_in_s):
+        """
+        Profile the running process of this module for some time, without interrupting it. The process writes the result to the profiles directory.
+        :param profiler_type: ProfilerTypes
+        :param duration_in_s: duration of the profiling (s)
+        :return: True if the command was sent, False if the process is not running
+        """
+        if not self._process or not self._process.is_alive() or self.state_machine.current_state is not State.RUNNING:
+            return False
+
+        self.pipe_manager.send({"start_profiler": {"profiler_type": profiler_type.value, "duration_in_s": duration_in_s}})
+        return True
+
+    def stop_profiler(self):
+        """
+        Stop the profiler of the process of this module before its duration has passed
+        """
+        if self._process and self._process.is_alive():
+            self.pipe_manager.send({"stop_profiler": True})
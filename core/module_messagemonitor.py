@@ -0,0 +1,35 @@
+from PyQt5 import QtCore
+from PyQt5.QtCore import pyqtSignal
+
+
+class ModuleMessageMonitor(QtCore.QThread):
+    """
+    Message monitor that delivers the messages of a module process to the Qt thread of its module manager.
+    Creates a thread which blocks until a message arrives on the pipe (no polling) and emits it with message_received, which Qt delivers in the thread
+    of the receiver (queued connection), typically within a millisecond.
+    """
+    message_received = pyqtSignal(object)
+
+    def __init__(self, connection):
+        """
+        init
+        :param connection: manager end of the pipe between the module manager and the module process
+        """
+        super().__init__()
+
+        self.connection = connection
+
+        self.start()
+
+    def run(self):
+        """
+        Thread's run function, blocks until a message is received, emits it and keeps monitoring.
+        :return:
+        """
+        while True:
+            try:
+                message = self.connection.recv()
+            except (EOFError, OSError):
+                return
+
+            self.message_received.emit(message)
@@ -5,7 +5,12 @@ import sys
 import time
 
 from core.exceptionhook import exception_log_and_kill_hook
+from core.modulemessages import ModuleMessage, ModuleMessageTypes
+from core.moduleprofiler import ModuleProfiler
+from core.processpriority import set_process_priority
+from core.spanrecorder import span
 from core.statesenum import State
+from core.tickscheduler import TickScheduler
 from modules.joanmodules import JOANModules
 
 if platform.system() == 'Windows':
@@ -22,49 +27,100 @@ class ProcessEvents:
         self.exception = mp.Event()
         self.process_is_ready = mp.Event()
         self.emergency = mp.Event()
+        self.process_is_idle = mp.Event()  # the loop stopped and the process waits for a warm restart (see ModuleProcess.warm_restart)
 
 
 class ModuleProcess(mp.Process):
     """
     Base class for the module process.
     """
+    # module whose published updates trigger a tick of this process (e.g. run a controller as soon as new vehicle data arrives). The process still
+    # ticks at least once per time step when the module does not publish. None: tick on the time step only.
+    update_trigger = None
 
     def __init__(self, module: JOANModules, time_step_in_ms, news, settings, events: ProcessEvents, settings_singleton, pipe_comm):
         super().__init__(daemon=True)
 
-        if time_step_in_ms < 10:
-            raise ValueError('The time step of a JOAN process cannot be smaller then 10 ms (not > 100 Hz). This is not possible on a non real time OS.')
-
         self.module = module
         self._time_step_in_ns = time_step_in_ms * 1e6
+        self.scheduler = TickScheduler(self._time_step_in_ns)  # the module manager can change the overrun policy and spin time before start()
+
+        # high-rate mode (time steps < 10 ms), CPU affinity and priority of the process, set by the module manager before start()
+        self.high_rate = False
+        self.cpu_cores = None
+        self.nice = None
+        self.real_time = False
+
+        # lock-step mode: tick on the grid of this global clock, shifted by the phase offset (see GlobalClock), set by the module manager before start()
+        self.global_clock = None
+        self.phase_offset_in_ns = 0
+
+        # ring buffer in which the spans of this process are recorded (None = no span tracing), set by the module manager before start()
+        self.span_recorder = None
+
+        # warm restart: keep the process alive after the loop stopped, such that it can run the next trial with new settings (see reset()), set by
+        # the module manager before start()
+        self.warm_restart = False
         self._time = 0.0
+        self._tick = 0
+        self._t_first_tick = 0
+        self._mean_running_frequency = 0.0
         self._last_t0 = 0.0
         self._last_execution_time = 0.0
         self._running_frequency = 0.0
         self.running_time_seconds = 0.0
         self.pipe_comm = pipe_comm  # Pipe() for communication between module_process and module_manager
+        self._profiler = ModuleProfiler(module)  # started and stopped by the module manager through pipe_comm
 
         self._settings_as_dict = settings.as_dict()
         self._settings_as_object = None
 
         # extract shared variables from news
         self._module_shared_variables = news.read_news(module)
+        self._timing_histograms = self._module_shared_variables.timing_histograms()
+        self._news = news
+        self._trigger_sequence = 0
         # extract settings from singleton settings
         self.singleton_settings = settings_singleton
 
         # mp.Events
         self._events = events
 
-    def _get_ready(self):
+    def _load_settings(self):
         # settings dict back to settings object
         self._settings_as_object = self.module.settings()  # create empty settings object
         self._settings_as_object.load_from_dict(self._settings_as_dict)  # settings as object
 
+    def _get_ready(self):
+        self._load_settings()
+
         # get_ready to
         self.get_ready()
 
         self._events.process_is_ready.set()
 
+    def _reset(self, settings_as_dict):
+        """
+        Prepare the process for the next trial of a warm restart: load the new settings, reset the timing of the loop and call reset()
+        :param settings_as_dict: settings of the module for the next trial
+        """
+        self._settings_as_dict = settings_as_dict
+        self._load_settings()
+
+        self._time = 0.0
+        self._tick = 0
+        self._t_first_tick = 0
+        self._mean_running_frequency = 0.0
+        self._last_t0 = 0.0
+        self._last_execution_time = 0.0
+        self._running_frequency = 0.0
+        self.running_time_seconds = 0.0
+        self._trigger_sequence = 0  # the publish sequence of the trigger module starts at 0 again (see SharedVariables.adopt)
+
+        self.reset()
+
+        self._events.process_is_ready.set()
+
     @abc.abstractmethod
     def get_ready(self):
         """
@@ -72,6 +128,13 @@ class ModuleProcess(mp.Process):
         :return:
         """
 
+    def reset(self):
+        """
+        Called instead of get_ready when the process is kept alive between trials (see HQManager.enable_warm_restart), with the new settings in
+        self._settings_as_object. Override it to keep what is expensive to create; by default, get_ready is called again.
+        """
+        self.get_ready()
+
     @abc.abstractmethod
     def do_while_running(self):
         """
@@ -89,28 +152,85 @@ class ModuleProcess(mp.Process):
         :return:
         """
         try:
+            if self.span_recorder:
+                self.span_recorder.activate()
+
             self._get_ready()
 
-            self._events.start.wait()
+            while True:
+                self._events.start.wait()
+
+                self._apply_process_priority()
+
+                # run
+                if platform.system() == 'Windows':
+                    with wres.set_resolution(5000 if self.high_rate else 10000):
+                        self._run_loop()
 
-            # run
-            if platform.system() == 'Windows':
-                with wres.set_resolution(10000):
+                else:
                     self._run_loop()
 
-            else:
-                self._run_loop()
+                self.close_down()
+
+                if self.high_rate:
+                    self._report_rate()
+
+                if not self._wait_for_warm_restart():
+                    break
         except:
             # sys.excepthook is not called from within processes so can't be overridden. instead, catch all exceptions here and call the new excepthook manually
             exception_log_and_kill_hook(*sys.exc_info(), self.module, self._events)
 
+    def _wait_for_warm_restart(self):
+        """
+        In warm restart mode, keep the process alive after the loop stopped until the module manager sends the settings of the next trial, or asks the
+        process to end (see ModuleManager.end_resident_process)
+        :return: True if the process was reset for the next trial, False if it should end
+        """
+        if not self.warm_restart:
+            return False
+
+        self._events.process_is_idle.set()
+        while True:
+            message = self.pipe_comm.recv()  # commands that are meant for a running loop (e.g. the profiler) are ignored
+            if 'warm_restart' in message:
+                self._reset(message['warm_restart'])
+                return True
+            if 'quit' in message:
+                return False
+
+    def _apply_process_priority(self):
+        """
+        Apply the CPU affinity and priority of this process (as far as permitted by the OS) and publish the result in the shared variables, for the
+        performance monitor. In high-rate mode, the complete time step is busy-waited instead of slept, since the OS cannot wake up a process accurately
+        enough for sub-10 ms time steps.
+        """
+        if self.high_rate:
+            self.scheduler.spin_time_in_ns = self.scheduler.period_in_ns
+
+        report = ', '.join(set_process_priority(self.cpu_cores, self.real_time, self.nice)) or 'default'
+        self._module_shared_variables.process_priority = report[:80]
+
+        if self.high_rate:
+            print('%s runs in high-rate mode at %.0f Hz (%s)' % (self.module, 1e9 / self._time_step_in_ns, report))
+
+    def _report_rate(self):
+        """
+        Print whether the requested rate was met
+        """
+        requested_frequency = 1e9 / self._time_step_in_ns
+        rate_met = self._mean_running_frequency >= 0.99 * requested_frequency and self.scheduler.overrun_count <= 0.01 * self._tick
+
+        print('%s: requested %.1f Hz, achieved %.1f Hz, max jitter %.0f us, %d overruns in %d ticks: %s' %
+              (self.module, requested_frequency, self._mean_running_frequency, self.scheduler.max_jitter * 1e-3, self.scheduler.overrun_count,
+               self._tick, 'rate met' if rate_met else 'RATE NOT MET'))
+
     def _run_loop(self):
         """
-        The run loop, which attempts to run at a desired frequency (through time.sleep).
+        The run loop, which runs at the desired frequency on absolute deadlines (see TickScheduler).
         Keeps track of time.
         Shared variables should only be read or written to once per loop tick (e.g. read shared variables, store in local variables, and write to sv
         :return:
-        :return:
         """
         running = True
 
@@ -118,6 +238,12 @@ class ModuleProcess(mp.Process):
         if self._module_shared_variables.state == State.STOPPED.value:
             running = False
 
+        self.scheduler.start()
+        if self.global_clock:
+            # lock-step mode: wait for the first tick of this module on the global grid, all ticks are on the grid from then on
+            self.scheduler.align(self.global_clock.epoch, self.phase_offset_in_ns)
+            self.scheduler.wait()
+
         t_start = time.perf_counter_ns()
 
         while running:
@@ -135,29 +261,96 @@ class ModuleProcess(mp.Process):
             except ZeroDivisionError:
                 self._running_frequency = 1e9 / 1.
 
+            if self._last_t0:
+                self._timing_histograms['period'].add(t0 - self._last_t0)
+
             self._last_t0 = t0
             self._time = time.time_ns()
+            self._tick += 1
+
+            if self._tick == 1:
+                self._t_first_tick = t0
+            else:
+                self._mean_running_frequency = (self._tick - 1) * 1e9 / (t0 - self._t_first_tick)
 
             # read shared values here, store in local variables
-            self.read_from_shared_variables()
+            with span('read_from_shared_variables'):
+                self.read_from_shared_variables()
 
             # do_while_running!
-            self.do_while_running()
+            with span('do_while_running'):
+                self.do_while_running()
 
             # write local variables to shared values
-            self.write_to_shared_variables()
+            with span('write_to_shared_variables'):
+                self.write_to_shared_variables()
+
+            # store this tick in the history, for readers that need every tick (only if the history is enabled)
+            self._module_shared_variables.record_history(self._tick, self._time)
+
+            # let the processes that wait for an update of this module know that there is new data
+            self._module_shared_variables.publish(self._tick, time.time_ns())
 
             # check if state is stopped; if so, stop!
             if self._module_shared_variables.state == State.STOPPED.value:
                 running = False
 
+            self._check_pipe_messages()
+
             self._last_execution_time = time.perf_counter_ns() - t0
+            self._timing_histograms['execution_time'].add(self._last_execution_time)
+            if self.span_recorder:
+                t_end = t0 + self._last_execution_time
+                self.span_recorder.add('tick (overrun)' if t_end > self.scheduler.next_deadline else 'tick', t0, t_end)
+
+            if self.update_trigger and not self.global_clock:
+                # wait for new data of the trigger module, or until the deadline (if the trigger module does not publish)
+                sequence = self._news.wait_for_update(self.update_trigger, self._trigger_sequence, timeout=max(self.scheduler.time_until_deadline(), 0) * 1e-9)
+                if sequence > self._trigger_sequence:
+                    self._trigger_sequence = sequence
+                    self.scheduler.restart()  # tick now, the next deadline is one time step after this update
+                    continue
+
+            # wait until the next deadline
+            self.scheduler.wait()
+            if not self.scheduler.overran:
+                self._timing_histograms['sleep_overshoot'].add(self.scheduler.jitter)
+
+        # save the result of a profiler that is still running
+        self._profiler.stop()
+        self._profiler.join()
+
+    def send_message(self, message_type: ModuleMessageTypes, payload=None):
+        """
+        Send a message to the module manager, which handles it in the Qt thread as soon as it arrives (see ModuleManager.handle_message)
+        :param message_type: ModuleMessageTypes
+        :param payload: content of the message, must be picklable
+        """
+        self.pipe_comm.send(ModuleMessage.create(message_type, self.module, payload))
+
+    def request_stop_all_modules(self):
+        """
+        Ask the HQ to stop all modules, e.g. when the end of a trial is reached in a scenario
+        """
+        self.send_message(ModuleMessageTypes.STOP_ALL_MODULES)
 
-            # sleep for time step, taking the execution time into account
-            if (self._time_step_in_ns - self._last_execution_time) * 1e-9 > 0:
-                time.sleep((self._time_step_in_ns - self._last_execution_time) * 1e-9)
+    def _check_pipe_messages(self):
+        """
+        Handle the commands of the module manager (dicts, see ModuleManager.start_profiler), without blocking the loop
+        """
+        while self.pipe_comm.poll():
+            message = self.pipe_comm.recv()
+            if 'start_profiler' in message:
+                self._profiler.start(**message['start_profiler'])
+            elif 'stop_profiler' in message:
+                self._profiler.stop()
+
+        self._profiler.check()
 
     def close_down(self):
+        """
+        close_down is called after the loop stopped, e.g. to release what was created for this trial (before a warm restart, see reset())
+        """
         pass
 
     def read_from_shared_variables(self):
@@ -173,6 +366,11 @@ class ModuleProcess(mp.Process):
         Write to shared values from your local variables. This should only happen in this function!
         :return:
         """
-        self._module_shared_variables.running_frequency = self._running_frequency
-        self._module_shared_variables.execution_time = self._last_execution_time
-        self._module_shared_variables.time = self._time
+        self._module_shared_variables.commit(running_frequency=self._running_frequency,
+                                             mean_running_frequency=self._mean_running_frequency,
+                                             execution_time=self._last_execution_time,
+                                             time=self._time,
+                                             jitter=self.scheduler.jitter,
+                                             max_jitter=self.scheduler.max_jitter,
+                                             overrun_count=self.scheduler.overrun_count,
+                                             skipped_tick_count=self.scheduler.skipped_tick_count)
@@ -0,0 +1,33 @@
+import time
+from enum import Enum
+from typing import NamedTuple
+
+
+class ModuleMessageTypes(Enum):
+    """
+    Types of the messages a module process sends to its module manager (see ModuleProcess.send_message)
+    """
+    STOP_ALL_MODULES = 0  # request to stop all modules, e.g. at the end of a trial (no payload)
+    LOG = 1  # text for the console of the HQ (payload: str)
+    METRICS = 2  # values the process wants to report, e.g. the number of samples written (payload: dict)
+    SCENARIO_EVENT = 3  # something happened in a scenario, e.g. a trigger location was reached (payload: str or dict)
+
+    def __str__(self):
+        return {ModuleMessageTypes.STOP_ALL_MODULES: 'Stop all modules',
+                ModuleMessageTypes.LOG: 'Log',
+                ModuleMessageTypes.METRICS: 'Metrics',
+                ModuleMessageTypes.SCENARIO_EVENT: 'Scenario event'}[self]
+
+
+class ModuleMessage(NamedTuple):
+    """
+    Message from a module process to its module manager
+    """
+    message_type: ModuleMessageTypes
+    module: object  # JOANModules of the sender
+    payload: object = None
+    time_ns: int = 0  # time.time_ns() at which the message was sent
+
+    @classmethod
+    def create(cls, message_type, module, payload=None):
+        return cls(message_type, module, payload, time.time_ns())
@@ -0,0 +1,147 @@
+import cProfile
+import collections
+import os
+import sys
+import threading
+import time
+from enum import Enum
+
+
+class ProfilerTypes(Enum):
+    """
+    Profilers that can be attached to a running module process, see ModuleProfiler
+    """
+    CPROFILE = 'cprofile'  # deterministic, every function call is measured (.pstats, for e.g. snakeviz or pstats); slows the loop down noticeably
+    SAMPLING = 'sampling'  # samples the stack of the loop periodically from a thread (.collapsed, for e.g. speedscope or flamegraph.pl); low overhead
+
+    def __str__(self):
+        return {ProfilerTypes.CPROFILE: 'cProfile',
+                ProfilerTypes.SAMPLING: 'Sampling profiler'}[self]
+
+
+class ModuleProfiler:
+    """
+    Profiler of a module process that can be started and stopped while the process is running (see ModuleManager.start_profiler), for a fixed
+    duration. The result is written to the profiles directory (next to crash_logs) in a separate thread, such that the loop is not interrupted.
+    Should be created and used in the module process itself.
+    """
+    sampling_interval_in_s = 0.005
+
+    def __init__(self, module):
+        """
+        :param module: JOANModules, used in the file name
+        """
+        self.module = module
+        self.profiler_type = None
+        self._stop_time = 0.0
+        self._profile = None
+        self._sampler_stop = None  # Event that stops the sampler thread
+        self._sampler_result = None  # dict in which stop() puts the file path for the sampler thread
+        self._writer = None  # thread that writes the result of the last profiler
+
+    @property
+    def is_running(self):
+        return self.profiler_type is not None
+
+    def start(self, profiler_type, duration_in_s):
+        """
+        Start profiling the calling (main) thread, stops any profiler that is still running and waits until the result of the previous profiler is
+        written
+        :param profiler_type: ProfilerTypes or its value
+        :param duration_in_s: the profiler stops after this time, see check()
+        """
+        if self.is_running:
+            self.stop()
+        self.join()  # the writer of the previous profiler would otherwise be replaced while it is still writing
+
+        self.profiler_type = ProfilerTypes(profiler_type)
+        self._stop_time = time.perf_counter() + duration_in_s
+
+        if self.profiler_type is ProfilerTypes.CPROFILE:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler_stop = threading.Event()
+            self._sampler_result = {}
+            self._writer = threading.Thread(target=self._sample, args=(threading.get_ident(), self._sampler_stop, self._sampler_result), daemon=True)
+            self._writer.start()
+
+        print('%s: %s started for %.0f s' % (self.module, self.profiler_type, duration_in_s))
+
+    def check(self):
+        """
+        Stop the profiler when its duration has passed, called once per tick
+        :return: path of the result file if the profiler was stopped, else None
+        """
+        if self.is_running and time.perf_counter() >= self._stop_time:
+            return self.stop()
+
+        return None
+
+    def stop(self):
+        """
+        Stop the profiler and write its result in a separate thread
+        :return: path of the result file, None if the profiler was not running
+        """
+        if not self.is_running:
+            return None
+
+        directory = os.path.join(os.getcwd(), 'profiles')
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        extension = '.pstats' if self.profiler_type is ProfilerTypes.CPROFILE else '.collapsed'
+        file_path = os.path.join(directory, str(self.module).replace(' ', '_') + '_' + time.strftime('%d-%m-%Y_%Hh%Mm%Ss'))
+        number = 1
+        while os.path.exists(file_path + ('_%d' % number if number > 1 else '') + extension):  # profilers stopped within the same second
+            number += 1
+        file_path += ('_%d' % number if number > 1 else '') + extension
+
+        if self.profiler_type is ProfilerTypes.CPROFILE:
+            self._profile.disable()
+            self._writer = threading.Thread(target=self._profile.dump_stats, args=(file_path,), daemon=True)
+            self._writer.start()
+        else:
+            self._sampler_result['file_path'] = file_path
+            self._sampler_stop.set()  # the sampler thread writes the file when it finishes
+
+        print('%s: %s stopped, saving to %s' % (self.module, self.profiler_type, file_path))
+        self.profiler_type = None
+        self._profile = None
+        self._sampler_stop = None
+        self._sampler_result = None
+
+        return file_path
+
+    def join(self):
+        """
+        Wait until the result of the last profiler is written, called before the process ends
+        """
+        if self._writer:
+            self._writer.join()
+
+    def _sample(self, thread_id, stop_event, result):
+        """
+        Sampler thread: count the stacks of the profiled thread in the collapsed stack format (outermost frame first, separated by ';'), then write
+        them to the file set by stop()
+        :param thread_id: identifier of the profiled thread
+        :param stop_event: threading.Event that is set by stop()
+        :param result: dict in which stop() puts the file path
+        """
+        stack_counts = collections.Counter()
+        while not stop_event.is_set():
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s:%d)' % (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+
+            if stack:
+                stack_counts[';'.join(reversed(stack))] += 1
+
+            stop_event.wait(self.sampling_interval_in_s)
+
+        with open(result['file_path'], 'w') as file:
+            for stack, count in stack_counts.items():
+                file.write('%s %d\n' % (stack, count))
@@ -1,44 +1,135 @@
 import ctypes
-
 import multiprocessing as mp
+
+from .latencyhistogram import LatencyHistogram
+from .sharedfield import SharedField
 from .sharedvariables import SharedVariables
 
 
 class ModuleSharedVariables(SharedVariables):
-    def __init__(self):
-        self._state = mp.Value(ctypes.c_int, -2)  # module state [initialized, running, error, stopped]
-        self._execution_time = mp.Value(ctypes.c_double)
-        self._running_frequency = mp.Value(ctypes.c_double)
-        self._time = mp.Value(ctypes.c_uint64)
-
-    @property
-    def execution_time(self):
-        return self._execution_time.value
-
-    @execution_time.setter
-    def execution_time(self, value):
-        self._execution_time.value = value
-
-    @property
-    def running_frequency(self):
-        return self._running_frequency.value
-
-    @running_frequency.setter
-    def running_frequency(self, value):
-        self._running_frequency.value = value
-
-    @property
-    def time(self):
-        return self._time.value
-
-    @time.setter
-    def time(self, value):
-        self._time.value = value
-
-    @property
-    def state(self):
-        return self._state.value
-
-    @state.setter
-    def state(self, val):
-        self._state.value = val
+    _shared_fields = (SharedField('state', ctypes.c_int, default=-2),  # module state [initialized, running, error, stopped]
+                      SharedField('execution_time', ctypes.c_double, units='ns'),
+                      SharedField('running_frequency', ctypes.c_double, units='Hz'),
+                      SharedField('mean_running_frequency', ctypes.c_double, units='Hz', internal=True),  # since the start of the loop
+                      SharedField('time', ctypes.c_uint64, units='ns'),
+                      SharedField('publish_sequence', ctypes.c_uint64, internal=True),  # tick number of the last published tick, see publish()
+                      SharedField('publish_time', ctypes.c_uint64, units='ns', internal=True),
+
+                      # timing statistics of the process loop, see TickScheduler
+                      SharedField('jitter', ctypes.c_double, units='ns', internal=True),
+                      SharedField('max_jitter', ctypes.c_double, units='ns', internal=True),
+                      SharedField('overrun_count', ctypes.c_uint64, internal=True),
+                      SharedField('skipped_tick_count', ctypes.c_uint64, internal=True),
+
+                      # CPU affinity and priority that the process got from the OS, see set_process_priority
+                      SharedField('process_priority', 'S80', internal=True))
+
+    def __init__(self, optional_groups=()):
+        super().__init__(optional_groups)
+        self._publish_condition = mp.Condition()
+        self._waiter_count = mp.Value(ctypes.c_int, 0)  # processes in wait_for_update(), read and written under its own lock
+
+        # per-tick timing of the module process (loop period, execution time and sleep overshoot), see timing_histograms()
+        self._timing_histograms = {'period': LatencyHistogram(),
+                                   'execution_time': LatencyHistogram(),
+                                   'sleep_overshoot': LatencyHistogram()}
+
+    def timing_histograms(self):
+        """
+        :return: dict with the LatencyHistogram of the loop period, execution time and sleep overshoot of every tick of the module process
+        """
+        return self._timing_histograms
+
+    def publish(self, tick, time_ns):
+        """
+        Mark a tick as published and wake up all processes that wait for an update of this module (see wait_for_update()). Called by the module
+        process once per tick, after it wrote all its shared variables. The condition is only notified when a process is waiting.
+        :param tick: tick number, increasing
+        :param time_ns: time stamp of publishing (ns)
+        """
+        self.commit(publish_sequence=tick, publish_time=time_ns)
+
+        # the lock of the counter orders the commit above with the registration of a waiter: either the waiter sees the new tick or it is notified
+        with self._waiter_count.get_lock():
+            has_waiters = self._waiter_count.value > 0
+        if has_waiters:
+            with self._publish_condition:
+                self._publish_condition.notify_all()
+
+    def wait_for_update(self, last_sequence, timeout=1.0):
+        """
+        Block until this module published a tick newer than last_sequence, or until the timeout expires
+        :param last_sequence: publish sequence of the last tick the caller has seen
+        :param timeout: maximum waiting time (s), None to wait forever (also when the module stopped)
+        :return: publish sequence of the last published tick, which is not larger than last_sequence if the timeout expired
+        """
+        if self._publish_sequence.tolist() <= last_sequence:
+            with self._publish_condition:
+                with self._waiter_count.get_lock():
+                    self._waiter_count.value += 1
+                try:
+                    self._publish_condition.wait_for(lambda: self._publish_sequence.tolist() > last_sequence, timeout)
+                finally:
+                    with self._waiter_count.get_lock():
+                        self._waiter_count.value -= 1
+
+        return self._publish_sequence.tolist()
+
+    def enable_history(self, length):
+        """
+        Enable the history of this module and of all shared variables objects it holds (e.g. the agents of the carla interface)
+        :param length: number of ticks to keep
+        """
+        super().enable_history(length)
+        for shared_variables in self._child_shared_variables():
+            shared_variables.enable_history(length)
+
+    def record_history(self, tick, time_ns):
+        super().record_history(tick, time_ns)
+        for shared_variables in self._child_shared_variables():
+            shared_variables.record_history(tick, time_ns)
+
+    def has_same_layout(self, other):
+        """
+        :param other: module shared variables object
+        :return: True if other has the same fields and the same shared variables objects in its dicts (e.g. the same agents), with the same fields
+        """
+        if not super().has_same_layout(other):
+            return False
+
+        children = dict(self._child_shared_variables_by_key())
+        other_children = dict(other._child_shared_variables_by_key())
+        return children.keys() == other_children.keys() and all(child.has_same_layout(other_children[key]) for key, child in children.items())
+
+    def adopt(self, other):
+        """
+        Take over all values of another object with the same layout, including those of the shared variables objects in its dicts (e.g. the agents).
+        The timing histograms are cleared.
+        :param other: module shared variables object with the values of the next trial
+        """
+        super().adopt(other)  # checks the layout of the objects in the dicts as well
+        other_children = dict(other._child_shared_variables_by_key())
+        for key, child in self._child_shared_variables_by_key():
+            child.adopt(other_children[key])
+        for histogram in self._timing_histograms.values():
+            histogram.clear()
+
+    def _child_shared_variables(self):
+        """
+        :return: all shared variables objects in the dicts of this module (e.g. agents, inputs, controllers)
+        """
+        for value in self.__dict__.values():
+            if isinstance(value, dict):
+                for child in value.values():
+                    if isinstance(child, SharedVariables):
+                        yield child
+
+    def _child_shared_variables_by_key(self):
+        """
+        :return: (name of the dict, key in the dict) and shared variables object, for all shared variables objects in the dicts of this module
+        """
+        for name, value in self.__dict__.items():
+            if isinstance(value, dict):
+                for key, child in value.items():
+                    if isinstance(child, SharedVariables):
+                        yield (name, key), child
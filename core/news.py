@@ -1,3 +1,5 @@
+import time
+
 from modules.joanmodules import JOANModules
 
 
@@ -28,6 +30,22 @@ class News:
         except KeyError:
             return {}
 
+    def wait_for_update(self, module: JOANModules, last_sequence, timeout=1.0):
+        """
+        Wait until a module published new data, instead of polling its shared variables
+        :param module: module enum
+        :param last_sequence: publish sequence of the last data of the module the caller has seen (0 if none)
+        :param timeout: maximum waiting time (s), None to wait forever (also when the module stopped)
+        :return: publish sequence of the latest data of the module, not larger than last_sequence if nothing was published before the timeout
+        """
+        try:
+            return self._news[module].wait_for_update(last_sequence, timeout)
+        except KeyError:
+            # the module does not publish (yet), so nothing can arrive
+            if timeout is not None:
+                time.sleep(timeout)
+            return last_sequence
+
     def remove_news(self, module: JOANModules):
         """
         Remove module shared variable from News
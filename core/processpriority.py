@@ -0,0 +1,50 @@
+import os
+
+
+def set_process_priority(cpu_cores=None, real_time=False, nice=None):
+    """
+    Change the CPU affinity and scheduling of the calling process, as far as the OS permits it. Real-time scheduling (SCHED_FIFO) and negative nice
+    levels need privileges on Linux (root, CAP_SYS_NICE or an rtprio limit); if these are not granted, the process continues with the normal priority.
+    Only Linux is supported; on other platforms nothing is changed.
+    :param cpu_cores: collection of CPU core numbers the process may run on, None to leave the affinity unchanged
+    :param real_time: if True, try to run the process with the SCHED_FIFO real-time policy
+    :param nice: nice level (-20 highest priority, 19 lowest), None to leave unchanged. Used as fallback for real_time if that is not permitted.
+    :return: list of strings describing what was (and what could not be) applied
+    """
+    report = []
+    real_time_granted = False
+
+    if cpu_cores:
+        if hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, cpu_cores)
+                report.append('CPU %s' % ', '.join(str(core) for core in sorted(os.sched_getaffinity(0))))
+            except OSError as e:
+                report.append('CPU affinity not set (%s)' % e)
+        else:
+            report.append('CPU affinity not supported')
+
+    if real_time:
+        if hasattr(os, 'sched_setscheduler'):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(os.sched_get_priority_min(os.SCHED_FIFO) + 49))
+                report.append('SCHED_FIFO')
+                real_time_granted = True
+            except OSError:
+                report.append('SCHED_FIFO not permitted')
+                if nice is None:
+                    nice = -10
+        else:
+            report.append('real-time scheduling not supported')
+
+    if nice is not None and not real_time_granted:
+        if hasattr(os, 'setpriority'):
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, nice)
+                report.append('nice %d' % nice)
+            except OSError:
+                report.append('nice %d not permitted' % nice)
+        else:
+            report.append('nice not supported')
+
+    return report
@@ -0,0 +1,19 @@
+from typing import NamedTuple
+
+
+class SharedField(NamedTuple):
+    """
+    Declaration of one shared variable, e.g. SharedField('transform', c_float, (6,), units='m, deg'), see SharedVariables._shared_fields
+    """
+    name: str
+    ctype: object  # ctypes type or NumPy type string, e.g. 'S30'
+    shape: tuple = ()  # () for scalars
+    default: object = None  # None: zero
+    units: str = ''
+    group: str = None  # optional fields are only allocated when their group is enabled
+    internal: bool = False  # bookkeeping, not listed in get_all_properties()
+    offset: int = None  # byte offset in the shared block, set in the field table (SharedVariables.fields())
+
+    @property
+    def is_array(self):
+        return bool(self.shape)
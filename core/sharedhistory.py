@@ -0,0 +1,94 @@
+import ctypes
+import multiprocessing as mp
+
+import numpy as np
+
+
+class SharedHistory:
+    """
+    Lock-free ring buffer in shared memory with the last N records of a shared variables object, each stamped with its tick and time.
+    One writer, any number of readers; slots that were overwritten during a read are never returned.
+    """
+
+    def __init__(self, record_dtype: np.dtype, length: int):
+        """
+        :param record_dtype: structured dtype of the shared variables record
+        :param length: number of ticks kept in the ring buffer
+        """
+        if length < 1:
+            raise ValueError('The length of a shared history should be at least 1.')
+
+        self.length = length
+        self._dtype = self.entry_dtype(record_dtype)
+        self._head_buffer = mp.RawArray(ctypes.c_uint64, 1)  # tick of the last complete entry, 0 = empty
+        self._buffer = mp.RawArray(ctypes.c_char, self._dtype.itemsize * length)
+        self._bind()
+
+    def _bind(self):
+        self._head = np.frombuffer(self._head_buffer, dtype=np.uint64)
+        self._entries = np.frombuffer(self._buffer, dtype=self._dtype, count=self.length)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_head']
+        del state['_entries']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind()
+
+    @staticmethod
+    def entry_dtype(record_dtype: np.dtype):
+        """
+        dtype of the entries returned by read_since(): fields 'tick', 'time' and 'record'
+        """
+        return np.dtype([('tick', np.uint64), ('time', np.uint64), ('record', record_dtype)], align=True)
+
+    @property
+    def last_tick(self):
+        return int(self._head[0])
+
+    def append(self, tick: int, time_ns: int, record: np.ndarray):
+        """
+        Add an entry, should only be called by the writer. Ticks should be increasing and start at 1.
+        :param tick: sequence number of the tick
+        :param time_ns: time stamp of the tick (ns)
+        :param record: 0-d structured array with the record to store
+        """
+        slot = tick % self.length
+        self._entries['tick'][slot] = 0  # invalidate, readers will skip this slot while it is written
+        self._entries['record'][slot] = record
+        self._entries['time'][slot] = time_ns
+        self._entries['tick'][slot] = tick
+        self._head[0] = tick
+
+    def clear(self):
+        """
+        Remove all entries, such that the ticks can start at 1 again (see SharedVariables.adopt). Should only be called while nothing is written.
+        """
+        self._head[0] = 0
+        self._entries['tick'][:] = 0
+
+    def read_since(self, last_tick: int):
+        """
+        Read all entries newer than last_tick, oldest first.
+        :param last_tick: tick of the last entry the reader already has (0 to read everything that is available)
+        :return: (entries, number of ticks that were missed because they were already overwritten)
+        """
+        head = int(self._head[0])
+        if head <= last_tick:
+            return self._entries[:0].copy(), 0
+
+        first = max(last_tick + 1, head - self.length + 1)
+        ticks = np.arange(first, head + 1, dtype=np.uint64)
+        slots = ticks % np.uint64(self.length)
+
+        ticks_before = self._entries['tick'][slots]
+        entries = self._entries[slots]
+        ticks_after = self._entries['tick'][slots]
+
+        valid = (ticks_before == ticks) & (ticks_after == ticks)
+        missed = (first - last_tick - 1) + int(np.count_nonzero(~valid))
+
+        return entries[valid], missed
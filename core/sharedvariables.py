@@ -1,13 +1,361 @@
 import abc
+import ctypes
+import multiprocessing as mp
+import time
+
+import numpy as np
+
+from .latencytrace import TraceLatency, trace_fields
+from .sharedfield import SharedField
+from .sharedhistory import SharedHistory
 
 
 class SharedVariables(abc.ABC):
+    """
+    Base class for all shared variables: the fields declared in _shared_fields (SharedField) live in one block of shared memory and get a property
+    each. Write several fields consistently with commit(), read them with snapshot().
+    """
+    _shared_fields = ()
+    _traces = {}  # name: TraceHop of the consumer that writes the object (None for the producer), see core.latencytrace
+    _sequence_field = SharedField('sequence', ctypes.c_uint64)
+
+    # (dtype, field table) per set of enabled groups, filled on first use (per class, see __init_subclass__)
+    _layouts = {}
+
+    # name: group of all optional fields of the class (see __init_subclass__)
+    _optional_field_groups = {}
+
+    # maximum time snapshot() keeps retrying before it assumes the writer died halfway a commit
+    snapshot_timeout_in_s = 1.0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._layouts = {}
+        cls._optional_field_groups = {field.name: field.group for field in cls._all_shared_fields() if field.group is not None}
+        for field in cls._declared_fields():
+            if field.name not in cls.__dict__:
+                setattr(cls, field.name, cls._create_property(field))
+            if field.is_array:
+                setattr(cls, field.name + '_view', cls._create_view_method(field.name))
+
+    @staticmethod
+    def _create_property(field):
+        attribute = '_' + field.name
+
+        if np.dtype(field.ctype).kind == 'S':
+            def getter(self):
+                return str(getattr(self, attribute).tolist(), encoding='utf-8')
+
+            def setter(self, val):
+                getattr(self, attribute)[...] = bytes(val, 'utf-8')
+        else:
+            def getter(self):
+                return getattr(self, attribute).tolist()
+
+            def setter(self, val):
+                getattr(self, attribute)[...] = val
+
+        return property(getter, setter, doc='%s [%s]' % (field.name, field.units) if field.units else field.name)
+
+    @staticmethod
+    def _create_view_method(name):
+        def view_method(self, writable=False):
+            return self.view(name, writable)
+
+        view_method.__name__ = name + '_view'
+        view_method.__doc__ = """
+        Zero-copy NumPy view on the shared %s variable
+        :param writable: if True, writing to the view writes directly to shared memory
+        :return: read-only (default) or writable view
+        """ % name
+        return view_method
+
+    def __init__(self, optional_groups=()):
+        """
+        :param optional_groups: groups of optional fields that should be allocated for this object
+        """
+        self._dtype, self._fields = self._layout(optional_groups)
+        self._buffer = mp.RawArray(ctypes.c_char, self._dtype.itemsize)  # zero initialized
+        self._history = None
+        self._trace_latencies = {name: TraceLatency(hop) for name, hop in self._traces.items() if hop is not None}
+        self._bind_fields()
+
+        for field in self._fields:
+            if field.default is not None:
+                getattr(self, '_' + field.name)[...] = field.default
+
+    def __getattr__(self, name):
+        # only called for attributes that do not exist, e.g. (the view of) an optional field whose group is not enabled for this object
+        group = type(self)._optional_field_groups.get(name[1:] if name.startswith('_') else name)
+        if group is not None:
+            raise AttributeError('%s is not enabled for this %s object, it has no %s' % (group, type(self).__name__, name.lstrip('_')))
+
+        raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+    @classmethod
+    def _declared_fields(cls):
+        """
+        :return: fields declared by this class itself (not by its base classes), including the fields of its latency traces
+        """
+        declared_fields = list(cls.__dict__.get('_shared_fields', ()))
+        for name in cls.__dict__.get('_traces', {}):
+            declared_fields.extend(trace_fields(name))
+
+        return declared_fields
+
+    @classmethod
+    def _all_shared_fields(cls):
+        """
+        Collect the declared fields of this class and all its base classes, base class fields first
+        :return: list of SharedField
+        """
+        all_fields = []
+        for klass in reversed(cls.__mro__):
+            if issubclass(klass, SharedVariables):
+                all_fields.extend(klass._declared_fields())
+
+        return all_fields
+
+    @classmethod
+    def _layout(cls, optional_groups):
+        """
+        Get the dtype and field table of this class for a set of optional groups (computed once, then cached)
+        :param optional_groups: enabled groups of optional fields
+        :return: (dtype, field table)
+        """
+        key = frozenset(optional_groups)
+        try:
+            return cls._layouts[key]
+        except KeyError:
+            pass
+
+        all_fields = cls._all_shared_fields()
+        unknown_groups = key - {field.group for field in all_fields}
+        if unknown_groups:
+            raise ValueError('%s has no optional field groups called %s' % (cls.__name__, ', '.join(sorted(unknown_groups))))
+
+        fields = [field for field in all_fields if field.group is None or field.group in key]
+
+        # largest alignment first (stable, so fields of the same type stay adjacent), such that no padding is needed between the fields
+        ordered_fields = sorted([cls._sequence_field] + fields, key=lambda field: np.dtype(field.ctype).alignment, reverse=True)
+        dtype = np.dtype([(field.name, field.ctype, field.shape) for field in ordered_fields], align=True)
+
+        field_table = tuple(field._replace(offset=dtype.fields[field.name][1]) for field in fields)
+        cls._layouts[key] = (dtype, field_table)
+
+        return cls._layouts[key]
+
+    def fields(self):
+        """
+        :return: field table of this object, a SharedField (with offset) for every allocated field, in the order of declaration
+        """
+        return self._fields
+
+    def _bind_fields(self):
+        """
+        Create a view on the shared block for every field. A 0-d structured array is used, so scalar fields also result in (0-d) views instead of copies.
+        """
+        self._record = np.frombuffer(self._buffer, dtype=self._dtype, count=1).reshape(())
+        for name in self._dtype.names:
+            setattr(self, '_' + name, self._record[name])
+
+        self._readonly_views = {}
+        self._stacked_views = {}
+
+    def __getstate__(self):
+        # the views cannot be pickled (they would be pickled as copies), they are recreated from the shared block in __setstate__
+        state = self.__dict__.copy()
+        del state['_record']
+        del state['_readonly_views']
+        del state['_stacked_views']
+        for name in self._dtype.names:
+            del state['_' + name]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_fields()
+
+    def commit(self, **values):
+        """
+        Write several variables as one consistent update, e.g. commit(transform=[...], applied_input=[...]). Readers that use snapshot() will either see
+        all or none of these values.
+        :param values: variable names (properties) and their new values
+        """
+        for name in values:
+            if not isinstance(getattr(type(self), name, None), property):
+                raise AttributeError('%s has no shared variable called %s' % (type(self).__name__, name))
+
+        sequence = self._sequence.tolist()
+        self._sequence[...] = sequence + 1  # odd: write in progress
+        try:
+            for name, value in values.items():
+                setattr(self, name, value)
+        finally:
+            self._sequence[...] = sequence + 2
+
+    def snapshot(self, into=None):
+        """
+        Make a consistent (torn-free) local copy of this object. The copy is of the same class, so all properties can be used on it, but it is not shared
+        anymore. Other attributes (e.g. the agents dict of a module) are not copied, they refer to the same objects as the original.
+        :param into: optional earlier snapshot of this object, which is overwritten instead of creating a new copy (no allocations in a hot loop)
+        :return: copy of this object
+        """
+        copied_buffer = into._buffer if into is not None else bytearray(len(self._buffer))
+
+        deadline = time.perf_counter() + self.snapshot_timeout_in_s
+        while True:
+            sequence = self._sequence.tolist()
+            if not sequence % 2:
+                copied_buffer[:] = self._buffer
+                if self._sequence.tolist() == sequence:
+                    break
+
+            if time.perf_counter() > deadline:
+                raise RuntimeError('Could not make a snapshot of %s, the writer did not finish its commit.' % type(self).__name__)
+
+            time.sleep(0)  # give the writer the opportunity to finish
+
+        if into is not None:
+            return into
+
+        snapshot = object.__new__(type(self))
+        snapshot.__dict__.update(self.__getstate__())
+        snapshot._buffer = copied_buffer
+        snapshot._bind_fields()
+
+        return snapshot
+
+    def view(self, name, writable=False):
+        """
+        Zero-copy NumPy view on a shared variable
+        :param name: name of the variable
+        :param writable: if True, writing to the view writes directly to shared memory (without updating the sequence counter, see commit())
+        :return: read-only (default) or writable view
+        """
+        if writable:
+            return getattr(self, '_' + name)
+
+        try:
+            return self._readonly_views[name]
+        except KeyError:
+            readonly_view = getattr(self, '_' + name).view()
+            readonly_view.flags.writeable = False
+            self._readonly_views[name] = readonly_view
+            return readonly_view
+
+    def stacked_view(self, names, writable=False):
+        """
+        Zero-copy 2D view on several variables that have the same type and shape and are declared directly after each other, e.g. all road data of a
+        vehicle. Row i of the view is variable names[i].
+        :param names: tuple with the names of the variables
+        :param writable: if True, writing to the view writes directly to shared memory
+        :return: read-only (default) or writable view
+        """
+        key = (tuple(names), writable)
+        try:
+            return self._stacked_views[key]
+        except KeyError:
+            pass
+
+        for name in names:
+            if name not in self._dtype.fields:
+                getattr(self, '_' + name)  # raises, the field is not allocated
+
+        field_dtype, offset = self._dtype.fields[names[0]][:2]
+        for index, name in enumerate(names):
+            if self._dtype.fields[name][:2] != (field_dtype, offset + index * field_dtype.itemsize):
+                raise ValueError('Shared variables %s cannot be stacked, they should have the same type and shape and be declared adjacently' % str(names))
+
+        stacked_view = np.ndarray((len(names),) + field_dtype.shape, dtype=field_dtype.base, buffer=self._buffer, offset=offset)
+        stacked_view.flags.writeable = writable
+        self._stacked_views[key] = stacked_view
+        return stacked_view
+
+    def commit_stacked(self, names, values):
+        """
+        Vectorised bulk setter: write several stacked variables (see stacked_view()) with one array copy, as one consistent update (see commit()).
+        :param names: tuple with the names of the variables
+        :param values: array-like with shape (len(names),) + shape of a variable
+        """
+        stacked_view = self.stacked_view(names, writable=True)
+
+        sequence = self._sequence.tolist()
+        self._sequence[...] = sequence + 1  # odd: write in progress
+        try:
+            stacked_view[...] = values
+        finally:
+            self._sequence[...] = sequence + 2
+
+    def enable_history(self, length):
+        """
+        Keep the last length ticks of this object in a shared memory ring buffer. Should be called before the module processes are started.
+        :param length: number of ticks to keep
+        """
+        self._history = SharedHistory(self._dtype, length)
+
+    def record_history(self, tick, time_ns):
+        """
+        Store the current values in the history (if enabled). Called by the process that writes this object, once per tick, after writing.
+        :param tick: sequence number of the tick, increasing and starting at 1
+        :param time_ns: time stamp of the tick (ns)
+        """
+        if self._history:
+            self._history.append(tick, time_ns, self._record)
+
+    def read_history(self, last_tick=0):
+        """
+        Read all ticks that were recorded after last_tick, oldest first.
+        :param last_tick: tick of the last entry the reader already has
+        :return: (entries, number of missed ticks); entries is a structured array with the fields 'tick', 'time' and 'record', in which 'record' has a
+        field for every shared variable (e.g. entries['record']['transform']). Both are empty/zero if there is no history.
+        """
+        if not self._history:
+            return np.empty(0, dtype=SharedHistory.entry_dtype(self._dtype)), 0
+
+        return self._history.read_since(last_tick)
+
+    def has_history(self):
+        return self._history is not None
+
+    def has_same_layout(self, other):
+        """
+        :param other: shared variables object
+        :return: True if other is of the same class and has the same fields, such that this object can adopt() its values
+        """
+        return type(other) is type(self) and other._dtype == self._dtype
+
+    def adopt(self, other):
+        """
+        Take over all values of another object with the same layout (see has_same_layout), while keeping the shared memory of this object. Used for a
+        warm restart, in which the module process keeps the shared variables it was started with (see HQManager.enable_warm_restart). The history
+        and the latency statistics are cleared. Should only be called while the writer of this object is not running.
+        :param other: shared variables object with the values of the next trial
+        """
+        if not self.has_same_layout(other):
+            raise ValueError('%s cannot adopt the values of %s, the fields differ' % (type(self).__name__, type(other).__name__))
+
+        ctypes.memmove(self._buffer, other._buffer, ctypes.sizeof(self._buffer))
+        if self._history:
+            self._history.clear()
+        for trace_latency in self._trace_latencies.values():
+            trace_latency.clear()
+
+    def trace_latencies(self):
+        """
+        :return: dict with a TraceLatency per latency trace that is stamped by the writer of this object (name of the trace: TraceLatency)
+        """
+        return self._trace_latencies
 
     def get_all_properties(self):
+        """
+        :return: names of all properties that can be shown to the user, without the internal fields and the fields of groups that are not enabled
+        """
+        hidden = {field.name for field in self._all_shared_fields() if field.internal or field.name not in self._dtype.fields}
         all_properties = []
         for attribute in dir(type(self)):
-            if type(getattr(type(self), attribute)) == property:
+            if type(getattr(type(self), attribute)) == property and attribute not in hidden:
                 all_properties.append(attribute)
 
         return all_properties
-
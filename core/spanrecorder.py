@@ -0,0 +1,151 @@
+import ctypes
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+# recorder of the current process, set by SpanRecorder.activate() (every module process has its own)
+_active_recorder = None
+
+
+class _Span:
+    __slots__ = ('_recorder', '_name', '_begin')
+
+    def __init__(self, recorder, name):
+        self._recorder = recorder
+        self._name = name
+        self._begin = 0
+
+    def __enter__(self):
+        self._begin = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._recorder.add(self._name, self._begin, time.perf_counter_ns())
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_no_span = _NoSpan()
+
+
+def span(name):
+    """
+    Record a named span in the trace of the current module process, if span tracing is enabled (see HQManager.enable_span_tracing), e.g.
+    with span('calculate_error'): ...
+    :param name: name of the span (ASCII, at most 32 characters are kept)
+    :return: context manager
+    """
+    if _active_recorder is None:
+        return _no_span
+
+    return _Span(_active_recorder, name)
+
+
+class SpanRecorder:
+    """
+    Ring buffer in shared memory with the last spans (name, begin and end in perf_counter_ns) of one module process. There is one writer (the module
+    process) that never blocks; readers (the HQ) copy the ring and drop the entries that were overwritten while copying. The HQ merges the rings of all
+    processes into one Chrome trace-event file (see to_trace_events()), which can be viewed in Perfetto (ui.perfetto.dev) or chrome://tracing.
+    """
+    entry_dtype = np.dtype([('begin', np.int64), ('end', np.int64), ('name', 'S32')])
+
+    def __init__(self, length=65536):
+        """
+        :param length: number of spans that are kept
+        """
+        self.length = length
+        self._buffer = mp.RawArray(ctypes.c_char, self.entry_dtype.itemsize * length)
+        self._count = mp.RawValue(ctypes.c_uint64, 0)  # number of spans written since the recorder was created
+        self._pid = mp.RawValue(ctypes.c_int64, 0)
+        self._bind()
+
+    def _bind(self):
+        self._entries = np.frombuffer(self._buffer, dtype=self.entry_dtype)
+        self._begins = self._entries['begin']
+        self._ends = self._entries['end']
+        self._names = self._entries['name']
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_entries']
+        del state['_begins']
+        del state['_ends']
+        del state['_names']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind()
+
+    def activate(self):
+        """
+        Make this the recorder of span() in the calling process, called by the module process when it starts
+        """
+        global _active_recorder
+        _active_recorder = self
+        self._pid.value = os.getpid()
+
+    def span(self, name):
+        """
+        :param name: name of the span
+        :return: context manager that records a span with this name in this recorder
+        """
+        return _Span(self, name)
+
+    def add(self, name, begin_in_ns, end_in_ns):
+        """
+        Store one span, should only be called by the writer
+        :param name: name of the span
+        :param begin_in_ns: perf_counter_ns() at the begin of the span
+        :param end_in_ns: perf_counter_ns() at the end of the span
+        """
+        count = self._count.value
+        index = count % self.length
+        self._begins[index] = begin_in_ns
+        self._ends[index] = end_in_ns
+        self._names[index] = name  # NumPy encodes (ASCII) and truncates
+        self._count.value = count + 1
+
+    def read(self):
+        """
+        Copy all spans that are in the ring, oldest first
+        :return: structured array with the fields 'begin', 'end' (ns) and 'name' (bytes)
+        """
+        count_before = self._count.value
+        entries = self._entries.copy()
+        count_after = self._count.value
+
+        # add() writes the slot of entry count before it increments the count: the slot of entry count_after (which held entry
+        # count_after - length) may have been written during the copy, the entries from count_after - length + 1 onwards are complete
+        first = max(count_after - self.length + 1, 0)
+        indices = np.arange(first, count_before) % self.length
+        return entries[indices]
+
+    def to_trace_events(self, process_name):
+        """
+        :param process_name: name of the process in the trace (e.g. the module)
+        :return: list of Chrome trace events (complete events, time stamps in us) of all spans in the ring, plus the process name metadata event
+        """
+        pid = self._pid.value
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': pid, 'args': {'name': process_name}}]
+        for entry in self.read():
+            events.append({'name': entry['name'].decode(errors='replace'),
+                           'cat': process_name,
+                           'ph': 'X',
+                           'ts': int(entry['begin']) * 1e-3,
+                           'dur': int(entry['end'] - entry['begin']) * 1e-3,
+                           'pid': pid,
+                           'tid': pid})
+
+        return events
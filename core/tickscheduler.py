@@ -0,0 +1,114 @@
+import time
+from enum import Enum
+
+
+class OverrunPolicy(Enum):
+    """
+    What a TickScheduler does when a tick ends after the deadline of the next tick
+    """
+    CATCH_UP = 0  # run the missed ticks back-to-back, such that the number of ticks matches the elapsed time
+    SKIP = 1  # drop the missed ticks and continue on the original time grid
+    RE_PHASE = 2  # start a new time grid at the moment the overrun is detected (same as SKIP when aligned to a global clock)
+
+    def __str__(self):
+        return {OverrunPolicy.CATCH_UP: 'Catch up',
+                OverrunPolicy.SKIP: 'Skip',
+                OverrunPolicy.RE_PHASE: 'Re-phase'}[self]
+
+
+class TickScheduler:
+    """
+    Paces a loop on absolute deadlines (perf_counter_ns) without drift: sleeps until spin_time_in_ns before the deadline, then busy-waits.
+    Keeps track of the jitter, overruns and skipped ticks.
+    """
+
+    def __init__(self, period_in_ns, spin_time_in_ns=1000000, overrun_policy=OverrunPolicy.CATCH_UP):
+        """
+        :param period_in_ns: time step of the loop (ns)
+        :param spin_time_in_ns: last part of every wait that is busy-waited instead of slept (ns)
+        :param overrun_policy: OverrunPolicy
+        """
+        self.period_in_ns = int(period_in_ns)
+        self.spin_time_in_ns = int(spin_time_in_ns)
+        self.overrun_policy = overrun_policy
+
+        self.next_deadline = 0
+        self.grid_origin = None  # set by align(), ticks are kept on grid_origin + n * period
+        self.jitter = 0
+        self.max_jitter = 0
+        self.overrun_count = 0
+        self.skipped_tick_count = 0
+        self.overran = False  # True if the last wait() started after its deadline (the jitter is then not caused by sleeping)
+
+    def start(self, now_in_ns=None):
+        """
+        Start the time grid: the first deadline is one period from now. Resets the statistics.
+        :param now_in_ns: current perf_counter_ns(), optional
+        """
+        self.restart(now_in_ns)
+        self.grid_origin = None
+        self.jitter = 0
+        self.max_jitter = 0
+        self.overrun_count = 0
+        self.skipped_tick_count = 0
+
+    def restart(self, now_in_ns=None):
+        """
+        Start a new time grid (e.g. when a tick was triggered by an event instead of the deadline), keeps the statistics
+        :param now_in_ns: current perf_counter_ns(), optional
+        """
+        if now_in_ns is None:
+            now_in_ns = time.perf_counter_ns()
+
+        self.next_deadline = now_in_ns + self.period_in_ns
+
+    def align(self, epoch_in_ns, phase_offset_in_ns=0):
+        """
+        Put the deadlines on a global grid epoch + phase offset + n * period (lock-step mode, see GlobalClock). The next deadline is the first grid
+        point from now.
+        :param epoch_in_ns: perf_counter_ns() at which the global grid starts
+        :param phase_offset_in_ns: offset of this loop with respect to the global grid
+        """
+        self.grid_origin = int(epoch_in_ns + phase_offset_in_ns)
+
+        now = time.perf_counter_ns()
+        self.next_deadline = self.grid_origin + max(-(-(now - self.grid_origin) // self.period_in_ns), 0) * self.period_in_ns
+
+    def time_until_deadline(self):
+        """
+        :return: time until the next deadline (ns), negative if the deadline has passed
+        """
+        return self.next_deadline - time.perf_counter_ns()
+
+    def wait(self):
+        """
+        Wait until the next deadline and move the deadline one tick further (according to the overrun policy)
+        :return: jitter of this tick (ns)
+        """
+        deadline = self.next_deadline
+        now = time.perf_counter_ns()
+
+        self.overran = now >= deadline
+        if not self.overran:
+            if deadline - now > self.spin_time_in_ns:
+                time.sleep((deadline - now - self.spin_time_in_ns) * 1e-9)
+
+            now = time.perf_counter_ns()
+            while now < deadline:
+                now = time.perf_counter_ns()
+        else:
+            self.overrun_count += 1
+
+        self.jitter = now - deadline
+        self.max_jitter = max(self.max_jitter, self.jitter)
+
+        self.next_deadline = deadline + self.period_in_ns
+        if self.next_deadline <= now:
+            if self.overrun_policy is OverrunPolicy.SKIP or (self.overrun_policy is OverrunPolicy.RE_PHASE and self.grid_origin is not None):
+                missed_ticks = (now - deadline) // self.period_in_ns
+                self.skipped_tick_count += missed_ticks
+                self.next_deadline += missed_ticks * self.period_in_ns
+            elif self.overrun_policy is OverrunPolicy.RE_PHASE:
+                self.next_deadline = now + self.period_in_ns
+
+        return self.jitter
@@ -0,0 +1,128 @@
+"""
+Run JOAN without the GUI, e.g. for unattended batch trials or from scripts. There are no dialogs, plots or HQ window competing with the module
+processes; the status of the modules is reported to the console (and optionally a log file).
+
+Examples:
+    python headless.py --experiment experiments/my_experiment.json --duration 120
+    python headless.py --module "Hardware Manager=10" --module "Carla Interface=10" --module "Data Recorder=10" --settings my_settings.json
+
+The modules are added in the given order (NAME=TIME_STEP_IN_MS, the time step defaults to 10 ms); without --module, the modules of the experiment
+are added. Settings files (as saved from a module dialog or the settings overview) are loaded into the modules they contain settings for, on top of
+the default settings; an experiment then applies its base settings and conditions. Without an experiment, one trial is run.
+"""
+import argparse
+import json
+import logging
+import sys
+
+# Qt, the HQ and the modules are imported in the functions, not at the top (see tools.lazyimport)
+
+
+def parse_module(argument):
+    """
+    :param argument: 'NAME' or 'NAME=TIME_STEP_IN_MS', e.g. 'Carla Interface=10'
+    :return: (JOANModules, time step in ms)
+    """
+    from modules.joanmodules import JOANModules
+
+    name, _, time_step_in_ms = argument.partition('=')
+    module = JOANModules.from_string_representation(name.strip())
+    if module is None:
+        raise argparse.ArgumentTypeError('unknown module "%s", choose from: %s' % (name, ', '.join(str(module) for module in JOANModules)))
+
+    try:
+        return module, float(time_step_in_ms) if time_step_in_ms else 10
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid time step "%s" for %s' % (time_step_in_ms, module))
+
+
+def modules_in_settings_file(file_path):
+    """
+    :param file_path: settings JSON file, with the settings of every module under its name
+    :return: list of the modules the file has settings for
+    """
+    from modules.joanmodules import JOANModules
+
+    with open(file_path, 'r') as settings_file:
+        loaded_dict = json.load(settings_file)
+
+    return [module for module in (JOANModules.from_string_representation(key) for key in loaded_dict) if module is not None]
+
+
+def main():
+    from PyQt5 import QtCore
+
+    from core.hq.hq_manager import HQManager
+    from core.hq.headless_runner import HeadlessRunner
+    from modules.experimentmanager.experiment import Experiment
+    from modules.joanmodules import JOANModules
+
+    parser = argparse.ArgumentParser(description='Run JOAN without the GUI')
+    parser.add_argument('--module', type=parse_module, action='append', default=[], metavar='NAME[=TIME_STEP_IN_MS]',
+                        help='module to add (repeatable), e.g. "Carla Interface=10"; default: the modules of the experiment')
+    parser.add_argument('--settings', action='append', default=[], metavar='FILE', help='settings JSON file to load (repeatable)')
+    parser.add_argument('--experiment', metavar='FILE', help='experiment JSON file, a trial is run for every condition in its sequence')
+    parser.add_argument('--duration', type=float, metavar='S', help='duration of every trial; default: until a module stops all modules, or Ctrl+C')
+    parser.add_argument('--status-interval', type=float, default=1.0, metavar='S', help='time between status reports (default: 1 s)')
+    parser.add_argument('--ready-timeout', type=float, default=60.0, metavar='S', help='maximum time to get the modules ready (default: 60 s)')
+    parser.add_argument('--log', metavar='FILE', help='also write the status reports to this file')
+    parser.add_argument('--history-length', type=int, default=0, metavar='TICKS',
+                        help='keep this many ticks of every module in its shared history, e.g. to let the data recorder record every tick')
+    parser.add_argument('--warm-restart', action='store_true', help='keep the module processes alive between trials')
+    parser.add_argument('--lock-step', type=float, metavar='MS', help='let all modules tick on one global clock with this time step')
+    parser.add_argument('--timing-statistics', action='store_true', help='save the timing statistics of every trial')
+    parser.add_argument('--trace', action='store_true', help='record the spans of all module ticks and export a trace at the end')
+    arguments = parser.parse_args()
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if arguments.log:
+        handlers.append(logging.FileHandler(arguments.log))
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s', handlers=handlers)
+
+    modules = arguments.module
+    if not modules and arguments.experiment:
+        modules = [(module, 10) for module in Experiment.load_from_file(arguments.experiment).modules_included]
+    if not modules:
+        parser.error('no modules to run, add them with --module or give an --experiment')
+
+    app = QtCore.QCoreApplication(sys.argv)
+
+    hq_manager = HQManager(headless=True)
+    if arguments.lock_step:
+        hq_manager.enable_lock_step(arguments.lock_step)
+    if arguments.trace:
+        hq_manager.enable_span_tracing()
+    if arguments.warm_restart:
+        hq_manager.enable_warm_restart()
+    hq_manager.save_timing_statistics = arguments.timing_statistics
+
+    for module, time_step_in_ms in modules:
+        if module is not JOANModules.EXPERIMENT_MANAGER:
+            hq_manager.add_module(module, time_step_in_ms=time_step_in_ms, high_rate=time_step_in_ms < 10, history_length=arguments.history_length)
+
+    for file_path in arguments.settings:
+        for module in modules_in_settings_file(file_path):
+            if module in hq_manager.instantiated_modules:
+                hq_manager.instantiated_modules[module].load_from_file(file_path)
+
+    runner = HeadlessRunner(hq_manager, trial_duration_in_s=arguments.duration, status_interval_in_s=arguments.status_interval,
+                            ready_timeout_in_s=arguments.ready_timeout)
+    try:
+        if arguments.experiment:
+            failed_trials = runner.run_experiment(arguments.experiment)
+        else:
+            failed_trials = 0 if runner.run_trial() else 1
+    except KeyboardInterrupt:
+        logging.getLogger('joan.headless').info('Interrupted')
+        failed_trials = 1
+    finally:
+        if arguments.trace:
+            hq_manager.export_trace()
+        hq_manager.quit()
+        app.processEvents()
+
+    return 1 if failed_trials else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,26 @@
 import sys
 
-from PyQt5 import QtWidgets
 
-from core import HQManager
-from modules.joanmodules import JOANModules
+def main():
+    # imported here, not at the top (see tools.lazyimport)
+    from PyQt5 import QtWidgets
+
+    from core import HQManager
+    from modules.joanmodules import JOANModules
 
-if __name__ == '__main__':
     APP = QtWidgets.QApplication(sys.argv)
 
     JOANHQACTION = HQManager()
 
+    # optional: let all modules tick in phase on one global clock, the order within a tick is set with phase_offset_in_ms in add_module
+    # JOANHQACTION.enable_lock_step(time_step_in_ms=10)
+
+    # optional: record the spans of all module ticks, for the trace export in the View menu (Perfetto / chrome://tracing)
+    # JOANHQACTION.enable_span_tracing()
+
+    # optional: keep the module processes alive between trials, such that back-to-back conditions restart quickly
+    # JOANHQACTION.enable_warm_restart()
+
     # adding modules (instantiates them too)
     # JOANHQACTION.add_module(JOANModules.TEMPLATE, time_step_in_ms=100)
     JOANHQACTION.add_module(JOANModules.HARDWARE_MANAGER, time_step_in_ms=10)
@@ -21,4 +32,8 @@ if __name__ == '__main__':
     JOANHQACTION.add_module(JOANModules.DATA_RECORDER, time_step_in_ms=10)
     JOANHQACTION.add_module(JOANModules.EXPERIMENT_MANAGER, time_step_in_ms=500)
 
-    APP.exec_()
+    return APP.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
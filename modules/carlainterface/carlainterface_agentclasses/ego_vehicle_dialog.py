@@ -0,0 +1,135 @@
+import os
+
+from PyQt5 import uic, QtWidgets
+from modules.carlainterface.carlainterface_agenttypes import AgentTypes
+from modules.joanmodules import JOANModules
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QMessageBox
+
+
+class EgoVehicleSettingsDialog(QtWidgets.QDialog):
+    def __init__(self, settings, module_manager, parent=None):
+        super().__init__(parent)
+
+        self.settings = settings
+        self.module_manager = module_manager
+        self.carla_interface_overall_settings = self.module_manager.module_settings
+        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/ego_vehicle_settings_ui.ui"), self)
+        self.msg_box = QMessageBox()
+        self.msg_box.setTextFormat(QtCore.Qt.RichText)
+
+        self.button_box_egovehicle_settings.button(self.button_box_egovehicle_settings.RestoreDefaults).clicked.connect(
+            self._set_default_values)
+        self.btn_apply_parameters.clicked.connect(self.update_parameters)
+        self.btn_update.clicked.connect(lambda: self.update_settings(self.settings))
+        self.display_values()
+
+        self.update_settings(self.settings)
+
+    def show(self):
+        self.update_settings(self.settings)
+        super().show()
+
+    def update_parameters(self):
+        self.settings.velocity = self.spin_velocity.value()
+        self.settings.selected_input = self.combo_input.currentText()
+        self.settings.selected_controller = self.combo_haptic_controllers.currentText()
+        self.settings.selected_car = self.combo_car_type.currentText()
+        self.settings.selected_spawnpoint = self.combo_spawnpoints.currentText()
+        for settings in self.carla_interface_overall_settings.agents.values():
+            if settings.identifier != self.settings.identifier:  # exlude own settings
+                if settings.selected_spawnpoint == self.combo_spawnpoints.currentText() and settings.selected_spawnpoint != 'None':
+                    self.msg_box.setText('This spawnpoint was already chosen for another agent \n'
+                                         'resetting spawnpoint to None')
+                    self.msg_box.exec()
+                    self.settings.selected_spawnpoint = 'None'
+                    break
+                else:
+                    self.settings.selected_spawnpoint = self.combo_spawnpoints.currentText()
+
+        self.settings.set_velocity = self.check_box_set_vel.isChecked()
+        self.display_values()
+
+    def accept(self):
+        self.settings.velocity = self.spin_velocity.value()
+        self.settings.selected_input = self.combo_input.currentText()
+        self.settings.selected_controller = self.combo_haptic_controllers.currentText()
+        self.settings.selected_car = self.combo_car_type.currentText()
+        self.settings.selected_spawnpoint = self.combo_spawnpoints.currentText()
+        for settings in self.carla_interface_overall_settings.agents.values():
+            if settings.identifier != self.settings.identifier:  # exlude own settings
+                if settings.selected_spawnpoint == self.combo_spawnpoints.currentText() and settings.selected_spawnpoint != 'None':
+                    self.msg_box.setText('This spawnpoint was already chosen for another agent \n'
+                                         'resetting spawnpoint to None')
+                    self.msg_box.exec()
+                    self.settings.selected_spawnpoint = 'None'
+                    break
+            else:
+                self.settings.selected_spawnpoint = self.combo_spawnpoints.currentText()
+        self.settings.set_velocity = self.check_box_set_vel.isChecked()
+        super().accept()
+
+    def display_values(self, settings_to_display=None):
+        if not settings_to_display:
+            settings_to_display = self.settings
+
+        idx_controller = self.combo_haptic_controllers.findText(settings_to_display.selected_controller)
+        self.combo_haptic_controllers.setCurrentIndex(idx_controller)
+
+        idx_input = self.combo_input.findText(settings_to_display.selected_input)
+        self.combo_input.setCurrentIndex(idx_input)
+
+        idx_car = self.combo_car_type.findText(settings_to_display.selected_car)
+        self.combo_car_type.setCurrentIndex(idx_car)
+
+        self.combo_spawnpoints.setCurrentText(settings_to_display.selected_spawnpoint)
+
+        self.spin_velocity.setValue(settings_to_display.velocity)
+        self.check_box_set_vel.setChecked(settings_to_display.set_velocity)
+
+    def _set_default_values(self):
+        self.display_values(AgentTypes.EGO_VEHICLE.settings())
+
+    def update_settings(self, settings):
+        try:
+            # Update hardware inputs according to current settings:
+            self.combo_input.clear()
+            self.combo_input.addItem('None')
+            HardwareManagerSettings = self.module_manager.central_settings.get_settings(JOANModules.HARDWARE_MANAGER)
+            for inputs in HardwareManagerSettings.inputs.values():
+                self.combo_input.addItem(str(inputs))
+            idx = self.combo_input.findText(
+                settings.selected_input)
+            if idx != -1:
+                self.combo_input.setCurrentIndex(idx)
+
+            # update available vehicles
+            self.combo_car_type.clear()
+            self.combo_car_type.addItem('None')
+            self.combo_car_type.addItems(self.module_manager.vehicle_tags)
+            idx = self.combo_car_type.findText(settings.selected_car)
+            if idx != -1:
+                self.combo_car_type.setCurrentIndex(idx)
+
+            # update available spawn_points:
+            self.combo_spawnpoints.clear()
+            self.combo_spawnpoints.addItem('None')
+            self.combo_spawnpoints.addItems(self.module_manager.spawn_points)
+            idx = self.combo_spawnpoints.findText(
+                settings.selected_spawnpoint)
+            if idx != -1:
+                self.combo_spawnpoints.setCurrentIndex(idx)
+
+            # update available controllers according to current settings:
+            self.combo_haptic_controllers.clear()
+            self.combo_haptic_controllers.addItem('None')
+            HapticControllerManagerSettings = self.module_manager.central_settings.get_settings(JOANModules.HAPTIC_CONTROLLER_MANAGER)
+            for haptic_controller in HapticControllerManagerSettings.haptic_controllers.values():
+                self.combo_haptic_controllers.addItem(str(haptic_controller))
+            idx = self.combo_haptic_controllers.findText(
+                settings.selected_controller)
+            if idx != -1:
+                self.combo_haptic_controllers.setCurrentIndex(idx)
+        except AttributeError:
+            # Catching attribute error when using default car settings
+            pass
@@ -0,0 +1,193 @@
+import random, math
+import numpy as np
+
+from tools.carlaimporter import carla
+
+from core.latencytrace import TraceHop, carry_trace
+from core.spanrecorder import span
+
+
+class EgoVehicleProcess:
+    def __init__(self, carla_mp, settings, shared_variables):
+        self.settings = settings
+        self.shared_variables = shared_variables
+        self.carlainterface_mp = carla_mp
+
+        self._control = carla.VehicleControl()
+        if self.settings.selected_car != 'None':
+            self._BP = random.choice(self.carlainterface_mp.vehicle_blueprint_library.filter("vehicle." + self.settings.selected_car))
+        self._control = carla.VehicleControl()
+        self.world_map = self.carlainterface_mp.world.get_map()
+        self._road_data = np.zeros(self.shared_variables.road_data_view().shape)  # local buffer for the road data, written to shared at once
+        torque_curve = []
+        gears = []
+
+        torque_curve.append(carla.Vector2D(x=0, y=600))
+        torque_curve.append(carla.Vector2D(x=14000, y=600))
+        gears.append(carla.GearPhysicsControl(ratio=7.73, down_ratio=0.5, up_ratio=1))
+
+        if self.settings.selected_spawnpoint != 'None':
+            if self.settings.selected_car != 'None':
+                self.spawned_vehicle = self.carlainterface_mp.world.spawn_actor(self._BP, self.carlainterface_mp.spawn_point_objects[
+                    self.carlainterface_mp.spawn_points.index(self.settings.selected_spawnpoint)])
+                physics = self.spawned_vehicle.get_physics_control()
+                physics.torque_curve = torque_curve
+                physics.max_rpm = 14000
+                physics.moi = 1.5
+                physics.final_ratio = 1
+                physics.clutch_strength = 1000  # very big no clutch
+                physics.final_ratio = 1  # ratio from transmission to wheels
+                physics.forward_gears = gears
+                physics.mass = 2316
+                physics.drag_coefficient = 0.24
+                physics.gear_switch_time = 0
+                self.spawned_vehicle.apply_physics_control(physics)
+
+    def do(self):
+        if self.settings.selected_input != 'None' and hasattr(self, 'spawned_vehicle'):
+            self._control.steer = self.carlainterface_mp.shared_variables_hardware.inputs[self.settings.selected_input].steering_angle / math.radians(450)
+            self._control.reverse = self.carlainterface_mp.shared_variables_hardware.inputs[self.settings.selected_input].reverse
+            self._control.hand_brake = self.carlainterface_mp.shared_variables_hardware.inputs[self.settings.selected_input].handbrake
+            self._control.brake = self.carlainterface_mp.shared_variables_hardware.inputs[self.settings.selected_input].brake
+            if self.settings.set_velocity:
+                vel_error = self.settings.velocity - (math.sqrt(
+                    self.spawned_vehicle.get_velocity().x ** 2 + self.spawned_vehicle.get_velocity().y ** 2 + self.spawned_vehicle.get_velocity().z ** 2) * 3.6)
+                vel_error_rate = (math.sqrt(
+                    self.spawned_vehicle.get_acceleration().x ** 2 + self.spawned_vehicle.get_acceleration().y ** 2 + self.spawned_vehicle.get_acceleration().z ** 2) * 3.6)
+                error_velocity = [vel_error, vel_error_rate]
+
+                pd_vel_output = self.velocity_PD_controller(error_velocity)
+                if pd_vel_output < 0:
+                    self._control.brake = -pd_vel_output
+                    self._control.throttle = 0
+                    if pd_vel_output < -1:
+                        self._control.brake = 1
+                elif pd_vel_output > 0:
+                    if self._control.brake == 0:
+                        self._control.throttle = pd_vel_output
+                    else:
+                        self._control.throttle = 0
+            else:
+                self._control.throttle = self.carlainterface_mp.shared_variables_hardware.inputs[self.settings.selected_input].throttle
+
+            with span('apply_control'):
+                self.spawned_vehicle.apply_control(self._control)
+            carry_trace(self.carlainterface_mp.shared_variables_hardware.inputs[self.settings.selected_input], 'input_trace',
+                        self.shared_variables, 'input_trace', TraceHop.CONTROL_APPLIED, self.shared_variables.trace_latencies()['input_trace'])
+            try:
+                with span('calculate_plotter_road_arrays'):
+                    self.calculate_plotter_road_arrays()
+            except IndexError:
+                pass
+
+        with span('set_shared_variables'):
+            self.set_shared_variables()
+
+    def destroy(self):
+        if hasattr(self, 'spawned_vehicle'):
+            self.spawned_vehicle.destroy()
+
+    def velocity_PD_controller(self, vel_error):
+        _kp_vel = 50
+        _kd_vel = 1
+        temp = _kp_vel * vel_error[0] + _kd_vel * vel_error[1]
+
+        if temp > 100:
+            temp = 100
+
+        output = temp / 100
+
+        return output
+
+    def calculate_plotter_road_arrays(self):
+        if self.spawned_vehicle is not None:
+            vehicle_location = self.spawned_vehicle.get_location()
+            closest_waypoint = self.world_map.get_waypoint(vehicle_location, project_to_road=True)
+
+            # 25 previous and 25 next waypoints
+            waypoints = [closest_waypoint.previous(a)[0] for a in reversed(range(1, 26))] + [closest_waypoint.next(a)[0] for a in range(1, 26)]
+
+            data_road_x = self._road_data[0]
+            data_road_y = self._road_data[3]
+            data_road_psi = self._road_data[6]
+            data_road_lanewidth = self._road_data[7]
+
+            data_road_x[:] = [waypoint.transform.location.x for waypoint in waypoints]
+            data_road_y[:] = [waypoint.transform.location.y for waypoint in waypoints]
+            data_road_lanewidth[:] = [waypoint.lane_width for waypoint in waypoints]
+
+            # heading of the road between subsequent waypoints, with respect to the x-axis; the last point has no successor
+            data_road_psi[:-1] = np.arctan2(-np.diff(data_road_y), np.diff(data_road_x))
+            data_road_psi[-1] = 0
+
+            half_lane_width = data_road_lanewidth / 2
+            np.add(data_road_x, np.sin(data_road_psi) * half_lane_width, out=self._road_data[1])  # inner
+            np.subtract(data_road_x, np.sin(data_road_psi) * half_lane_width, out=self._road_data[2])  # outer
+            np.add(data_road_y, np.cos(data_road_psi) * half_lane_width, out=self._road_data[4])  # inner
+            np.subtract(data_road_y, np.cos(data_road_psi) * half_lane_width, out=self._road_data[5])  # outer
+
+            # set shared road variables:
+            self.shared_variables.commit_road_data(self._road_data)
+
+    def set_shared_variables(self):
+        if hasattr(self, 'spawned_vehicle'):
+            transform = self.spawned_vehicle.get_transform()
+            rotation = transform.rotation
+            linear_velocity = self.spawned_vehicle.get_velocity()
+            angular_velocity = self.spawned_vehicle.get_angular_velocity()
+            acceleration = self.spawned_vehicle.get_acceleration()
+
+            rotation_matrix = self.get_rotation_matrix_from_carla(rotation.roll, rotation.pitch, rotation.yaw)
+            velocities_in_vehicle_frame = np.linalg.inv(rotation_matrix) @ np.array([linear_velocity.x, linear_velocity.y, linear_velocity.z])
+
+            latest_applied_control = self.spawned_vehicle.get_control()
+
+            # commit all at once, so readers never see a mix of two simulation frames
+            self.shared_variables.commit(transform=[transform.location.x,
+                                                    transform.location.y,
+                                                    transform.location.z,
+                                                    rotation.yaw,
+                                                    rotation.pitch,
+                                                    rotation.roll],
+                                         velocities_in_world_frame=[linear_velocity.x,
+                                                                    linear_velocity.y,
+                                                                    linear_velocity.z,
+                                                                    angular_velocity.x,
+                                                                    angular_velocity.y,
+                                                                    angular_velocity.z],
+                                         velocities_in_vehicle_frame=velocities_in_vehicle_frame,
+                                         accelerations=[acceleration.x,
+                                                        acceleration.y,
+                                                        acceleration.z],
+                                         applied_input=[float(latest_applied_control.steer),
+                                                        float(latest_applied_control.reverse),
+                                                        float(latest_applied_control.hand_brake),
+                                                        float(latest_applied_control.brake),
+                                                        float(latest_applied_control.throttle)])
+
+    @staticmethod
+    def get_rotation_matrix_from_carla(roll, pitch, yaw, degrees=True):
+        """ calculation based on this github issue: https://github.com/carla-simulator/carla/issues/58 because carla uses some rather unconventional conventions."""
+        if degrees:
+            roll, pitch, yaw = np.radians([roll, pitch, yaw])
+
+        yaw_matrix = np.array([
+            [math.cos(yaw), -math.sin(yaw), 0],
+            [math.sin(yaw), math.cos(yaw), 0],
+            [0, 0, 1]
+        ])
+
+        pitch_matrix = np.array([
+            [math.cos(pitch), 0, -math.sin(pitch)],
+            [0, 1, 0],
+            [math.sin(pitch), 0, math.cos(pitch)]
+        ])
+
+        roll_matrix = np.array([
+            [1, 0, 0],
+            [0, math.cos(roll), math.sin(roll)],
+            [0, -math.sin(roll), math.cos(roll)]
+        ])
+
+        rotation_matrix = yaw_matrix @ pitch_matrix @ roll_matrix
+        return rotation_matrix
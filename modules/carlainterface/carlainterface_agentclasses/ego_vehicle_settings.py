@@ -0,0 +1,31 @@
+from modules.carlainterface.carlainterface_agenttypes import AgentTypes
+
+
+class EgoVehicleSettings:
+    """
+    Class containing the default settings for an egovehicle
+    """
+
+    def __init__(self, identifier=''):
+        """
+        Initializes the class with default variables
+        """
+        self.selected_input = 'None'
+        self.selected_controller = 'None'
+        self.selected_spawnpoint = 'Spawnpoint 0'
+        self.selected_car = 'hapticslab.audi'
+        self.velocity = 80
+        self.set_velocity = False
+        self.identifier = identifier
+
+        self.agent_type = AgentTypes.EGO_VEHICLE.value
+
+    def as_dict(self):
+        return self.__dict__
+
+    def set_from_loaded_dict(self, loaded_dict):
+        for key, value in loaded_dict.items():
+            self.__setattr__(key, value)
+
+    def __str__(self):
+        return self.identifier
@@ -0,0 +1,95 @@
+import os
+
+from PyQt5 import uic, QtWidgets
+from modules.carlainterface.carlainterface_agenttypes import AgentTypes
+from modules.joanmodules import JOANModules
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QMessageBox
+
+
+class NPCVehicleSettingsDialog(QtWidgets.QDialog):
+    def __init__(self, settings, module_manager, parent=None):
+        super().__init__(parent)
+
+        self.settings = settings
+        self.module_manager = module_manager
+        self.carla_interface_overall_settings = self.module_manager.module_settings
+        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/npc_vehicle_settings_ui.ui"), self)
+        self.msg_box = QMessageBox()
+        self.msg_box.setTextFormat(QtCore.Qt.RichText)
+
+        self.button_box_vehicle_settings.button(self.button_box_vehicle_settings.RestoreDefaults).clicked.connect(
+            self._set_default_values)
+        self.btn_apply_parameters.clicked.connect(self.update_parameters)
+        self.btn_update.clicked.connect(lambda: self.update_settings(self.settings))
+        self.display_values()
+
+        self.update_settings(self.settings)
+
+    def show(self):
+        self.update_settings(self.settings)
+        super().show()
+
+    def update_parameters(self):
+        self.settings.selected_npc_controller = self.combo_controller.currentText()
+        self.settings.selected_car = self.combo_car_type.currentText()
+        self.settings.selected_spawnpoint = self.combo_spawnpoints.currentText()
+        for settings in self.carla_interface_overall_settings.agents.values():
+            if settings.identifier != self.settings.identifier:  # exlude own settings
+                if settings.selected_spawnpoint == self.combo_spawnpoints.currentText() and settings.selected_spawnpoint != 'None':
+                    self.msg_box.setText('This spawnpoint was already chosen for another agent \n'
+                                         'resetting spawnpoint to None')
+                    self.msg_box.exec()
+                    self.settings.selected_spawnpoint = 'None'
+                    break
+                else:
+                    self.settings.selected_spawnpoint = self.combo_spawnpoints.currentText()
+
+        self.display_values()
+
+    def accept(self):
+        self.update_parameters()
+        super().accept()
+
+    def display_values(self, settings_to_display=None):
+        if not settings_to_display:
+            settings_to_display = self.settings
+
+        idx_controller = self.combo_controller.findText(settings_to_display.selected_npc_controller)
+        self.combo_controller.setCurrentIndex(idx_controller)
+
+        idx_car = self.combo_car_type.findText(settings_to_display.selected_car)
+        self.combo_car_type.setCurrentIndex(idx_car)
+
+        self.combo_spawnpoints.setCurrentText(settings_to_display.selected_spawnpoint)
+
+    def _set_default_values(self):
+        self.display_values(AgentTypes.NPC_VEHICLE.settings())
+
+    def update_settings(self, settings):
+        # update available vehicles
+        self.combo_car_type.clear()
+        self.combo_car_type.addItem('None')
+        self.combo_car_type.addItems(self.module_manager.vehicle_tags)
+        idx = self.combo_car_type.findText(settings.selected_car)
+        if idx != -1:
+            self.combo_car_type.setCurrentIndex(idx)
+
+        # update available spawn_points:
+        self.combo_spawnpoints.clear()
+        self.combo_spawnpoints.addItem('None')
+        self.combo_spawnpoints.addItems(self.module_manager.spawn_points)
+        idx = self.combo_spawnpoints.findText(
+            settings.selected_spawnpoint)
+        if idx != -1:
+            self.combo_spawnpoints.setCurrentIndex(idx)
+
+        # update available controllers according to current settings:
+        self.combo_controller.clear()
+        self.combo_controller.addItem('None')
+        npc_controller_manager_settings = self.module_manager.central_settings.get_settings(JOANModules.NPC_CONTROLLER_MANAGER)
+        for controller_identifier, controller_settings in npc_controller_manager_settings.controllers.items():
+            self.combo_controller.addItem(controller_identifier)
+        idx = self.combo_controller.findText(settings.selected_npc_controller)
+        if idx != -1:
+            self.combo_controller.setCurrentIndex(idx)
@@ -0,0 +1,141 @@
+import random, math
+import numpy as np
+
+from tools.carlaimporter import carla
+
+from core.spanrecorder import span
+
+
+class NPCVehicleProcess:
+    def __init__(self, carla_mp, settings, shared_variables):
+        self.settings = settings
+        self.shared_variables = shared_variables
+        self.carlainterface_mp = carla_mp
+        self.npc_controller_shared_variables = carla_mp.npc_controller_shared_variables
+
+        if self.settings.selected_car != 'None':
+            self._BP = random.choice(self.carlainterface_mp.vehicle_blueprint_library.filter("vehicle." + self.settings.selected_car))
+        self._control = carla.VehicleControl()
+        self._rear_axle_in_vehicle_frame = np.array([0., 0., 0.])
+        self.world_map = self.carlainterface_mp.world.get_map()
+        torque_curve = []
+        gears = []
+
+        torque_curve.append(carla.Vector2D(x=0, y=600))
+        torque_curve.append(carla.Vector2D(x=14000, y=600))
+        gears.append(carla.GearPhysicsControl(ratio=7.73, down_ratio=0.5, up_ratio=1))
+
+        if self.settings.selected_spawnpoint != 'None':
+            if self.settings.selected_car != 'None':
+                self.spawned_vehicle = self.carlainterface_mp.world.spawn_actor(self._BP, self.carlainterface_mp.spawn_point_objects[
+                    self.carlainterface_mp.spawn_points.index(self.settings.selected_spawnpoint)])
+                physics = self.spawned_vehicle.get_physics_control()
+                physics.torque_curve = torque_curve
+                physics.max_rpm = 14000
+                physics.moi = 1.5
+                physics.final_ratio = 1
+                physics.clutch_strength = 1000  # very big no clutch
+                physics.final_ratio = 1  # ratio from transmission to wheels
+                physics.forward_gears = gears
+                physics.mass = 2316
+                physics.drag_coefficient = 0.24
+                physics.gear_switch_time = 0
+                self.spawned_vehicle.apply_physics_control(physics)
+                wheels = physics.wheels
+                self.shared_variables.max_steering_angle = np.radians(wheels[0].max_steer_angle)
+
+                rotation = self.spawned_vehicle.get_transform().rotation
+                rotation_matrix = self.get_rotation_matrix_from_carla(rotation.roll, rotation.pitch, rotation.yaw)
+
+                physics = self.spawned_vehicle.get_physics_control()
+                wheels = physics.wheels
+                rear_axle_in_world_frame = (((wheels[3].position - wheels[2].position) / 2) + wheels[2].position) / 100.
+                position_difference = rear_axle_in_world_frame - self.spawned_vehicle.get_transform().location
+                position_difference = np.array([position_difference.x, position_difference.y, position_difference.z])
+
+                self._rear_axle_in_vehicle_frame = np.linalg.inv(rotation_matrix) @ position_difference
+
+    def do(self):
+        if self.settings.selected_npc_controller != 'None' and hasattr(self, 'spawned_vehicle'):
+            self._control.steer = self.npc_controller_shared_variables.controllers[self.settings.selected_npc_controller].steering_angle / math.radians(450)
+            self._control.reverse = self.npc_controller_shared_variables.controllers[self.settings.selected_npc_controller].reverse
+            self._control.hand_brake = self.npc_controller_shared_variables.controllers[self.settings.selected_npc_controller].handbrake
+            self._control.brake = self.npc_controller_shared_variables.controllers[self.settings.selected_npc_controller].brake
+            self._control.throttle = self.npc_controller_shared_variables.controllers[self.settings.selected_npc_controller].throttle
+
+            with span('apply_control'):
+                self.spawned_vehicle.apply_control(self._control)
+
+        with span('set_shared_variables'):
+            self.set_shared_variables()
+
+    def destroy(self):
+        if hasattr(self, 'spawned_vehicle'):
+            self.spawned_vehicle.destroy()
+
+    def set_shared_variables(self):
+        if hasattr(self, 'spawned_vehicle'):
+            transform = self.spawned_vehicle.get_transform()
+            rotation = transform.rotation
+            center_location = transform.location
+            linear_velocity = self.spawned_vehicle.get_velocity()
+            angular_velocity = self.spawned_vehicle.get_angular_velocity()
+            acceleration = self.spawned_vehicle.get_acceleration()
+
+            rotation_matrix = self.get_rotation_matrix_from_carla(rotation.roll, rotation.pitch, rotation.yaw)
+            velocities_in_vehicle_frame = np.linalg.inv(rotation_matrix) @ np.array([linear_velocity.x, linear_velocity.y, linear_velocity.z])
+
+            center_location_as_np = np.array([center_location.x, center_location.y, center_location.z])
+
+            latest_applied_control = self.spawned_vehicle.get_control()
+
+            # commit all at once, so readers never see a mix of two simulation frames
+            self.shared_variables.commit(transform=[center_location.x,
+                                                    center_location.y,
+                                                    center_location.z,
+                                                    rotation.yaw,
+                                                    rotation.pitch,
+                                                    rotation.roll],
+                                         velocities_in_world_frame=[linear_velocity.x,
+                                                                    linear_velocity.y,
+                                                                    linear_velocity.z,
+                                                                    angular_velocity.x,
+                                                                    angular_velocity.y,
+                                                                    angular_velocity.z],
+                                         velocities_in_vehicle_frame=velocities_in_vehicle_frame,
+                                         rear_axle_position=center_location_as_np + rotation_matrix @ self._rear_axle_in_vehicle_frame,
+                                         accelerations=[acceleration.x,
+                                                        acceleration.y,
+                                                        acceleration.z],
+                                         applied_input=[float(latest_applied_control.steer),
+                                                        float(latest_applied_control.reverse),
+                                                        float(latest_applied_control.hand_brake),
+                                                        float(latest_applied_control.brake),
+                                                        float(latest_applied_control.throttle)])
+
+    @staticmethod
+    def get_rotation_matrix_from_carla(roll, pitch, yaw, degrees=True):
+        """ calculation based on this github issue: https://github.com/carla-simulator/carla/issues/58 because carla uses some rather unconventional conventions."""
+        if degrees:
+            roll, pitch, yaw = np.radians([roll, pitch, yaw])
+
+        yaw_matrix = np.array([
+            [math.cos(yaw), -math.sin(yaw), 0],
+            [math.sin(yaw), math.cos(yaw), 0],
+            [0, 0, 1]
+        ])
+
+        pitch_matrix = np.array([
+            [math.cos(pitch), 0, -math.sin(pitch)],
+            [0, 1, 0],
+            [math.sin(pitch), 0, math.cos(pitch)]
+        ])
+
+        roll_matrix = np.array([
+            [1, 0, 0],
+            [0, math.cos(roll), math.sin(roll)],
+            [0, -math.sin(roll), math.cos(roll)]
+        ])
+
+        rotation_matrix = yaw_matrix @ pitch_matrix @ roll_matrix
+        return rotation_matrix
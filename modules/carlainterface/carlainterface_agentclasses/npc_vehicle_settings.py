@@ -0,0 +1,39 @@
+from enum import Enum
+import copy
+
+from modules.carlainterface.carlainterface_agenttypes import AgentTypes
+
+
+class NPCVehicleSettings:
+    """
+    Class containing the default settings for an egovehicle
+    """
+
+    def __init__(self, identifier=''):
+        """
+        Initializes the class with default variables
+        """
+        self.selected_npc_controller = 'None'
+        self.selected_spawnpoint = 'Spawnpoint 0'
+        self.selected_car = 'hapticslab.audi'
+        self.identifier = identifier
+
+        self.agent_type = AgentTypes.NPC_VEHICLE
+
+    def as_dict(self):
+        return_dict = copy.copy(self.__dict__)
+        for key, item in self.__dict__.items():
+            if isinstance(item, Enum):
+                return_dict[key] = item.value
+
+        return return_dict
+
+    def set_from_loaded_dict(self, loaded_dict):
+        for key, value in loaded_dict.items():
+            if key == 'agent_type':
+                self.__setattr__(key, AgentTypes(value))
+            else:
+                self.__setattr__(key, value)
+
+    def __str__(self):
+        return self.identifier
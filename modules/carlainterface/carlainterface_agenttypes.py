@@ -1,6 +1,8 @@
 import enum
 import os
 
+from tools.lazyimport import import_class
+
 
 class AgentTypes(enum.Enum):
     """
@@ -8,6 +10,7 @@ class AgentTypes(enum.Enum):
     klass_mp: the class that runs in a seperate multiprocess which loops
     klass_dialog: the settings dialog of the input type
     shared_variables: the variables that need to be shared from the hardwareinpute type with the manager
+    shared_variables_groups: the optional groups of shared variables that are used by the agent type
     settings_ui_file: ui file of the settings dialog
     hardware_tab_uifile: ui file of the widget added in the module dialog
     settings: specific settings of the hardware input type
@@ -20,21 +23,15 @@ class AgentTypes(enum.Enum):
 
     @property
     def process(self):
-        from modules.carlainterface.carlainterface_agentclasses.ego_vehicle import EgoVehicleProcess
-        from modules.carlainterface.carlainterface_agentclasses.npc_vehicle import NPCVehicleProcess
-
-        return {AgentTypes.EGO_VEHICLE: EgoVehicleProcess,
-                AgentTypes.NPC_VEHICLE: NPCVehicleProcess
-                }[self]
+        return import_class({AgentTypes.EGO_VEHICLE: 'modules.carlainterface.carlainterface_agentclasses.ego_vehicle_process.EgoVehicleProcess',
+                            AgentTypes.NPC_VEHICLE: 'modules.carlainterface.carlainterface_agentclasses.npc_vehicle_process.NPCVehicleProcess'
+                            }[self])
 
     @property
     def settings_dialog(self):
-        from modules.carlainterface.carlainterface_agentclasses.ego_vehicle import EgoVehicleSettingsDialog
-        from modules.carlainterface.carlainterface_agentclasses.npc_vehicle import NPCVehicleSettingsDialog
-
-        return {AgentTypes.EGO_VEHICLE: EgoVehicleSettingsDialog,
-                AgentTypes.NPC_VEHICLE: NPCVehicleSettingsDialog
-                }[self]
+        return import_class({AgentTypes.EGO_VEHICLE: 'modules.carlainterface.carlainterface_agentclasses.ego_vehicle_dialog.EgoVehicleSettingsDialog',
+                            AgentTypes.NPC_VEHICLE: 'modules.carlainterface.carlainterface_agentclasses.npc_vehicle_dialog.NPCVehicleSettingsDialog'
+                            }[self])
 
     @property
     def shared_variables(self):
@@ -42,6 +39,17 @@ class AgentTypes(enum.Enum):
 
         return VehicleSharedVariables
 
+    @property
+    def shared_variables_groups(self):
+        """
+        Optional shared variables groups that are allocated for this agent type, NPC vehicles do not need the road data
+        """
+        from modules.carlainterface.carlainterface_sharedvariables import VehicleSharedVariables
+
+        return {AgentTypes.EGO_VEHICLE: (VehicleSharedVariables.road_data_group,),
+                AgentTypes.NPC_VEHICLE: ()
+                }[self]
+
     @property
     def settings_ui_file(self):
         path_to_uis = os.path.join(os.path.dirname(os.path.realpath(__file__)), "carlainterface_agentclasses/ui/")
@@ -58,12 +66,9 @@ class AgentTypes(enum.Enum):
 
     @property
     def settings(self):
-        from modules.carlainterface.carlainterface_agentclasses.ego_vehicle import EgoVehicleSettings
-        from modules.carlainterface.carlainterface_agentclasses.npc_vehicle import NPCVehicleSettings
-
-        return {AgentTypes.EGO_VEHICLE: EgoVehicleSettings,
-                AgentTypes.NPC_VEHICLE: NPCVehicleSettings
-                }[self]
+        return import_class({AgentTypes.EGO_VEHICLE: 'modules.carlainterface.carlainterface_agentclasses.ego_vehicle_settings.EgoVehicleSettings',
+                            AgentTypes.NPC_VEHICLE: 'modules.carlainterface.carlainterface_agentclasses.npc_vehicle_settings.NPCVehicleSettings'
+                            }[self])
 
     def __str__(self):
         return {AgentTypes.EGO_VEHICLE: 'Ego Vehicle',
@@ -9,7 +9,21 @@ from core.statesenum import State
 from modules.carlainterface.carlainterface_agenttypes import AgentTypes
 from modules.joanmodules import JOANModules
 
-from tools.carlaimporter import carla
+try:
+    from tools.carlaimporter import carla
+except ImportError:
+    if isinstance(QApplication.instance(), QApplication):  # not when running headless
+        msg_box = QtWidgets.QMessageBox()
+        msg_box.setTextFormat(QtCore.Qt.RichText)
+
+        msg_box.setText("""
+                        <h3> Could not find the carla python API! </h3>
+                        <h3> Check whether you copied the egg file correctly, reference:
+                    <a href=\"https://joan.readthedocs.io/en/latest/setup-carla-windows/\">https://joan.readthedocs.io/en/latest/setup-carla-windows/</a>
+                    </h3>
+                    """)
+        msg_box.exec()
+    raise
 
 
 class CarlaInterfaceManager(ModuleManager):
@@ -17,7 +31,7 @@ class CarlaInterfaceManager(ModuleManager):
     CarlaInterfaceManager module, inherits from the ModuleManager
     """
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         """
         :param news: contains all news from all modules
         :param signals: contains all signals
@@ -25,7 +39,7 @@ class CarlaInterfaceManager(ModuleManager):
         :param parent: neede for Qt windows
         """
         super().__init__(module=JOANModules.CARLA_INTERFACE, news=news, central_settings=central_settings, signals=signals,
-                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
         self._agent_settingdialogs_dict = {}
         self.central_settings = central_settings
 
@@ -72,7 +86,8 @@ class CarlaInterfaceManager(ModuleManager):
         """
         super().initialize()
         for agent in self.module_settings.agents.values():
-            self.shared_variables.agents[agent.identifier] = AgentTypes(agent.agent_type).shared_variables()
+            agent_type = AgentTypes(agent.agent_type)
+            self.shared_variables.agents[agent.identifier] = agent_type.shared_variables(optional_groups=agent_type.shared_variables_groups)
 
     def load_from_file(self, settings_file_to_load):
         """
@@ -91,7 +106,8 @@ class CarlaInterfaceManager(ModuleManager):
         for agent_settings in self.module_settings.all_agents().values():
             self.add_agent(AgentTypes(agent_settings.agent_type), from_button, agent_settings)
 
-        self.module_dialog.update_dialog()
+        if self.module_dialog:
+            self.module_dialog.update_dialog()
 
     def add_agent(self, agent_type: AgentTypes, from_button, agent_settings=None):
         """
@@ -104,7 +120,8 @@ class CarlaInterfaceManager(ModuleManager):
         agent_settings = self.module_settings.add_agent(agent_type, agent_settings)
 
         # add to module_dialog
-        self.module_dialog.add_agent(agent_settings, from_button)
+        if self.module_dialog:
+            self.module_dialog.add_agent(agent_settings, from_button)
 
     def remove_agent(self, identifier):
         """
@@ -114,7 +131,8 @@ class CarlaInterfaceManager(ModuleManager):
         self.module_settings.remove_agent(identifier)
 
         # remove settings from dialog
-        self.module_dialog.remove_agent(identifier)
+        if self.module_dialog:
+            self.module_dialog.remove_agent(identifier)
 
     def connect_carla(self):
         """
@@ -124,7 +142,8 @@ class CarlaInterfaceManager(ModuleManager):
         if not self.connected:
             try:
                 self.spawn_points.clear()
-                QApplication.setOverrideCursor(Qt.WaitCursor)
+                if not self.headless:
+                    QApplication.setOverrideCursor(Qt.WaitCursor)
                 self.client = carla.Client(self.host, self.port)  # connecting to server
                 self.client.set_timeout(2.0)
                 time.sleep(2)  # wait for 2 seconds for the connection to establish
@@ -141,27 +160,36 @@ class CarlaInterfaceManager(ModuleManager):
                     self.spawn_points.append("Spawnpoint " + str(spawn_point_objects.index(item)))
 
                 self.carla_waypoints = self.world_map.generate_waypoints(0.5)
-                QApplication.restoreOverrideCursor()
+                if not self.headless:
+                    QApplication.restoreOverrideCursor()
                 self.connected = True
 
                 print('JOAN connected to CARLA Server!')
 
             except RuntimeError:
-                msg_box = QtWidgets.QMessageBox()
-                msg_box.setTextFormat(QtCore.Qt.RichText)
-
-                QApplication.restoreOverrideCursor()
-                msg_box.setText('Could not connect to CARLA. Check if CARLA is running in Unreal Engine')
-                msg_box.exec()
+                if not self.headless:
+                    QApplication.restoreOverrideCursor()
+                self._show_message('Could not connect to CARLA. Check if CARLA is running in Unreal Engine')
                 self.connected = False
-                QApplication.restoreOverrideCursor()
 
         else:
-            self.msg.setText('JOAN is already connected to CARLA')
-            self.msg.exec()
+            self._show_message('JOAN is already connected to CARLA')
 
         return self.connected
 
+    def _show_message(self, text):
+        """
+        Show a message box, or print the message when running headless
+        :param text: message
+        """
+        if self.headless:
+            print(text)
+        else:
+            msg_box = QtWidgets.QMessageBox()
+            msg_box.setTextFormat(QtCore.Qt.RichText)
+            msg_box.setText(text)
+            msg_box.exec()
+
     def disconnect_carla(self):
         """
         This function will try and disconnect from the carla server, if the module was running it will transition into
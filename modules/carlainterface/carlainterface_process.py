@@ -1,16 +1,11 @@
-import platform
-import sys
 import time
 
-from core.exceptionhook import exception_log_and_kill_hook
 from core.module_process import ModuleProcess
+from core.spanrecorder import span
 from core.statesenum import State
 from modules.carlainterface.carlainterface_agenttypes import AgentTypes
 from modules.joanmodules import JOANModules
 
-if platform.system() == 'Windows':
-    import wres
-
 from tools.carlaimporter import carla
 
 
@@ -84,37 +79,28 @@ class CarlaInterfaceProcess(ModuleProcess):
 
         [self.vehicle_blueprint_library, self.spawn_point_objects, self.world, self.spawn_points] = connect_carla(host=host, port=port)
 
-        # Now we create our agents and directly spawn them
+        self._spawn_agents()
+
+    def _spawn_agents(self):
+        """
+        Creates our agents and directly spawns them
+        """
         for key, value in self._settings_as_object.agents.items():
             self.agent_objects[key] = AgentTypes(value.agent_type).process(self, settings=value, shared_variables=self._module_shared_variables.agents[key])
             time.sleep(0.1)  # short sleep, such that the camera in CARLA is attached properly to the first spawned car
 
-    def run(self):
+    def reset(self):
         """
-        Run function, starts once start() is called.
-        Note: anything you created in __init__ and you want to use in run() needs to be picklable. Failing the 'picklable' requirement will result in errors.
-        If you need to use an object from __init__ that is not picklable, see if you can translate your object into something
-        picklable (lists, dicts, primitives etc) and create a new object in here. Example: settings in get_ready. This function is overwritten in carlainterface
-        because we need to be able to destroy our actors in the READY state as well as in the RUNNING state
-        :return:
+        Warm restart: the connection with carla is kept, only the agents of the next trial are spawned
         """
-        try:
-            self._get_ready()
-
-            self._events.start.wait()
+        self._spawn_agents()
 
-            # run
-            if platform.system() == 'Windows':
-                with wres.set_resolution(10000):
-                    self._run_loop()
-
-                    if self._module_shared_variables.state == State.STOPPED.value:
-                        self.destroy_agents()
-            else:
-                self._run_loop()
-        except:
-            # sys.excepthook is not called from within processes so can't be overridden. instead, catch all exceptions here and call the new excepthook manually
-            exception_log_and_kill_hook(*sys.exc_info(), self.module, self._events)
+    def close_down(self):
+        """
+        Destroys the agents when the loop stopped, also when the module was stopped before it was started (READY state)
+        """
+        if self._module_shared_variables.state == State.STOPPED.value:
+            self.destroy_agents()
 
     def destroy_agents(self):
         """
@@ -124,17 +110,19 @@ class CarlaInterfaceProcess(ModuleProcess):
         for agents in self.agent_objects:
             self.agent_objects[agents].destroy()
 
+        self.agent_objects = {}
+
     def do_while_running(self):
         """
         do_while_running something and write the result in a shared_variable
         """
         for agents in self.agent_objects:
             # will perform the mp input class for eaach available input
-            self.agent_objects[agents].do()
+            with span(agents):
+                self.agent_objects[agents].do()
 
         if self._settings_as_object.current_scenario is not None:
             self._settings_as_object.current_scenario.do_function(self)
 
         if self._module_shared_variables.state == State.STOPPED.value:
-            for agents in self.agent_objects:
-                self.agent_objects[agents].destroy()
+            self.destroy_agents()
@@ -1,7 +1,8 @@
-import multiprocessing as mp
 from ctypes import *
 
+from core.latencytrace import TraceHop
 from core.modulesharedvariables import ModuleSharedVariables
+from core.sharedfield import SharedField
 from core.sharedvariables import SharedVariables
 
 
@@ -18,141 +19,45 @@ class VehicleSharedVariables(SharedVariables):
     """
     Holds shared variables
     """
-    def __init__(self):
-        self._transform = mp.Array(c_float, 6)
-        self._rear_axle_position = mp.Array(c_float, 3)
-        self._velocities_in_world_frame = mp.Array(c_float, 6)
-        self._velocities_in_vehicle_frame = mp.Array(c_float, 3)
-        self._accelerations = mp.Array(c_float, 3)
-        self._applied_input = mp.Array(c_float, 5)
-        self._max_steering_angle = mp.Value(c_float)
-
-        # road data for controller plotter
-        self._data_road_x = mp.Array(c_float, 50)
-        self._data_road_x_inner = mp.Array(c_float, 50)
-        self._data_road_x_outer = mp.Array(c_float, 50)
-        self._data_road_y = mp.Array(c_float, 50)
-        self._data_road_y_inner = mp.Array(c_float, 50)
-        self._data_road_y_outer = mp.Array(c_float, 50)
-        self._data_road_psi = mp.Array(c_float, 50)
-        self._data_road_lanewidth = mp.Array(c_float, 50)
-
-    @property
-    def transform(self):
-        return self._transform[:]
-
-    @transform.setter
-    def transform(self, val):
-        self._transform[:] = val
-
-    @property
-    def rear_axle_position(self):
-        return self._rear_axle_position[:]
-
-    @rear_axle_position.setter
-    def rear_axle_position(self, val):
-        self._rear_axle_position[:] = val
-
-    @property
-    def velocities_in_world_frame(self):
-        return self._velocities_in_world_frame[:]
-
-    @velocities_in_world_frame.setter
-    def velocities_in_world_frame(self, val):
-        self._velocities_in_world_frame[:] = val
-
-    @property
-    def velocities_in_vehicle_frame(self):
-        return self._velocities_in_vehicle_frame[:]
-
-    @velocities_in_vehicle_frame.setter
-    def velocities_in_vehicle_frame(self, val):
-        self._velocities_in_vehicle_frame[:] = val
-
-    @property
-    def accelerations(self):
-        return self._accelerations[:]
-
-    @accelerations.setter
-    def accelerations(self, val):
-        self._accelerations[:] = val
-
-    @property
-    def applied_input(self):
-        return self._applied_input[:]
-
-    @applied_input.setter
-    def applied_input(self, val):
-        self._applied_input[:] = val
-
-    @property
-    def max_steering_angle(self):
-        return self._max_steering_angle.value
-
-    @max_steering_angle.setter
-    def max_steering_angle(self, val):
-        self._max_steering_angle.value = val
-
-    @property
-    def data_road_x(self):
-        return self._data_road_x[:]
-
-    @data_road_x.setter
-    def data_road_x(self, val):
-        self._data_road_x[:] = val
-
-    @property
-    def data_road_x_inner(self):
-        return self._data_road_x_inner[:]
-
-    @data_road_x_inner.setter
-    def data_road_x_inner(self, val):
-        self._data_road_x_inner[:] = val
-
-    @property
-    def data_road_x_outer(self):
-        return self._data_road_x_outer[:]
-
-    @data_road_x_outer.setter
-    def data_road_x_outer(self, val):
-        self._data_road_x_outer[:] = val
-
-    @property
-    def data_road_y(self):
-        return self._data_road_y[:]
-
-    @data_road_y.setter
-    def data_road_y(self, val):
-        self._data_road_y[:] = val
-
-    @property
-    def data_road_y_inner(self):
-        return self._data_road_y_inner[:]
-
-    @data_road_y_inner.setter
-    def data_road_y_inner(self, val):
-        self._data_road_y_inner[:] = val
-
-    @property
-    def data_road_y_outer(self):
-        return self._data_road_y_outer[:]
-
-    @data_road_y_outer.setter
-    def data_road_y_outer(self, val):
-        self._data_road_y_outer[:] = val
-
-    @property
-    def data_road_psi(self):
-        return self._data_road_psi[:]
-
-    @data_road_psi.setter
-    def data_road_psi(self, val):
-        self._data_road_psi[:] = val
-
-    @property
-    def data_road_lanewidth(self):
-        return self._data_road_lanewidth[:]
-
-    @data_road_lanewidth.setter
-    def data_road_lanewidth(self, val):
-        self._data_road_lanewidth[:] = val
+    # optional group with the road data for the controller plotter, only allocated for the ego vehicle (see AgentTypes.shared_variables_groups)
+    road_data_group = 'road_data'
+
+    # trace of the input sample that was applied to the vehicle
+    _traces = {'input_trace': TraceHop.CONTROL_APPLIED}
+
+    # all road data variables, in the order in which they are declared, see road_data_view()
+    road_data_fields = ('data_road_x', 'data_road_x_inner', 'data_road_x_outer', 'data_road_y', 'data_road_y_inner', 'data_road_y_outer',
+                        'data_road_psi', 'data_road_lanewidth')
+
+    _shared_fields = (SharedField('transform', c_float, (6,), units='m, deg'),
+                      SharedField('rear_axle_position', c_float, (3,), units='m'),
+                      SharedField('velocities_in_world_frame', c_float, (6,), units='m/s, deg/s'),
+                      SharedField('velocities_in_vehicle_frame', c_float, (3,), units='m/s'),
+                      SharedField('accelerations', c_float, (3,), units='m/s2'),
+                      SharedField('applied_input', c_float, (5,)),
+                      SharedField('max_steering_angle', c_float, units='rad'),
+
+                      # road data for controller plotter (optional)
+                      SharedField('data_road_x', c_float, (50,), units='m', group=road_data_group),
+                      SharedField('data_road_x_inner', c_float, (50,), units='m', group=road_data_group),
+                      SharedField('data_road_x_outer', c_float, (50,), units='m', group=road_data_group),
+                      SharedField('data_road_y', c_float, (50,), units='m', group=road_data_group),
+                      SharedField('data_road_y_inner', c_float, (50,), units='m', group=road_data_group),
+                      SharedField('data_road_y_outer', c_float, (50,), units='m', group=road_data_group),
+                      SharedField('data_road_psi', c_float, (50,), units='rad', group=road_data_group),
+                      SharedField('data_road_lanewidth', c_float, (50,), units='m', group=road_data_group))
+
+    def road_data_view(self, writable=False):
+        """
+        Zero-copy view on all road data, row i is road_data_fields[i]
+        :param writable: if True, writing to the view writes directly to shared memory
+        :return: (8, 50) array
+        """
+        return self.stacked_view(self.road_data_fields, writable)
+
+    def commit_road_data(self, road_data):
+        """
+        Write all road data at once
+        :param road_data: (8, 50) array-like, row i is road_data_fields[i]
+        """
+        self.commit_stacked(self.road_data_fields, road_data)
@@ -21,7 +21,7 @@ class ScenarioStopTrialAtLocation:
 
             if (distance < threshold_distance) and (carla_interface_process.running_time_seconds > threshold_time):
                 # request stop
-                carla_interface_process.pipe_comm.send({"stop_all_modules": True})
+                carla_interface_process.request_stop_all_modules()
 
     @property
     def name(self):
@@ -6,10 +6,11 @@ class ControllerPlotterManager(ModuleManager):
     """
     Creates a window that plots relevant parameters of a haptic shared controller (FDCA)
     """
+    requires_gui = True  # plots in its dialog, cannot run headless
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         super().__init__(module=JOANModules.CONTROLLER_PLOTTER, news=news, central_settings=central_settings, signals=signals,
-                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
 
     def initialize(self):
         self.module_dialog.initialize()
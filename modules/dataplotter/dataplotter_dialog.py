@@ -333,9 +333,7 @@ class DataPlotterDialog(ModuleDialog):
             item.setData(0, Qt.DisplayRole, str(key))
 
             for prop in value.get_all_properties():
-                if prop is not None:
-                    last_object = getattr(value, prop)
-                    DataPlotterDialog._create_tree_item(self, item, prop, last_object)
+                DataPlotterDialog._create_tree_item(self, item, prop, getattr(value, prop))
 
             for inner_key, inner_value in value.__dict__.items():
                 if inner_key[0] != '_' and not callable(inner_value):
@@ -5,9 +5,11 @@ from modules.joanmodules import JOANModules
 
 class DataPlotterManager(ModuleManager):
     """ Manages the datarecorder environment """
+    requires_gui = True  # plots in its dialog, cannot run headless
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         super().__init__(module=JOANModules.DATA_PLOTTER, news=news, central_settings=central_settings, signals=signals,
-                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
 
         self.state_machine.set_exit_action(State.INITIALIZED, self.module_dialog.apply_settings)
@@ -36,3 +36,10 @@ class DataPlotterProcess(ModuleProcess):
         The super().get_ready() method converts the module_settings back to the appropriate settings object
         """
         self.variables_to_be_plotted = self.settings.variables_to_be_plotted
+
+    def reset(self):
+        """
+        Warm restart: link the variables to be plotted of the next trial
+        """
+        self.settings = self._settings_as_object
+        self.get_ready()
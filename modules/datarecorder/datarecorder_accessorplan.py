@@ -0,0 +1,249 @@
+import functools
+import operator
+
+import numpy as np
+
+from core.sharedvariables import SharedVariables
+from modules.joanmodules import JOANModules
+
+
+def _walk(last_object, path):
+    """
+    Resolve a path in an object tree: dict keys, list indices and attributes
+    :param last_object: object to start from
+    :param path: list of keys, indices (as str) and attribute names
+    :return: the object at the end of the path
+    """
+    for attribute_name in path:
+        if isinstance(last_object, dict):
+            last_object = last_object[attribute_name]
+        elif isinstance(last_object, list):
+            last_object = last_object[int(attribute_name)]
+        else:
+            last_object = getattr(last_object, attribute_name)
+
+    return last_object
+
+
+def row_byte_index(dtype, field_names, sizes):
+    """
+    :param dtype: structured dtype of a row
+    :param field_names: names of fields of the row
+    :param sizes: size in bytes of every field
+    :return: byte positions of the fields in the row, in the order of field_names
+    """
+    return np.concatenate([np.arange(dtype.fields[name][1], dtype.fields[name][1] + size) for name, size in zip(field_names, sizes)])
+
+
+class _SharedVariablesGroup:
+    """
+    All channels of one shared variables object: they are read from one snapshot (one copy of the shared block) per row, through one structured
+    view with a field per channel at the offset of the channel in the block
+    """
+
+    def __init__(self, shared_variables):
+        self.shared_variables = shared_variables
+        self.snapshot = shared_variables.snapshot()
+        self._fields = {field.name: field for field in shared_variables.fields()}
+        self._names = []
+        self._formats = []
+        self._offsets = []
+        self.record = None
+        self.channel_sizes = []
+        self.source_index = None
+        self._source_bytes = None
+        self._row_bytes = None
+        self._row_index = None
+
+    def add_channel(self, field_name, indices):
+        """
+        :param field_name: name of the shared variable
+        :param indices: indices (as str) into an array-valued shared variable, may be empty
+        :return: (the value converter of the channel, None if the value can be written as is; the channel dict with dtype, shape and units)
+        """
+        field = self._fields[field_name]
+        base_dtype = np.dtype(field.ctype)
+        if len(indices) > len(field.shape):
+            raise IndexError('%s has %d dimension(s), cannot index it with %s' % (field_name, len(field.shape), indices))
+
+        # byte offset of the indexed element (or sub-array) within the field
+        strides = np.empty(field.shape, dtype=base_dtype).strides
+        offset = field.offset + sum(range(size)[int(index)] * stride for index, size, stride in zip(indices, field.shape, strides))
+        shape = field.shape[len(indices):]
+
+        self._names.append('c%d' % len(self._names))
+        self._formats.append((base_dtype, shape) if shape else base_dtype)
+        self._offsets.append(offset)
+
+        channel = {'dtype': base_dtype.str, 'shape': list(shape), 'units': field.units}
+        if shape:
+            return np.ndarray.tolist, channel  # sub-arrays are returned as arrays by the structured view
+        if base_dtype.kind == 'S':
+            return (lambda value: str(value, encoding='utf-8')), channel  # as the property of a string shared variable
+        return None, channel
+
+    def compile(self):
+        dtype = np.dtype({'names': self._names, 'formats': self._formats, 'offsets': self._offsets, 'itemsize': len(self.snapshot._buffer)})
+        self.record = np.ndarray((), dtype=dtype, buffer=self.snapshot._buffer)
+
+        # byte positions of the channels in the record of the shared variables object, and their sizes, for byte-level gathers (see bind)
+        self.channel_sizes = [dtype.fields[name][0].itemsize for name in self._names]
+        self.source_index = np.concatenate([np.arange(offset, offset + size) for offset, size in zip(self._offsets, self.channel_sizes)])
+
+    def read(self):
+        """
+        :return: tuple with the values of all channels of this group, from one consistent snapshot
+        """
+        self.shared_variables.snapshot(into=self.snapshot)
+        return self.record.tolist()
+
+    def bind(self, row, row_fields):
+        """
+        :param row: 0-d structured array of a row (see AccessorPlan.bind), its fields have the same dtype and shape as the channels
+        :param row_fields: names of the fields of the row for the channels of this group, in the order they were added
+        """
+        # a byte-level gather from the snapshot into the row: much faster than assigning one structured array to another with a different layout
+        self._source_bytes = np.frombuffer(self.snapshot._buffer, dtype=np.uint8)
+        self._row_bytes = row.reshape(1).view(np.uint8)
+        self._row_index = row_byte_index(row.dtype, row_fields, self.channel_sizes)
+
+    def read_into_row(self):
+        """
+        Copy the values of all channels of this group, from one consistent snapshot, into the bound row (without converting them)
+        """
+        self.shared_variables.snapshot(into=self.snapshot)
+        self._row_bytes[self._row_index] = self._source_bytes[self.source_index]
+
+
+class AccessorPlan:
+    """
+    The variables to be saved by the data recorder, resolved once into a plan that reads a row from one snapshot per shared variables object.
+    Read a row as a tuple (read_row, for CSV) or into a row of a binary recording (bind and read_into_row), with the schema in channels.
+    """
+
+    def __init__(self, variables_to_be_saved, news):
+        """
+        :param variables_to_be_saved: list of paths, every path a list with the module name and the keys/attribute names (see DataRecorderSettings)
+        :param news: News with the shared variables of all modules
+        """
+        groups = {}  # id of the shared variables object: _SharedVariablesGroup
+        group_columns = {}  # id of the shared variables object: list of column numbers of its channels
+        getters = []
+        getter_columns = []
+        converters = {}  # column number: value converter
+        channels = []
+
+        for column, variable in enumerate(variables_to_be_saved):
+            module = JOANModules.from_string_representation(variable[0])
+            if module is None:
+                raise ValueError('Cannot record %s: there is no module called %s' % ('.'.join(variable), variable[0]))
+
+            # walk the static part of the path (dicts, lists, attributes) up to the shared variable that holds the value, or up to the last step
+            last_object = news.read_news(module)
+            path = list(variable[1:])
+            while len(path) > 1 and not self._is_shared_variable(last_object, path[0]):
+                last_object = _walk(last_object, path[:1])
+                path.pop(0)
+
+            if path and self._is_shared_variable(last_object, path[0]):
+                if id(last_object) not in groups:
+                    groups[id(last_object)] = _SharedVariablesGroup(last_object)
+                    group_columns[id(last_object)] = []
+                converter, channel = groups[id(last_object)].add_channel(path[0], path[1:])
+                group_columns[id(last_object)].append(column)
+            else:
+                converter = None
+                getters.append(functools.partial(_walk, last_object, path))
+                getter_columns.append(column)
+                channel = self._getter_channel(getters[-1]())
+
+            if converter:
+                converters[column] = converter
+            channel['name'] = '.'.join(variable)
+            channels.append(channel)
+
+        for group in groups.values():
+            group.compile()
+
+        self._groups = list(groups.values())
+        self._getters = getters
+        self._group_columns = list(group_columns.values())
+        self._getter_columns = getter_columns
+        self._row = None
+        self._getter_fields = []
+        self.channels = channels
+
+        # values are collected group by group, then the getters; _order puts them back in the order of the columns
+        value_columns = [column for columns in group_columns.values() for column in columns] + getter_columns
+        value_index_of_column = {column: index for index, column in enumerate(value_columns)}
+        self._converters = [(value_index_of_column[column], converter) for column, converter in converters.items()]
+        order = [value_index_of_column[column] for column in range(len(value_columns))]
+        self._order = operator.itemgetter(*order) if len(order) > 1 else (lambda values: tuple(values[:1]))
+
+    @property
+    def has_getters(self):
+        """
+        :return: True if some variables are not shared variables, these can only be sampled (read_row, read_into_row)
+        """
+        return bool(self._getters)
+
+    def group_layouts(self):
+        """
+        :return: per shared variables object: (the object, the column numbers of its channels, the byte positions of these channels in its record, the
+        size of every channel in bytes); e.g. to gather the channels from the entries of its history
+        """
+        return [(group.shared_variables, columns, group.source_index, group.channel_sizes) for group, columns in zip(self._groups, self._group_columns)]
+
+    @staticmethod
+    def _getter_channel(value):
+        """
+        :param value: current value of a variable that is not a shared variable
+        :return: channel dict with the dtype the value is stored as in binary recordings (anything but bools and numbers as text)
+        """
+        if isinstance(value, (bool, np.bool_)):
+            dtype = '|b1'
+        elif isinstance(value, (int, np.integer)):
+            dtype = '<i8'
+        elif isinstance(value, (float, np.floating)):
+            dtype = '<f8'
+        else:
+            dtype = '|S%d' % max(64, 2 * len(str(value).encode('utf-8')))
+        return {'dtype': dtype, 'shape': [], 'units': ''}
+
+    @staticmethod
+    def _is_shared_variable(last_object, name):
+        return isinstance(last_object, SharedVariables) and any(field.name == name for field in last_object.fields())
+
+    def read_row(self):
+        """
+        :return: tuple with the current value of every variable, in the order of variables_to_be_saved
+        """
+        values = []
+        for group in self._groups:
+            values.extend(group.read())
+        for getter in self._getters:
+            values.append(getter())
+        for index, converter in self._converters:
+            values[index] = converter(values[index])
+
+        return self._order(values)
+
+    def bind(self, row):
+        """
+        Bind a row to read_into_row, the field of channel n is called 'cn' (see datarecorder_recording.row_dtype)
+        :param row: 0-d structured array
+        """
+        self._row = row
+        for group, columns in zip(self._groups, self._group_columns):
+            group.bind(row, ['c%d' % column for column in columns])
+        self._getter_fields = ['c%d' % column for column in self._getter_columns]
+
+    def read_into_row(self):
+        """
+        Copy the current value of every variable into the bound row, as raw values: nothing is converted or formatted
+        """
+        for group in self._groups:
+            group.read_into_row()
+        for getter, field in zip(self._getters, self._getter_fields):
+            value = getter()
+            self._row[field] = value if isinstance(value, (bool, int, float, np.generic)) else str(value).encode('utf-8')
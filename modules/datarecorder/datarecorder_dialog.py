@@ -9,6 +9,7 @@ from core.module_dialog import ModuleDialog
 from core.module_manager import ModuleManager
 from core.sharedvariables import SharedVariables
 from core.statesenum import State
+from modules.datarecorder.datarecorder_recording import RecordingFormats
 from modules.joanmodules import JOANModules
 
 
@@ -49,6 +50,10 @@ class DataRecorderDialog(ModuleDialog):
 
         self.module_widget.treeWidget.itemClicked.connect(self.apply_settings)
         self.module_widget.checkAppendTimestamp.stateChanged.connect(self.apply_settings)
+        for recording_format in RecordingFormats:
+            self.module_widget.combo_recording_format.addItem(str(recording_format), recording_format.value)
+        self.module_widget.combo_recording_format.currentIndexChanged.connect(self.apply_settings)
+        self.module_widget.checkEveryProducerTick.stateChanged.connect(self.apply_settings)
         self.handle_state_change()
 
     def update_trajectory_groupbox(self):
@@ -59,6 +64,13 @@ class DataRecorderDialog(ModuleDialog):
         self.module_widget.lbl_data_filename.setText(os.path.basename(file_path))
         self.module_widget.lbl_data_directoryname.setText(os.path.dirname(file_path))
         self.module_widget.checkAppendTimestamp.setChecked(self.module_manager.module_settings.append_timestamp_to_filename)
+        self.module_widget.combo_recording_format.blockSignals(True)  # applying the settings now would overwrite the variables before they are shown
+        self.module_widget.combo_recording_format.setCurrentIndex(
+            self.module_widget.combo_recording_format.findData(self.module_manager.module_settings.recording_format))
+        self.module_widget.combo_recording_format.blockSignals(False)
+        self.module_widget.checkEveryProducerTick.blockSignals(True)
+        self.module_widget.checkEveryProducerTick.setChecked(self.module_manager.module_settings.record_every_producer_tick)
+        self.module_widget.checkEveryProducerTick.blockSignals(False)
 
         variables_to_save = self.module_manager.module_settings.variables_to_be_saved
         self._set_all_checked_items(variables_to_save)
@@ -94,6 +106,8 @@ class DataRecorderDialog(ModuleDialog):
             self.module_widget.treeWidget.setEnabled(True)
             self.module_widget.browsePathPushButton.setEnabled(True)
             self.module_widget.checkAppendTimestamp.setEnabled(True)
+            self.module_widget.combo_recording_format.setEnabled(True)
+            self.module_widget.checkEveryProducerTick.setEnabled(True)
             self._fill_tree_widget()
             self.update_dialog()
         elif self.module_manager.state_machine.current_state == State.RUNNING:
@@ -109,12 +123,16 @@ class DataRecorderDialog(ModuleDialog):
             self.module_widget.lbl_message_recorder.setStyleSheet('color: orange')
             self.module_widget.browsePathPushButton.setEnabled(True)
             self.module_widget.checkAppendTimestamp.setEnabled(True)
+            self.module_widget.combo_recording_format.setEnabled(True)
+            self.module_widget.checkEveryProducerTick.setEnabled(True)
             self.module_widget.treeWidget.setEnabled(False)
         else:
             self.module_widget.lbl_message_recorder.setText("not recording")
             self.module_widget.lbl_message_recorder.setStyleSheet('color: orange')
             self.module_widget.browsePathPushButton.setEnabled(False)
             self.module_widget.checkAppendTimestamp.setEnabled(False)
+            self.module_widget.combo_recording_format.setEnabled(False)
+            self.module_widget.checkEveryProducerTick.setEnabled(False)
             self.module_widget.treeWidget.setEnabled(False)
             self.module_widget.check_trajectory.setEnabled(False)
 
@@ -126,6 +144,8 @@ class DataRecorderDialog(ModuleDialog):
         self.module_manager.module_settings.variables_to_be_saved = self._get_all_checked_items()
         self.module_manager.module_settings.should_record_trajectory = self.module_widget.check_trajectory.isChecked()
         self.module_manager.module_settings.append_timestamp_to_filename = self.module_widget.checkAppendTimestamp.isChecked()
+        self.module_manager.module_settings.recording_format = self.module_widget.combo_recording_format.currentData()
+        self.module_manager.module_settings.record_every_producer_tick = self.module_widget.checkEveryProducerTick.isChecked()
 
     def _set_all_checked_items(self, variables_to_save):
         self._recursively_set_checked_items(self.module_widget.treeWidget.invisibleRootItem(), [], variables_to_save)
@@ -0,0 +1,78 @@
+import numpy as np
+
+from modules.datarecorder.datarecorder_accessorplan import AccessorPlan, row_byte_index
+from modules.datarecorder.datarecorder_recording import row_dtype
+
+# the first channels of every stream, before the recorded variables
+STREAM_CHANNELS = [{'name': 'tick', 'dtype': '<u8', 'shape': [], 'units': ''},
+                   {'name': 'gap_before', 'dtype': '<u4', 'shape': [], 'units': 'ticks'}]
+
+
+class HistoryStream:
+    """
+    Every tick of one producing module, drained from the shared histories of its shared variables objects, each returned once with the number of
+    ticks that were lost before it (gap_before)
+    """
+
+    def __init__(self, module, variables_to_be_saved, news):
+        """
+        :param module: JOANModules, the producer
+        :param variables_to_be_saved: the paths of the variables of this module to record (see DataRecorderSettings)
+        :param news: News with the shared variables of all modules
+        """
+        self.module = module
+        plan = AccessorPlan(variables_to_be_saved, news)
+        if plan.has_getters:
+            raise ValueError('%s cannot be recorded from its history, not all its variables to be saved are shared variables' % module)
+
+        self.channels = STREAM_CHANNELS + plan.channels
+        self.dtype = row_dtype(self.channels)
+        self.last_tick = 0
+        self.lost_ticks = 0
+
+        self._groups = []  # (shared variables, byte positions in its record, byte positions in the row)
+        for shared_variables, columns, source_index, sizes in plan.group_layouts():
+            if not shared_variables.has_history():
+                raise ValueError('%s has no history, add it with a history_length (HQManager.add_module, or --history-length of headless.py) to '
+                                 'record every tick' % module)
+            row_fields = ['c%d' % (column + len(STREAM_CHANNELS)) for column in columns]
+            self._groups.append((shared_variables, source_index, row_byte_index(self.dtype, row_fields, sizes)))
+
+    def drain(self):
+        """
+        :return: structured array (dtype) with a row for every tick that was published since the previous call, oldest first
+        """
+        # the histories of the objects of a module are written one after the other: only ticks up to the newest tick of the slowest one are complete
+        histories = []
+        newest_tick = None
+        for shared_variables, source_index, row_index in self._groups:
+            entries, missed = shared_variables.read_history(self.last_tick)
+            group_newest_tick = int(entries['tick'][-1]) if len(entries) else self.last_tick + missed
+            newest_tick = group_newest_tick if newest_tick is None else min(newest_tick, group_newest_tick)
+            histories.append(entries)
+
+        if newest_tick is None or newest_tick <= self.last_tick:
+            return np.empty(0, dtype=self.dtype)
+
+        # the ticks that are in all histories (the others were overwritten before they were read)
+        ticks = None
+        for entries in histories:
+            entry_ticks = entries['tick'][entries['tick'] <= newest_tick]
+            ticks = entry_ticks if ticks is None else np.intersect1d(ticks, entry_ticks, assume_unique=True)
+
+        rows = np.zeros(len(ticks), dtype=self.dtype)
+        row_bytes = rows.view(np.uint8).reshape(len(ticks), self.dtype.itemsize)
+        for (shared_variables, source_index, row_index), entries in zip(self._groups, histories):
+            selected = entries[np.isin(entries['tick'], ticks, assume_unique=True)]
+            records = np.ascontiguousarray(selected['record'])
+            row_bytes[:, row_index] = records.view(np.uint8).reshape(len(ticks), records.dtype.itemsize)[:, source_index]
+            rows['time'] = selected['time']
+
+        rows['c0'] = ticks
+        rows['c1'] = np.diff(ticks, prepend=np.uint64(self.last_tick)) - 1
+        self.lost_ticks += int(rows['c1'].sum())
+
+        # lost ticks after the last row are counted in gap_before of the next row
+        if len(ticks):
+            self.last_tick = int(ticks[-1])
+        return rows
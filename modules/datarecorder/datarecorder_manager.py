@@ -10,7 +10,7 @@ class DataRecorderManager(ModuleManager):
     Manages the datarecorder environment
     """
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         """
         :param news: dict with all the news (shared variable) objects of other modules
         :param signals: dict with signals for inter-module communication
@@ -18,14 +18,17 @@ class DataRecorderManager(ModuleManager):
         :param parent:
         """
         super().__init__(module=JOANModules.DATA_RECORDER, news=news, central_settings=central_settings, signals=signals,
-                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
 
-        self.state_machine.set_exit_action(State.INITIALIZED, self.module_dialog.apply_settings)
+        # the variables to save are taken from the dialog, in headless mode they come from the settings (file)
+        if self.module_dialog:
+            self.state_machine.set_exit_action(State.INITIALIZED, self.module_dialog.apply_settings)
         self.state_machine.set_transition_condition(State.STOPPED, State.INITIALIZED, self._check_save_path)
 
         self._set_default_save_path()
 
-        self.module_dialog.update_dialog()
+        if self.module_dialog:
+            self.module_dialog.update_dialog()
 
     def _check_save_path(self):
         if not bool(os.path.dirname(self.module_settings.path_to_save_file)):
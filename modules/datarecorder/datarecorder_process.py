@@ -1,13 +1,26 @@
+import contextlib
 import math
 import datetime
+import os
 
+from core.modulemessages import ModuleMessageTypes
 from core.module_process import ModuleProcess
+from modules.datarecorder.datarecorder_accessorplan import AccessorPlan
+from modules.datarecorder.datarecorder_historystream import HistoryStream
+from modules.datarecorder.datarecorder_recording import CsvRecordingWriter, RecordingFormats, RecordingWriter
+from modules.datarecorder.datarecorder_segments import SegmentedRecordingWriter
 from modules.datarecorder.datarecorder_settings import DataRecorderSettings
+from modules.datarecorder.datarecorder_writer import AsyncWriter, BackPressurePolicies, RowBuffers
 from modules.joanmodules import JOANModules
 
 
 class DataRecorderProcess(ModuleProcess):
+    """
+    Records the selected variables every tick, full buffers of rows are written by a background thread (AsyncWriter). With
+    record_every_producer_tick, every tick of the recorded modules is drained from their shared history instead (see HistoryStream).
+    """
     settings: DataRecorderSettings
+    metrics_interval_in_ns = 1000000000
 
     def __init__(self, module: JOANModules, time_step_in_ms, news, settings, events, settings_singleton, pipe_comm):
         super().__init__(module, time_step_in_ms=time_step_in_ms, news=news, settings=settings, events=events, settings_singleton=settings_singleton,
@@ -16,6 +29,14 @@ class DataRecorderProcess(ModuleProcess):
         self.news = news
 
         self.variables_to_be_saved = {}
+        self.accessor_plan = None
+        self.recording_format = RecordingFormats.CSV
+        self.recording_writer = None
+        self.history_streams = []  # (HistoryStream, writer)
+        self.async_writer = None
+        self.rows = None
+        self.trajectory_rows = None
+        self._next_metrics_time = 0
         self.save_path = ''
         self.trajectory_save_path = ''
 
@@ -27,6 +48,7 @@ class DataRecorderProcess(ModuleProcess):
 
         self.carla_interface_variables = None
         self.transform = None
+        self._ego_vehicle_snapshot = None  # overwritten by every snapshot of the ego vehicle, see _write_trajectory_row
 
     def get_ready(self):
         """
@@ -34,66 +56,171 @@ class DataRecorderProcess(ModuleProcess):
         The super().get_ready() method converts the module_settings back to the appropriate settings object
         """
         self.variables_to_be_saved = self.settings.variables_to_be_saved
+        self.recording_format = RecordingFormats(self.settings.recording_format)
+        self.save_path = self.settings.path_to_save_file
+        if self.recording_format is not RecordingFormats.CSV:
+            self.save_path = os.path.splitext(self.save_path)[0] + self.recording_format.extension
         if self.settings.append_timestamp_to_filename:
-            without_extension = self.settings.path_to_save_file.split('.csv')[0]
-            self.save_path = without_extension + datetime.datetime.now().strftime('_%Y%m%d_%Hh%Mm%Ss') + '.csv'
-        else:
-            self.save_path = self.settings.path_to_save_file
+            without_extension, extension = os.path.splitext(self.save_path)
+            self.save_path = without_extension + datetime.datetime.now().strftime('_%Y%m%d_%Hh%Mm%Ss') + (extension or self.recording_format.extension)
 
         if self.settings.should_record_trajectory:
             self.trajectory_save_path = self.settings.path_to_trajectory_save_file
+            self._ego_vehicle_snapshot = None
             try:
                 self.carla_interface_variables = self.news.read_news(JOANModules.CARLA_INTERFACE)
                 self.transform = self.carla_interface_variables.agents['Ego Vehicle_1'].transform
-                self.trajectory_file = open(self.trajectory_save_path, 'w')
+                with open(self.trajectory_save_path, 'w'):
+                    pass
             except KeyError:  # means there is no egovehicle 1
                 pass
 
-        header = '; '.join(['.'.join(v) for v in self.variables_to_be_saved])
-        with open(self.save_path, 'w') as self.file:
-            self.file.write(header + '\n')
+        if self.settings.write_in_background:
+            self.async_writer = AsyncWriter(self.settings.write_queue_size, BackPressurePolicies(self.settings.back_pressure_policy))
+            self.async_writer.start()
+        else:
+            self.async_writer = None
+
+        self.accessor_plan = None
+        self.recording_writer = None
+        self.history_streams = []
+        self.rows = None
+        if self.settings.record_every_producer_tick:
+            # a stream, and a file, per module: the modules publish their ticks at their own rate
+            variables_per_module = {}
+            for variable in self.variables_to_be_saved:
+                variables_per_module.setdefault(variable[0], []).append(variable)
+
+            without_extension, extension = os.path.splitext(self.save_path)
+            for module_name, variables in variables_per_module.items():
+                stream = HistoryStream(JOANModules.from_string_representation(module_name), variables, self.news)
+                file_path = '%s_%s%s' % (without_extension, module_name.replace(' ', '_'), extension)
+                self.history_streams.append((stream, self._create_recording_writer(file_path, stream.channels, producer=module_name)))
+        elif self.recording_format is RecordingFormats.CSV:
+            self.accessor_plan = AccessorPlan(self.variables_to_be_saved, self.news)
+            self.rows = RowBuffers(self._write_rows, lambda rows: [''] * rows, self.settings.rows_per_buffer, self.async_writer)
+            header = '; '.join(['.'.join(v) for v in self.variables_to_be_saved])
+            with open(self.save_path, 'w') as self.file:
+                self.file.write(header + '\n')
+        else:
+            self.accessor_plan = AccessorPlan(self.variables_to_be_saved, self.news)
+            self.recording_writer = self._create_recording_writer(self.save_path, self.accessor_plan.channels)
+            self.accessor_plan.bind(self.recording_writer.row)
+
+        self.trajectory_rows = RowBuffers(self._write_trajectory_rows, lambda rows: [''] * rows, self.settings.rows_per_buffer, self.async_writer)
+
+    def _create_recording_writer(self, file_path, channels, **metadata):
+        """
+        :param file_path: path of the recording
+        :param channels: list of channel dicts
+        :param metadata: extra information to store in the header of a binary recording
+        :return: writer of the recording format: RecordingWriter, SegmentedRecordingWriter or CsvRecordingWriter
+        """
+        metadata['time_step_in_ms'] = self._time_step_in_ns * 1e-6
+        if self.recording_format is RecordingFormats.BINARY:
+            return RecordingWriter(file_path, channels, rows_per_chunk=self.settings.rows_per_buffer, metadata=metadata, async_writer=self.async_writer)
+        if self.recording_format is RecordingFormats.SEGMENTS:
+            # every row is committed to a memory-mapped segment in the loop, the AsyncWriter only prepares and flushes segments
+            return SegmentedRecordingWriter(file_path, channels, segment_size_in_bytes=int(self.settings.segment_size_in_mb * 2 ** 20), metadata=metadata,
+                                            async_writer=self.async_writer)
+        return CsvRecordingWriter(file_path, channels, rows_per_buffer=self.settings.rows_per_buffer, async_writer=self.async_writer)
+
+    def reset(self):
+        """
+        Warm restart: start a new file with the settings of the next trial
+        """
+        self.settings = self._settings_as_object
+        self.index = 0
+        self.temp = [0, 0]
+        self.travelled_distance = 0
+        self.get_ready()
 
     def _run_loop(self):
-        with open(self.save_path, 'a') as self.file:
+        with contextlib.ExitStack() as files:
+            if self.rows:
+                self.file = files.enter_context(open(self.save_path, 'a'))
             if self.settings.should_record_trajectory:
-                with open(self.trajectory_save_path, 'a') as self.trajectory_file:
-                    super()._run_loop()
-            else:
+                self.trajectory_file = files.enter_context(open(self.trajectory_save_path, 'a'))
+
+            self._next_metrics_time = 0
+            try:
                 super()._run_loop()
+            finally:
+                self._finish_writing()
+
+    def _finish_writing(self):
+        """
+        Hand over the last rows, wait until the writer thread wrote everything and close the recordings (before the files are closed)
+        """
+        self._drain_history_streams()  # the ticks published since the last tick of the data recorder
+        recording_writers = [writer for _, writer in self.history_streams] + ([self.recording_writer] if self.recording_writer else [])
+        for recording_writer in recording_writers:
+            recording_writer.flush()
+        if self.rows:
+            self.rows.flush()
+        self.trajectory_rows.flush()
+
+        if self.async_writer:
+            self.async_writer.close()
+        self.send_message(ModuleMessageTypes.METRICS, self._metrics())
+        for recording_writer in recording_writers:
+            recording_writer.close()
+        self.recording_writer = None
+        self.history_streams = []
+
+    def _metrics(self):
+        metrics = self.async_writer.metrics() if self.async_writer else {}
+        for stream, _ in self.history_streams:
+            metrics['lost ticks of %s' % stream.module] = stream.lost_ticks
+        return metrics
 
     def do_while_running(self):
         """
         do_while_running something and, for datarecorder, read the result from a shared_variable
         """
-        row = self._get_data_row()
-        self.file.write(row + '\n')
+        if self.history_streams:
+            self._drain_history_streams()
+        elif self.recording_writer:
+            # binary or segments: the raw values are copied into the row, the timestamp of the row is the time of this tick
+            self.accessor_plan.read_into_row()
+            self.recording_writer.append(self._time)
+        else:
+            self.rows.append(self._get_data_row())
 
         if self.settings.should_record_trajectory:
             self._write_trajectory_row()
 
-    def _get_data_row(self):
-        row = []
-        for variable in self.variables_to_be_saved:
-            module = JOANModules.from_string_representation(variable[0])
-            last_object = self.news.read_news(module)
+        if self._time >= self._next_metrics_time:
+            if self._next_metrics_time:
+                self.send_message(ModuleMessageTypes.METRICS, self._metrics())
+            self._next_metrics_time = self._time + self.metrics_interval_in_ns
 
-            for attribute_name in variable[1:]:
-                if isinstance(last_object, dict):
-                    last_object = last_object[attribute_name]
-                elif isinstance(last_object, list):
-                    last_object = last_object[int(attribute_name)]
-                else:
-                    last_object = getattr(last_object, attribute_name)
+    def _drain_history_streams(self):
+        """
+        Record every tick the producers published since the previous call, with the time at which they published it
+        """
+        for stream, recording_writer in self.history_streams:
+            for row in stream.drain():
+                recording_writer.row[...] = row
+                recording_writer.append(int(row['time']))
 
-            row.append(str(last_object))
+    def _write_rows(self, buffer, rows):
+        self.file.write('\n'.join(buffer[:rows]) + '\n')
 
-        return '; '.join(row)
+    def _write_trajectory_rows(self, buffer, rows):
+        self.trajectory_file.write('\n'.join(buffer[:rows]) + '\n')
+
+    def _get_data_row(self):
+        # one snapshot per shared variables object per row, such that a row never mixes two updates of the same object (see AccessorPlan)
+        return '; '.join(map(str, self.accessor_plan.read_row()))
 
     def _write_trajectory_row(self):
         try:
-            self.transform = self.carla_interface_variables.agents['Ego Vehicle_1'].transform
-            velocities = self.carla_interface_variables.agents['Ego Vehicle_1'].velocities_in_world_frame
-            applied_inputs = self.carla_interface_variables.agents['Ego Vehicle_1'].applied_input
+            ego_vehicle = self.carla_interface_variables.agents['Ego Vehicle_1'].snapshot(into=self._ego_vehicle_snapshot)
+            self._ego_vehicle_snapshot = ego_vehicle
+            self.transform = ego_vehicle.transform
+            velocities = ego_vehicle.velocities_in_world_frame
+            applied_inputs = ego_vehicle.applied_input
 
             travelled_distance_tick_x = self.transform[0] - self.temp[0]
             travelled_distance_tick_y = self.transform[1] - self.temp[1]
@@ -105,7 +232,7 @@ class DataRecorderProcess(ModuleProcess):
                 trajectory_row = [self.index, self.transform[0], self.transform[1], applied_inputs[0], applied_inputs[4], applied_inputs[3], self.transform[3],
                                   math.sqrt(velocities[0] ** 2 + velocities[1] ** 2 + velocities[2] ** 2)]
 
-                self.trajectory_file.write(", ".join(repr(e) for e in trajectory_row) + '\n')
+                self.trajectory_rows.append(", ".join(repr(e) for e in trajectory_row))
                 self.travelled_distance = 0.0
 
             self.temp = [self.transform[0], self.transform[1]]
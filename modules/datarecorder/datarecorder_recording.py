@@ -0,0 +1,316 @@
+import datetime
+import enum
+import json
+import os
+import struct
+
+import numpy as np
+
+from modules.datarecorder.datarecorder_writer import RowBuffers
+
+_MAGIC = b'JOANREC1'
+_CHUNK_MAGIC = b'CHNK'
+_INDEX_MAGIC = b'JIDX'
+_END_MAGIC = b'JRECEND1'
+
+_LENGTH = struct.Struct('<I')  # length of the JSON header, number of chunks in the index
+_CHUNK_HEADER = struct.Struct('<4sIQQ')  # magic, number of rows, first and last time in ns
+_TRAILER = struct.Struct('<Q8s')  # offset of the chunk index, end magic
+
+CHUNK_INDEX_DTYPE = np.dtype([('offset', '<u8'), ('rows', '<u4'), ('first_time', '<u8'), ('last_time', '<u8')])
+
+
+class RecordingFormats(enum.Enum):
+    """
+    File formats of the data recorder, convert a BINARY or SEGMENTS recording with joan-export (python -m tools.joanexport)
+    """
+    CSV = 0
+    BINARY = 1
+    SEGMENTS = 2
+
+    @property
+    def extension(self):
+        return {RecordingFormats.CSV: '.csv',
+                RecordingFormats.BINARY: '.joanrec',
+                RecordingFormats.SEGMENTS: '.joanseg'}[self]
+
+    def __str__(self):
+        return {RecordingFormats.CSV: 'CSV',
+                RecordingFormats.BINARY: 'Binary (.joanrec)',
+                RecordingFormats.SEGMENTS: 'Crash-safe segments (.joanseg)'}[self]
+
+
+def open_recording(file_path):
+    """
+    :param file_path: path of a binary recording (.joanrec), or of a segmented recording or one of its segments (.joanseg)
+    :return: RecordingReader or SegmentedRecordingReader
+    """
+    if file_path.endswith(RecordingFormats.SEGMENTS.extension):
+        from modules.datarecorder.datarecorder_segments import SegmentedRecordingReader
+        return SegmentedRecordingReader(file_path)
+    return RecordingReader(file_path)
+
+
+def row_dtype(channels):
+    """
+    :param channels: list of channel dicts (name, dtype, shape, units)
+    :return: packed structured dtype of one row: the time in ns since the epoch, then a field per channel (c0, c1, ...)
+    """
+    return np.dtype([('time', '<u8')] + [('c%d' % index, channel['dtype'], tuple(channel['shape'])) for index, channel in enumerate(channels)])
+
+
+class RecordingWriter:
+    """
+    Writes a binary recording (.joanrec): a JSON header with the channel schema, the raw rows in chunks and an index of the chunks at the end.
+    Without the index (after a crash), the complete chunks can still be read (see RecordingReader).
+    """
+
+    def __init__(self, file_path, channels, rows_per_chunk=1024, metadata=None, async_writer=None):
+        """
+        :param file_path: path of the recording, an existing file is overwritten
+        :param channels: list of channel dicts with name, dtype (numpy dtype string), shape (list) and units
+        :param rows_per_chunk: number of rows per chunk
+        :param metadata: dict with extra (JSON serializable) information to store in the header
+        :param async_writer: AsyncWriter that writes the chunks, None to write them in the calling thread
+        """
+        self.file_path = file_path
+        self.channels = channels
+        self.rows_per_chunk = rows_per_chunk
+        self.row = np.zeros((), dtype=row_dtype(channels))  # to be filled before every append()
+
+        self._chunks = RowBuffers(self._write_chunk, lambda rows: np.zeros(rows, dtype=self.row.dtype), rows_per_chunk, async_writer)
+        self._chunk_index = []
+
+        header = {'version': 1,
+                  'created': datetime.datetime.now().isoformat(),
+                  'rows_per_chunk': rows_per_chunk,
+                  'channels': channels,
+                  'metadata': metadata or {}}
+        encoded_header = json.dumps(header).encode('utf-8')
+
+        self._file = open(file_path, 'wb')
+        self._file.write(_MAGIC + _LENGTH.pack(len(encoded_header)) + encoded_header)
+
+    def append(self, time_in_ns):
+        """
+        Add the current row
+        :param time_in_ns: timestamp of the row, in ns since the epoch
+        """
+        self.row['time'] = time_in_ns
+        self._chunks.append(self.row)
+
+    def flush(self):
+        """
+        Write (or hand over) the collected rows as a chunk
+        """
+        self._chunks.flush()
+
+    def write_rows(self, rows):
+        """
+        Add many rows at once, e.g. when converting a recording (only without an AsyncWriter)
+        :param rows: structured array with the dtype of row
+        """
+        self.flush()
+        for start in range(0, len(rows), self.rows_per_chunk):
+            self._write_chunk(rows[start:start + self.rows_per_chunk], min(self.rows_per_chunk, len(rows) - start))
+
+    def _write_chunk(self, chunk, rows):
+        rows_in_chunk = chunk[:rows]
+        first_time, last_time = int(rows_in_chunk['time'][0]), int(rows_in_chunk['time'][-1])
+        self._chunk_index.append((self._file.tell(), rows, first_time, last_time))
+        self._file.write(_CHUNK_HEADER.pack(_CHUNK_MAGIC, rows, first_time, last_time))
+        self._file.write(rows_in_chunk)
+        self._file.flush()
+
+    def close(self):
+        """
+        Write the last rows and the chunk index, the AsyncWriter (if any) should be closed first after a flush()
+        """
+        if self._file.closed:
+            return
+
+        self.flush()
+        index_offset = self._file.tell()
+        self._file.write(_INDEX_MAGIC + _LENGTH.pack(len(self._chunk_index)))
+        self._file.write(np.array(self._chunk_index, dtype=CHUNK_INDEX_DTYPE).tobytes())
+        self._file.write(_TRAILER.pack(index_offset, _END_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def cell_formatter(channel):
+    """
+    :param channel: channel dict
+    :return: function that formats a value of the channel (from tolist() of a row) as the data recorder does in CSV files
+    """
+    if channel['shape']:
+        return lambda value: str(value.tolist())  # sub-arrays stay arrays in tolist() of a structured row
+    if np.dtype(channel['dtype']).kind == 'S':
+        return lambda value: str(value, encoding='utf-8')
+    return str
+
+
+class CsvRecordingWriter:
+    """
+    Writes rows with the layout of a binary recording (see row_dtype) as CSV, with the time as first column and the cell format of the CSV files of
+    the data recorder. Rows are collected in buffers and written by an AsyncWriter if given (see RowBuffers).
+    """
+
+    def __init__(self, file_path, channels, rows_per_buffer=100, async_writer=None):
+        """
+        :param file_path: path of the CSV file, an existing file is overwritten
+        :param channels: list of channel dicts with name, dtype (numpy dtype string), shape (list) and units
+        :param rows_per_buffer: number of rows per buffer
+        :param async_writer: AsyncWriter that writes the buffers, None to write them in the calling thread
+        """
+        self.file_path = file_path
+        self.channels = channels
+        self.row = np.zeros((), dtype=row_dtype(channels))  # to be filled before every append()
+
+        self._formatters = [str] + [cell_formatter(channel) for channel in channels]
+        self._rows = RowBuffers(self._write_rows, lambda rows: [''] * rows, rows_per_buffer, async_writer)
+        self._file = open(file_path, 'w')
+        self._file.write('; '.join(['time'] + [channel['name'] for channel in channels]) + '\n')
+
+    def append(self, time_in_ns):
+        """
+        Add the current row
+        :param time_in_ns: timestamp of the row, in ns since the epoch
+        """
+        self.row['time'] = time_in_ns
+        self._rows.append('; '.join([formatter(value) for formatter, value in zip(self._formatters, self.row.tolist())]))
+
+    def flush(self):
+        self._rows.flush()
+
+    def _write_rows(self, buffer, rows):
+        self._file.write('\n'.join(buffer[:rows]) + '\n')
+
+    def close(self):
+        """
+        Write the last rows and close the file, the AsyncWriter (if any) should be closed first after a flush()
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class RecordingReader:
+    """
+    Reads a binary recording written by RecordingWriter. The chunk index is used to read only the chunks in a time range; when the file has no
+    index (the recorder did not close it), the chunks are scanned and a truncated last chunk is skipped (recovered is True then).
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: path of the recording
+        """
+        self.file_path = file_path
+        self.recovered = False
+
+        with open(file_path, 'rb') as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError('%s is not a JOAN recording' % file_path)
+            header_length, = _LENGTH.unpack(file.read(_LENGTH.size))
+            self.header = json.loads(file.read(header_length).decode('utf-8'))
+            self._data_offset = file.tell()
+
+        self.channels = self.header['channels']
+        self.dtype = row_dtype(self.channels)
+        self.chunk_index = self._read_chunk_index()
+
+    @property
+    def names(self):
+        return [channel['name'] for channel in self.channels]
+
+    @property
+    def number_of_rows(self):
+        return int(self.chunk_index['rows'].sum())
+
+    def _read_chunk_index(self):
+        file_size = os.path.getsize(self.file_path)
+        with open(self.file_path, 'rb') as file:
+            if file_size >= self._data_offset + _TRAILER.size:
+                file.seek(file_size - _TRAILER.size)
+                index_offset, end_magic = _TRAILER.unpack(file.read(_TRAILER.size))
+                if end_magic == _END_MAGIC:
+                    file.seek(index_offset)
+                    if file.read(len(_INDEX_MAGIC)) == _INDEX_MAGIC:
+                        number_of_chunks, = _LENGTH.unpack(file.read(_LENGTH.size))
+                        return np.frombuffer(file.read(number_of_chunks * CHUNK_INDEX_DTYPE.itemsize), dtype=CHUNK_INDEX_DTYPE)
+
+            # no index: scan the chunks up to the first incomplete one
+            self.recovered = True
+            chunk_index = []
+            offset = self._data_offset
+            while offset + _CHUNK_HEADER.size <= file_size:
+                file.seek(offset)
+                magic, rows, first_time, last_time = _CHUNK_HEADER.unpack(file.read(_CHUNK_HEADER.size))
+                end_of_chunk = offset + _CHUNK_HEADER.size + rows * self.dtype.itemsize
+                if magic != _CHUNK_MAGIC or end_of_chunk > file_size:
+                    break
+                chunk_index.append((offset, rows, first_time, last_time))
+                offset = end_of_chunk
+
+            return np.array(chunk_index, dtype=CHUNK_INDEX_DTYPE)
+
+    def read(self, start_time=None, end_time=None):
+        """
+        :param start_time: only rows from this time on (ns since the epoch), None for all
+        :param end_time: only rows up to and including this time, None for all
+        :return: structured array with all rows (fields: time, c0, c1, ...)
+        """
+        chunks = self.chunk_index
+        if start_time is not None:
+            chunks = chunks[chunks['last_time'] >= start_time]
+        if end_time is not None:
+            chunks = chunks[chunks['first_time'] <= end_time]
+
+        rows = np.empty(int(chunks['rows'].sum()), dtype=self.dtype)
+        position = 0
+        with open(self.file_path, 'rb') as file:
+            for offset, number_of_rows, _, _ in chunks:
+                file.seek(int(offset) + _CHUNK_HEADER.size)
+                rows[position:position + number_of_rows] = np.frombuffer(file.read(int(number_of_rows) * self.dtype.itemsize), dtype=self.dtype)
+                position += number_of_rows
+
+        if start_time is not None:
+            rows = rows[rows['time'] >= start_time]
+        if end_time is not None:
+            rows = rows[rows['time'] <= end_time]
+        return rows
+
+    def columns(self, start_time=None, end_time=None):
+        """
+        :return: dict with the time and every channel under its name, as numpy arrays (the parameters are those of read())
+        """
+        rows = self.read(start_time, end_time)
+        columns = {'time': rows['time']}
+        columns.update((channel['name'], rows['c%d' % index]) for index, channel in enumerate(self.channels))
+        return columns
+
+    def to_dataframe(self, start_time=None, end_time=None):
+        """
+        :return: pandas DataFrame with a column per channel (array-valued channels get a column per element, e.g. 'transform[0]') and the time
+        as index (the parameters are those of read())
+        """
+        import pandas as pd  # optional dependency, only needed to export to pandas
+
+        rows = self.read(start_time, end_time)
+        data = {}
+        for index, channel in enumerate(self.channels):
+            values = rows['c%d' % index]
+            if values.dtype.kind == 'S':
+                values = np.char.decode(values, 'utf-8')
+            if values.ndim > 1:
+                for element in np.ndindex(*values.shape[1:]):
+                    data[channel['name'] + ''.join('[%d]' % i for i in element)] = values[(slice(None),) + element]
+            else:
+                data[channel['name']] = values
+
+        return pd.DataFrame(data, index=pd.to_datetime(rows['time'], unit='ns').rename('time'))
@@ -0,0 +1,262 @@
+import datetime
+import glob
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+
+import numpy as np
+
+from modules.datarecorder.datarecorder_recording import CHUNK_INDEX_DTYPE, RecordingReader, row_dtype
+
+_MAGIC = b'JOANSEG1'
+_SEGMENT_HEADER = struct.Struct('<8sIIQQ')  # magic, segment number, length of the JSON header, offset of the rows, capacity in rows
+_COMMIT_OFFSET = 32  # the commit block: number of committed rows, first time, last time, closed (uint64 each)
+_JSON_OFFSET = 64
+_PAGE_SIZE = 4096
+
+_COMMITTED_ROWS, _FIRST_TIME, _LAST_TIME, _CLOSED = range(4)
+
+
+def segment_path(file_path, number):
+    """
+    :param file_path: path of the recording, e.g. 'joan_data.joanseg'
+    :param number: number of the segment
+    :return: path of the segment file, e.g. 'joan_data.0003.joanseg'
+    """
+    without_extension, extension = os.path.splitext(file_path)
+    return '%s.%04d%s' % (without_extension, number, extension)
+
+
+class _Segment:
+    """
+    One preallocated segment file, mapped in memory: a header, the commit block, the JSON header of the recording and room for the rows
+    """
+
+    def __init__(self, file_path, number, encoded_header, dtype, size_in_bytes):
+        self.file_path = file_path
+        self.number = number
+        self.itemsize = dtype.itemsize
+        self.data_offset = -(-(_JSON_OFFSET + len(encoded_header)) // _PAGE_SIZE) * _PAGE_SIZE
+        self.capacity = (size_in_bytes - self.data_offset) // dtype.itemsize
+        if self.capacity < 1:
+            raise ValueError('A segment of %d bytes is too small for the header and one row of %d bytes' % (size_in_bytes, dtype.itemsize))
+
+        with open(file_path, 'w+b') as file:
+            # allocate the blocks now instead of at the first write to every page in the loop (a sparse file where the OS cannot preallocate)
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(file.fileno(), 0, size_in_bytes)
+            else:
+                file.truncate(size_in_bytes)
+            self._mmap = mmap.mmap(file.fileno(), size_in_bytes)
+
+        self._mmap[:_SEGMENT_HEADER.size] = _SEGMENT_HEADER.pack(_MAGIC, number, len(encoded_header), self.data_offset, self.capacity)
+        self._mmap[_JSON_OFFSET:_JSON_OFFSET + len(encoded_header)] = encoded_header
+        self.commit = np.ndarray(4, dtype='<u8', buffer=self._mmap, offset=_COMMIT_OFFSET)
+        self.rows = np.ndarray(self.capacity, dtype=dtype, buffer=self._mmap, offset=self.data_offset)
+
+    def close(self, *_):
+        """
+        Mark the segment as closed, write it to disk and cut off the room that was not used (a segment without rows is removed)
+        """
+        committed_rows = int(self.commit[_COMMITTED_ROWS])
+        self.commit[_CLOSED] = 1
+        self._mmap.flush()
+
+        del self.commit, self.rows  # the views on the map have to be released before the map can be closed
+        self._mmap.close()
+        if committed_rows:
+            os.truncate(self.file_path, self.data_offset + committed_rows * self.itemsize)
+        else:
+            os.remove(self.file_path)
+
+
+class SegmentedRecordingWriter:
+    """
+    Writes a recording into preallocated, memory-mapped segment files (joan_data.0000.joanseg, ...), every row is committed when it is appended, so
+    it survives a crash of the process. Recover or convert it with joan-recover (python -m tools.joanrecover).
+    """
+
+    def __init__(self, file_path, channels, segment_size_in_bytes=64 * 2 ** 20, metadata=None, async_writer=None):
+        """
+        :param file_path: path of the recording (e.g. joan_data.joanseg), the segments are numbered after it (see segment_path)
+        :param channels: list of channel dicts with name, dtype (numpy dtype string), shape (list) and units
+        :param segment_size_in_bytes: size of every segment file
+        :param metadata: dict with extra (JSON serializable) information to store in the header
+        :param async_writer: AsyncWriter that prepares and flushes the segments, None to do that in the calling thread
+        """
+        self.file_path = file_path
+        self.channels = channels
+        self.segment_size_in_bytes = segment_size_in_bytes
+        self.row = np.zeros((), dtype=row_dtype(channels))  # to be filled before every append()
+
+        self._encoded_header = json.dumps({'version': 1,
+                                           'created': datetime.datetime.now().isoformat(),
+                                           'segment_size': segment_size_in_bytes,
+                                           'channels': channels,
+                                           'metadata': metadata or {}}).encode('utf-8')
+        self._async_writer = async_writer
+        self._lock = threading.Lock()
+        self._prepared_segments = {}  # number: _Segment, prepared in the background
+
+        self._segment_number = 0
+        self._segment = self._create_segment(0)
+        self._rows = self._segment.rows
+        self._commit = self._segment.commit
+        self._committed_rows = 0
+        self._prepare_next_segment()
+
+    def _create_segment(self, number):
+        return _Segment(segment_path(self.file_path, number), number, self._encoded_header, self.row.dtype, self.segment_size_in_bytes)
+
+    def _prepare_segment(self, number, _):
+        with self._lock:
+            if number > self._segment_number and number not in self._prepared_segments:
+                self._prepared_segments[number] = self._create_segment(number)
+
+    def _prepare_next_segment(self):
+        if self._async_writer:
+            self._async_writer.submit(self._prepare_segment, self._segment_number + 1, 0)
+
+    def append(self, time_in_ns):
+        """
+        Add the current row and commit it
+        :param time_in_ns: timestamp of the row, in ns since the epoch
+        """
+        self.row['time'] = time_in_ns
+        self._rows[self._committed_rows] = self.row
+        self._committed_rows += 1
+
+        # commit after the row is complete: the time first, then the number of rows
+        if self._committed_rows == 1:
+            self._commit[_FIRST_TIME] = time_in_ns
+        self._commit[_LAST_TIME] = time_in_ns
+        self._commit[_COMMITTED_ROWS] = self._committed_rows
+
+        if self._committed_rows == self._segment.capacity:
+            self._roll_over()
+
+    def _roll_over(self):
+        full_segment = self._segment
+        if not (self._async_writer and self._async_writer.submit(full_segment.close, None, 0)):
+            full_segment.close()
+
+        with self._lock:
+            self._segment_number += 1
+            segment = self._prepared_segments.pop(self._segment_number, None)
+        self._segment = segment or self._create_segment(self._segment_number)
+        self._rows = self._segment.rows
+        self._commit = self._segment.commit
+        self._committed_rows = 0
+        self._prepare_next_segment()
+
+    def flush(self):
+        """
+        Nothing to do: every row is committed when it is appended
+        """
+        pass
+
+    def close(self):
+        """
+        Close the last segment and remove a prepared segment that was not used, the AsyncWriter (if any) should be closed first
+        """
+        if self._segment is None:
+            return
+
+        self._rows = self._commit = None
+        self._segment.close()
+        self._segment = None
+        with self._lock:
+            for segment in self._prepared_segments.values():
+                segment.close()  # removes the file, it has no rows
+            self._prepared_segments.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_segment_info(file_path):
+    """
+    :param file_path: path of a segment file
+    :return: dict with the header of the recording and the number, data offset, committed rows, first and last time and the state of the segment;
+    the committed rows are checked against the size of the file and the time of the last row
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        magic, number, header_length, data_offset, capacity = _SEGMENT_HEADER.unpack(file.read(_SEGMENT_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError('%s is not a JOAN recording segment' % file_path)
+        file.seek(_COMMIT_OFFSET)
+        committed_rows, first_time, last_time, closed = np.frombuffer(file.read(32), dtype='<u8').tolist()
+        file.seek(_JSON_OFFSET)
+        header = json.loads(file.read(header_length).decode('utf-8'))
+
+        dtype = row_dtype(header['channels'])
+        complete_rows = max(file_size - data_offset, 0) // dtype.itemsize
+        rows = min(committed_rows, capacity, complete_rows)
+
+        # a commit that was not written to disk completely (e.g. after a power failure) is repaired: back to the last row with a valid time
+        times = np.fromfile(file_path, dtype=dtype, count=rows, offset=data_offset)['time'] if rows else np.empty(0, dtype='<u8')
+        repaired = rows != committed_rows or (rows and int(times[-1]) != last_time)
+        if repaired:
+            valid = np.flatnonzero((times >= first_time) & (times <= max(last_time, first_time)) & (times > 0))
+            rows = int(valid[-1]) + 1 if len(valid) else 0
+            last_time = int(times[rows - 1]) if rows else 0
+
+    return {'header': header, 'number': number, 'data_offset': data_offset, 'rows': rows, 'first_time': first_time, 'last_time': last_time,
+            'closed': bool(closed), 'repaired': bool(repaired)}
+
+
+class SegmentedRecordingReader(RecordingReader):
+    """
+    Reads the committed rows of all segments of a segmented recording, also when it was not closed (recovered is True then)
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: path of the recording (joan_data.joanseg) or of one of its segments (joan_data.0000.joanseg)
+        """
+        without_extension, extension = os.path.splitext(file_path)
+        self.file_path = re.sub(r'\.\d{4}$', '', without_extension) + extension
+        self.segment_paths = []
+        segments = []
+        for path in sorted(glob.glob(glob.escape(os.path.splitext(self.file_path)[0]) + '.[0-9][0-9][0-9][0-9]' + extension)):
+            self.segment_paths.append(path)
+            segments.append(read_segment_info(path))
+        if not segments:
+            raise FileNotFoundError('No segments of %s found' % self.file_path)
+
+        self.segments = segments
+        self.missing_segments = sorted(set(range(segments[-1]['number'] + 1)) - {segment['number'] for segment in segments})
+        self.recovered = not all(segment['closed'] and not segment['repaired'] for segment in segments) or bool(self.missing_segments)
+
+        self.header = segments[0]['header']
+        self.channels = self.header['channels']
+        self.dtype = row_dtype(self.channels)
+        self.chunk_index = np.array([(segment['data_offset'], segment['rows'], segment['first_time'], segment['last_time']) for segment in segments],
+                                    dtype=CHUNK_INDEX_DTYPE)
+
+    def read(self, start_time=None, end_time=None):
+        """
+        :param start_time: only rows from this time on (ns since the epoch), None for all
+        :param end_time: only rows up to and including this time, None for all
+        :return: structured array with all committed rows (fields: time, c0, c1, ...)
+        """
+        parts = []
+        for path, segment in zip(self.segment_paths, self.segments):
+            if not segment['rows'] or (start_time is not None and segment['last_time'] < start_time) or \
+                    (end_time is not None and segment['first_time'] > end_time):
+                continue
+            parts.append(np.fromfile(path, dtype=self.dtype, count=segment['rows'], offset=segment['data_offset']))
+
+        rows = np.concatenate(parts) if parts else np.empty(0, dtype=self.dtype)
+        if start_time is not None:
+            rows = rows[rows['time'] >= start_time]
+        if end_time is not None:
+            rows = rows[rows['time'] <= end_time]
+        return rows
@@ -1,4 +1,6 @@
 from core.module_settings import ModuleSettings
+from modules.datarecorder.datarecorder_recording import RecordingFormats
+from modules.datarecorder.datarecorder_writer import BackPressurePolicies
 from modules.joanmodules import JOANModules
 
 
@@ -8,13 +10,33 @@ class DataRecorderSettings(ModuleSettings):
 
         self.path_to_save_file = ''
         self.append_timestamp_to_filename = True
+        self.recording_format = RecordingFormats.CSV.value
         self.variables_to_be_saved = []
 
+        # record every tick of the modules from their shared history (the modules need a history_length), instead of sampling the latest values
+        self.record_every_producer_tick = False
+
+        # rows are collected in buffers of rows_per_buffer rows (chunks of a binary recording), which are written by a background thread
+        self.write_in_background = True
+        self.rows_per_buffer = 100
+        self.write_queue_size = 8
+        self.back_pressure_policy = BackPressurePolicies.BLOCK.value
+
+        # size of the segment files of a crash-safe (RecordingFormats.SEGMENTS) recording
+        self.segment_size_in_mb = 64
+
         self.path_to_trajectory_save_file = ''
         self.should_record_trajectory = False
 
     def reset(self):
         self.path_to_save_file = ''
+        self.recording_format = RecordingFormats.CSV.value
         self.variables_to_be_saved = []
+        self.record_every_producer_tick = False
+        self.write_in_background = True
+        self.rows_per_buffer = 100
+        self.write_queue_size = 8
+        self.back_pressure_policy = BackPressurePolicies.BLOCK.value
+        self.segment_size_in_mb = 64
         self.path_to_trajectory_save_file = ''
         self.should_record_trajectory = False
@@ -0,0 +1,156 @@
+import enum
+import queue
+import threading
+import time
+
+
+class BackPressurePolicies(enum.Enum):
+    """
+    What the data recorder does when the writer thread falls behind (e.g. a slow disk) and the write queue is full
+    """
+    BLOCK = 0  # wait until there is room in the queue: no rows are lost, but the tick of the data recorder is delayed
+    DROP = 1  # drop the rows of the buffer that does not fit in the queue (they are counted in the metrics): the tick is never delayed
+
+    def __str__(self):
+        return {BackPressurePolicies.BLOCK: 'Block',
+                BackPressurePolicies.DROP: 'Drop'}[self]
+
+
+class AsyncWriter(threading.Thread):
+    """
+    Background thread that writes buffers of rows to file, handed over through a bounded queue (see RowBuffers and BackPressurePolicies)
+    """
+
+    def __init__(self, queue_size=8, back_pressure_policy=BackPressurePolicies.BLOCK):
+        """
+        :param queue_size: maximum number of buffers waiting to be written
+        :param back_pressure_policy: BackPressurePolicies
+        """
+        super().__init__(name='data recorder writer', daemon=True)
+        self.queue_size = queue_size
+        self.back_pressure_policy = back_pressure_policy
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._exception = None
+
+        self.max_queue_depth = 0
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self.failed_rows = 0  # rows of writes that raised an exception
+        self.blocked_time_in_ns = 0  # time the loop waited for room in the queue (BLOCK)
+        self._write_latencies_in_ns = []  # of the writes since the last call of metrics()
+        self.max_write_latency_in_ns = 0
+
+    def submit(self, write, buffer, rows):
+        """
+        Hand a buffer over to the writer thread, the buffer should not be changed until it is written
+        :param write: function that writes the buffer, called in the writer thread as write(buffer, rows)
+        :param buffer: the buffer
+        :param rows: number of rows in the buffer
+        :return: True if the buffer will be written, False if it was dropped (DROP)
+        """
+        if self._exception:
+            raise IOError('The data recorder could not write its data') from self._exception
+
+        item = (write, buffer, rows)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.back_pressure_policy is BackPressurePolicies.DROP:
+                self.dropped_rows += rows
+                return False
+
+            t0 = time.perf_counter_ns()
+            self._queue.put(item)
+            self.blocked_time_in_ns += time.perf_counter_ns() - t0
+
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            write, buffer, rows = item
+            t0 = time.perf_counter_ns()
+            try:
+                write(buffer, rows)
+            except Exception as exception:
+                self._exception = exception  # raised in the loop of the data recorder at the next submit
+                self.failed_rows += rows
+                continue
+            latency = time.perf_counter_ns() - t0
+
+            self._write_latencies_in_ns.append(latency)
+            self.max_write_latency_in_ns = max(self.max_write_latency_in_ns, latency)
+            self.written_rows += rows
+
+    def close(self):
+        """
+        Write all buffers in the queue and end the thread
+        """
+        if self.is_alive():
+            self._queue.put(None)
+            self.join()
+
+        if self._exception:
+            raise IOError('The data recorder could not write its data') from self._exception
+
+    def metrics(self):
+        """
+        :return: dict with the current depth of the queue, the mean write latency since the previous call and totals of this trial
+        """
+        latencies, self._write_latencies_in_ns = self._write_latencies_in_ns, []
+        return {'write queue depth': self._queue.qsize(),
+                'max write queue depth': self.max_queue_depth,
+                'write latency [ms]': round(sum(latencies) / len(latencies) * 1e-6, 3) if latencies else 0.0,
+                'max write latency [ms]': round(self.max_write_latency_in_ns * 1e-6, 3),
+                'written rows': self.written_rows,
+                'dropped rows': self.dropped_rows,
+                'failed rows': self.failed_rows,
+                'blocked [ms]': round(self.blocked_time_in_ns * 1e-6, 3)}
+
+
+class RowBuffers:
+    """
+    Preallocated buffers in which the loop collects rows, a full buffer is handed over to an AsyncWriter (or written directly without one)
+    """
+
+    def __init__(self, write, create_buffer, rows_per_buffer, async_writer=None):
+        """
+        :param write: function that writes a buffer, write(buffer, rows)
+        :param create_buffer: function that creates an empty buffer, create_buffer(rows_per_buffer); rows are stored as buffer[index] = row
+        :param rows_per_buffer: number of rows per buffer
+        :param async_writer: AsyncWriter, or None to write in the calling thread
+        """
+        self.rows_per_buffer = rows_per_buffer
+        self._write = write
+        self._async_writer = async_writer
+
+        number_of_buffers = async_writer.queue_size + 2 if async_writer else 1
+        self._buffers = [create_buffer(rows_per_buffer) for _ in range(number_of_buffers)]
+        self._buffer_index = 0
+        self.buffer = self._buffers[0]
+        self.rows = 0
+
+    def append(self, row):
+        self.buffer[self.rows] = row
+        self.rows += 1
+        if self.rows == self.rows_per_buffer:
+            self.flush()
+
+    def flush(self):
+        """
+        Hand over (or write) the rows collected so far
+        """
+        if not self.rows:
+            return
+
+        if not self._async_writer:
+            self._write(self.buffer, self.rows)
+        elif self._async_writer.submit(self._write, self.buffer, self.rows):
+            self._buffer_index = (self._buffer_index + 1) % len(self._buffers)
+            self.buffer = self._buffers[self._buffer_index]
+        self.rows = 0
@@ -16,7 +16,7 @@ class ExperimentManager(ModuleManager):
     """
     current_experiment: Experiment
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         """
 
         :param news:
@@ -25,7 +25,8 @@ class ExperimentManager(ModuleManager):
         :param parent:
         """
         super().__init__(module=JOANModules.EXPERIMENT_MANAGER, news=news, central_settings=central_settings, signals=signals,
-                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, use_state_machine_and_process=False, parent=parent)
+                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, use_state_machine_and_process=False, parent=parent,
+                         headless=headless)
         # create/get default experiment_settings
         self.current_experiment = None
 
@@ -36,7 +37,8 @@ class ExperimentManager(ModuleManager):
         self.active_condition = None
         self.active_condition_index = None
 
-        self.module_dialog.update_gui()
+        if self.module_dialog:
+            self.module_dialog.update_gui()
 
     def create_new_experiment(self, modules_to_include, save_path):
         """
@@ -51,12 +53,11 @@ class ExperimentManager(ModuleManager):
         self.experiment_save_path = save_path
         self.save_experiment()
 
-        # update the gui
-        self.module_dialog.update_gui()
-        self.module_dialog.update_condition_lists()
-
-        # and open the experiment dialog
-        self.module_dialog.open_experiment_dialog()
+        # update the gui and open the experiment dialog
+        if self.module_dialog:
+            self.module_dialog.update_gui()
+            self.module_dialog.update_condition_lists()
+            self.module_dialog.open_experiment_dialog()
 
     def save_experiment(self):
         """
@@ -74,8 +75,9 @@ class ExperimentManager(ModuleManager):
         """
         self.experiment_save_path = file_path
         self.current_experiment = Experiment.load_from_file(file_path)
-        self.module_dialog.update_gui()
-        self.module_dialog.update_condition_lists()
+        if self.module_dialog:
+            self.module_dialog.update_gui()
+            self.module_dialog.update_condition_lists()
 
     def activate_selected_condition(self, condition, condition_index):
         """
@@ -127,9 +129,12 @@ class ExperimentManager(ModuleManager):
                         return True
                     finally:
                         if added_index > 2:
-                            QtWidgets.QMessageBox.warning(self.module_dialog, 'Warning', 'A sequence of multiple consecutive transitions was found. '
-                                                                                         'This is illegal, only the first was executed, the others were '
-                                                                                         'ignored.')
+                            warning_message = 'A sequence of multiple consecutive transitions was found. This is illegal, only the first was ' \
+                                              'executed, the others were ignored.'
+                            if self.module_dialog:
+                                QtWidgets.QMessageBox.warning(self.module_dialog, 'Warning', warning_message)
+                            else:
+                                print('WARNING: ' + warning_message)
 
                 if self.activate_selected_condition(next_condition_or_transition, self.active_condition_index + added_index):
                     transition.execute_after_new_condition_activation(self.current_experiment, self.active_condition)
@@ -0,0 +1,144 @@
+import math
+import os
+
+from PyQt5 import QtWidgets, uic
+
+from core.statesenum import State
+from modules.hapticcontrollermanager.hapticcontrollermanager_controllertypes import HapticControllerTypes
+
+
+class FDCAControllerSettingsDialog(QtWidgets.QDialog):
+    def __init__(self, settings, module_manager, parent=None):
+        super().__init__(parent)
+
+        self.fdca_controller_settings = settings
+        self.module_manager = module_manager
+
+        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/fdca_settings_ui.ui"), self)
+        self._path_trajectory_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'trajectories')
+
+        self.btnbox_fdca_controller_settings.button(
+            self.btnbox_fdca_controller_settings.RestoreDefaults).clicked.connect(self._set_default_values)
+        self.slider_loha.valueChanged.connect(self._update_loha_slider_label)
+        self.btn_apply_parameters.clicked.connect(self.update_parameters)
+
+        # hardcode lookahead time if someone needs it
+        self.t_lookahead = 0
+
+        self._loha_resolution = 50
+        self.slider_loha.setMaximum(self._loha_resolution)
+        self.spin_loha.setMaximum(self._loha_resolution)
+
+        self.module_manager.state_machine.add_state_change_listener(self.handle_state_change)
+
+        self.update_trajectory_list()
+        self._display_values()
+
+        self.handle_state_change()
+
+    def handle_state_change(self):
+        # disable changing of trajectory while running (would be quite dangerous)
+        if self.module_manager.state_machine.current_state == State.RUNNING:
+            self.cmbbox_hcr_selection.setEnabled(False)
+            self.cmbbox_hcr_selection.blockSignals(True)
+        else:
+            self.cmbbox_hcr_selection.setEnabled(True)
+            self.cmbbox_hcr_selection.blockSignals(False)
+
+    def update_parameters(self):
+        self.slider_loha.setValue(self.spin_loha.value())
+        self.fdca_controller_settings.k_y = float(self.edit_k_y.text())
+        self.fdca_controller_settings.k_psi = float(self.edit_k_psi.text())
+        self.fdca_controller_settings.lohs = float(self.edit_lohs.text())
+        self.fdca_controller_settings.sohf = float(self.edit_sohf.text())
+        self.fdca_controller_settings.loha = float(self.slider_loha.value())
+        self.fdca_controller_settings.trajectory_name = self.cmbbox_hcr_selection.itemText(
+            self.cmbbox_hcr_selection.currentIndex())
+
+        try:
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_y = self.fdca_controller_settings.k_y
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_psi = self.fdca_controller_settings.k_psi
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].lohs = self.fdca_controller_settings.lohs
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].sohf = self.fdca_controller_settings.sohf
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].loha = self.fdca_controller_settings.loha
+        except:
+            pass
+
+        self._display_values()
+
+    def _update_loha_slider_label(self):
+        self.spin_loha.setValue(self.slider_loha.value())
+        if self.checkbox_tuning_loha.isChecked():
+            self.fdca_controller_settings.loha = float(self.slider_loha.value())
+            self.lbl_loha.setText(str(self.fdca_controller_settings.loha))
+            self.lbl_loha_deg.setText(str(round(math.radians(self.fdca_controller_settings.loha), 3)))
+            try:
+                self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].loha = self.fdca_controller_settings.loha
+            except:
+                pass
+
+    def accept(self):
+        self.slider_loha.setValue(self.spin_loha.value())
+        self.fdca_controller_settings.k_y = float(self.edit_k_y.text())
+        self.fdca_controller_settings.k_psi = float(self.edit_k_psi.text())
+        self.fdca_controller_settings.lohs = float(self.edit_lohs.text())
+        self.fdca_controller_settings.sohf = float(self.edit_sohf.text())
+        self.fdca_controller_settings.loha = float(self.slider_loha.value())
+        self.fdca_controller_settings.trajectory_name = self.cmbbox_hcr_selection.itemText(
+            self.cmbbox_hcr_selection.currentIndex())
+
+        try:
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_y = self.fdca_controller_settings.k_y
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_psi = self.fdca_controller_settings.k_psi
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].lohs = self.fdca_controller_settings.lohs
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].sohf = self.fdca_controller_settings.sohf
+            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].loha = self.fdca_controller_settings.loha
+        except:
+            pass
+
+        super().accept()
+
+    def _display_values(self, settings_to_display=None):
+        if not settings_to_display:
+            settings_to_display = self.fdca_controller_settings
+
+        # update the current controller settings
+        self.lbl_k_y.setText(str(settings_to_display.k_y))
+        self.lbl_k_psi.setText(str(settings_to_display.k_psi))
+        self.lbl_k_psi_deg.setText(str(round(math.radians(settings_to_display.k_psi), 3)))
+        self.lbl_lohs.setText(str(settings_to_display.lohs))
+        self.lbl_sohf.setText(str(settings_to_display.sohf))
+        self.lbl_loha.setText(str(settings_to_display.loha))
+        self.lbl_loha_deg.setText(str(round(math.radians(settings_to_display.loha), 3)))
+
+        self.edit_k_y.setText(str(settings_to_display.k_y))
+        self.edit_k_psi.setText(str(settings_to_display.k_psi))
+        self.edit_lohs.setText(str(settings_to_display.lohs))
+        self.edit_sohf.setText(str(settings_to_display.sohf))
+        self.slider_loha.setValue(settings_to_display.loha)
+        self.spin_loha.setValue(settings_to_display.loha)
+
+        idx_traj = self.cmbbox_hcr_selection.findText(settings_to_display.trajectory_name)
+        self.cmbbox_hcr_selection.setCurrentIndex(idx_traj)
+
+    def _set_default_values(self):
+        self._display_values(HapticControllerTypes.FDCA.settings())
+        self.update_parameters()
+
+    def update_trajectory_list(self):
+        """
+        Check what trajectory files are present and update the selection list
+        """
+        # get list of csv files in directory
+        if not os.path.isdir(self._path_trajectory_directory):
+            os.mkdir(self._path_trajectory_directory)
+
+        files = [filename for filename in os.listdir(self._path_trajectory_directory) if filename.endswith('csv')]
+
+        self.cmbbox_hcr_selection.clear()
+        self.cmbbox_hcr_selection.addItem('None')
+        self.cmbbox_hcr_selection.addItems(files)
+
+        idx = self.cmbbox_hcr_selection.findText(self.fdca_controller_settings.trajectory_name)
+        if idx != -1:
+            self.cmbbox_hcr_selection.setCurrentIndex(idx)
@@ -3,151 +3,13 @@ import os
 
 import numpy as np
 import pandas as pd
-from PyQt5 import QtWidgets, uic
 
-from core.statesenum import State
-from modules.hapticcontrollermanager.hapticcontrollermanager_controllertypes import HapticControllerTypes
+from core.latencytrace import TraceHop, carry_trace
+from core.spanrecorder import span
 from tools import LowPassFilterBiquad
 from tools.haptic_controller_tools import find_closest_node
 
 
-class FDCAControllerSettingsDialog(QtWidgets.QDialog):
-    def __init__(self, settings, module_manager, parent=None):
-        super().__init__(parent)
-
-        self.fdca_controller_settings = settings
-        self.module_manager = module_manager
-
-        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/fdca_settings_ui.ui"), self)
-        self._path_trajectory_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'trajectories')
-
-        self.btnbox_fdca_controller_settings.button(
-            self.btnbox_fdca_controller_settings.RestoreDefaults).clicked.connect(self._set_default_values)
-        self.slider_loha.valueChanged.connect(self._update_loha_slider_label)
-        self.btn_apply_parameters.clicked.connect(self.update_parameters)
-
-        # hardcode lookahead time if someone needs it
-        self.t_lookahead = 0
-
-        self._loha_resolution = 50
-        self.slider_loha.setMaximum(self._loha_resolution)
-        self.spin_loha.setMaximum(self._loha_resolution)
-
-        self.module_manager.state_machine.add_state_change_listener(self.handle_state_change)
-
-        self.update_trajectory_list()
-        self._display_values()
-
-        self.handle_state_change()
-
-    def handle_state_change(self):
-        # disable changing of trajectory while running (would be quite dangerous)
-        if self.module_manager.state_machine.current_state == State.RUNNING:
-            self.cmbbox_hcr_selection.setEnabled(False)
-            self.cmbbox_hcr_selection.blockSignals(True)
-        else:
-            self.cmbbox_hcr_selection.setEnabled(True)
-            self.cmbbox_hcr_selection.blockSignals(False)
-
-    def update_parameters(self):
-        self.slider_loha.setValue(self.spin_loha.value())
-        self.fdca_controller_settings.k_y = float(self.edit_k_y.text())
-        self.fdca_controller_settings.k_psi = float(self.edit_k_psi.text())
-        self.fdca_controller_settings.lohs = float(self.edit_lohs.text())
-        self.fdca_controller_settings.sohf = float(self.edit_sohf.text())
-        self.fdca_controller_settings.loha = float(self.slider_loha.value())
-        self.fdca_controller_settings.trajectory_name = self.cmbbox_hcr_selection.itemText(
-            self.cmbbox_hcr_selection.currentIndex())
-
-        try:
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_y = self.fdca_controller_settings.k_y
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_psi = self.fdca_controller_settings.k_psi
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].lohs = self.fdca_controller_settings.lohs
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].sohf = self.fdca_controller_settings.sohf
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].loha = self.fdca_controller_settings.loha
-        except:
-            pass
-
-        self._display_values()
-
-    def _update_loha_slider_label(self):
-        self.spin_loha.setValue(self.slider_loha.value())
-        if self.checkbox_tuning_loha.isChecked():
-            self.fdca_controller_settings.loha = float(self.slider_loha.value())
-            self.lbl_loha.setText(str(self.fdca_controller_settings.loha))
-            self.lbl_loha_deg.setText(str(round(math.radians(self.fdca_controller_settings.loha), 3)))
-            try:
-                self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].loha = self.fdca_controller_settings.loha
-            except:
-                pass
-
-    def accept(self):
-        self.slider_loha.setValue(self.spin_loha.value())
-        self.fdca_controller_settings.k_y = float(self.edit_k_y.text())
-        self.fdca_controller_settings.k_psi = float(self.edit_k_psi.text())
-        self.fdca_controller_settings.lohs = float(self.edit_lohs.text())
-        self.fdca_controller_settings.sohf = float(self.edit_sohf.text())
-        self.fdca_controller_settings.loha = float(self.slider_loha.value())
-        self.fdca_controller_settings.trajectory_name = self.cmbbox_hcr_selection.itemText(
-            self.cmbbox_hcr_selection.currentIndex())
-
-        try:
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_y = self.fdca_controller_settings.k_y
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].k_psi = self.fdca_controller_settings.k_psi
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].lohs = self.fdca_controller_settings.lohs
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].sohf = self.fdca_controller_settings.sohf
-            self.module_manager.shared_variables.haptic_controllers[self.fdca_controller_settings.identifier].loha = self.fdca_controller_settings.loha
-        except:
-            pass
-
-        super().accept()
-
-    def _display_values(self, settings_to_display=None):
-        if not settings_to_display:
-            settings_to_display = self.fdca_controller_settings
-
-        # update the current controller settings
-        self.lbl_k_y.setText(str(settings_to_display.k_y))
-        self.lbl_k_psi.setText(str(settings_to_display.k_psi))
-        self.lbl_k_psi_deg.setText(str(round(math.radians(settings_to_display.k_psi), 3)))
-        self.lbl_lohs.setText(str(settings_to_display.lohs))
-        self.lbl_sohf.setText(str(settings_to_display.sohf))
-        self.lbl_loha.setText(str(settings_to_display.loha))
-        self.lbl_loha_deg.setText(str(round(math.radians(settings_to_display.loha), 3)))
-
-        self.edit_k_y.setText(str(settings_to_display.k_y))
-        self.edit_k_psi.setText(str(settings_to_display.k_psi))
-        self.edit_lohs.setText(str(settings_to_display.lohs))
-        self.edit_sohf.setText(str(settings_to_display.sohf))
-        self.slider_loha.setValue(settings_to_display.loha)
-        self.spin_loha.setValue(settings_to_display.loha)
-
-        idx_traj = self.cmbbox_hcr_selection.findText(settings_to_display.trajectory_name)
-        self.cmbbox_hcr_selection.setCurrentIndex(idx_traj)
-
-    def _set_default_values(self):
-        self._display_values(HapticControllerTypes.FDCA.settings())
-        self.update_parameters()
-
-    def update_trajectory_list(self):
-        """
-        Check what trajectory files are present and update the selection list
-        """
-        # get list of csv files in directory
-        if not os.path.isdir(self._path_trajectory_directory):
-            os.mkdir(self._path_trajectory_directory)
-
-        files = [filename for filename in os.listdir(self._path_trajectory_directory) if filename.endswith('csv')]
-
-        self.cmbbox_hcr_selection.clear()
-        self.cmbbox_hcr_selection.addItem('None')
-        self.cmbbox_hcr_selection.addItems(files)
-
-        idx = self.cmbbox_hcr_selection.findText(self.fdca_controller_settings.trajectory_name)
-        if idx != -1:
-            self.cmbbox_hcr_selection.setCurrentIndex(idx)
-
-
 class FDCAControllerProcess:
     def __init__(self, settings, shared_variables, carla_interface_settings):
         self.settings = settings
@@ -162,6 +24,7 @@ class FDCAControllerProcess:
         self._bq_filter_heading = LowPassFilterBiquad(fc=30, fs=100)
         self._controller_error = np.array([0.0, 0.0, 0.0, 0.0])
         self._error_old = np.array([0.0, 0.0])
+        self._vehicle_snapshots = {}  # reused every tick, such that reading the vehicle state does not allocate
 
         self.shared_variables.k_y = settings.k_y
         self.shared_variables.k_psi = settings.k_psi
@@ -295,15 +158,20 @@ class FDCAControllerProcess:
                     # Psi (heading): left-hand z-axis positive (yaw to the right is positive)
                     # torque: rightward rotation is positive
 
-                    pos_car = np.array([carlainterface_shared_variables.agents[agent_settings.__str__()].transform[0],
-                                        carlainterface_shared_variables.agents[agent_settings.__str__()].transform[1]])
-                    vel_car = np.array([carlainterface_shared_variables.agents[agent_settings.__str__()].velocities_in_world_frame[0],
-                                        carlainterface_shared_variables.agents[agent_settings.__str__()].velocities_in_world_frame[1]])
+                    # take one consistent snapshot of the vehicle, such that position and velocity come from the same simulation frame
+                    vehicle = carlainterface_shared_variables.agents[agent_settings.__str__()].snapshot(
+                        into=self._vehicle_snapshots.get(agent_settings.__str__()))
+                    self._vehicle_snapshots[agent_settings.__str__()] = vehicle
+                    transform = vehicle.transform_view()
+
+                    pos_car = transform[0:2]
+                    vel_car = vehicle.velocities_in_world_frame_view()[0:2]
 
-                    heading_car = carlainterface_shared_variables.agents[agent_settings.__str__()].transform[3]
+                    heading_car = transform[3]
 
                     # find static error and error rate:
-                    error = self.calculate_error(pos_car, heading_car, vel_car)
+                    with span('calculate_error'):
+                        error = self.calculate_error(pos_car, heading_car, vel_car)
                     error_rate = (error - self._error_old) / delta_t
 
                     # filter the error rate with biquad filter
@@ -321,7 +189,8 @@ class FDCAControllerProcess:
                                 self.shared_variables.k_y * self._controller_error[0] + self.shared_variables.k_psi * self._controller_error[1])
 
                     # get feedforward sw angle
-                    sw_angle_ff_des = self._get_reference_sw_angle(self.t_lookahead, pos_car, vel_car)
+                    with span('get_reference_sw_angle'):
+                        sw_angle_ff_des = self._get_reference_sw_angle(self.t_lookahead, pos_car, vel_car)
 
                     # level of haptic support (feedforward); get sw angle needed for haptic support
                     sw_angle_ff = self.shared_variables.lohs * sw_angle_ff_des
@@ -354,6 +223,12 @@ class FDCAControllerProcess:
 
                     hardware_manager_shared_variables.inputs[agent_settings.selected_input].torque = torque_fdca
 
+                    # carry the trace of the input sample this torque is based on to the controller and to the steering wheel
+                    carry_trace(vehicle, 'input_trace', self.shared_variables, 'input_trace', TraceHop.TORQUE_COMPUTED,
+                                self.shared_variables.trace_latencies()['input_trace'])
+                    carry_trace(self.shared_variables, 'input_trace', hardware_manager_shared_variables.inputs[agent_settings.selected_input],
+                                'torque_trace', TraceHop.TORQUE_COMPUTED)
+
                     # set the shared variables
                     self.shared_variables.lat_error = error[0]
                     self.shared_variables.heading_error = error[1]
@@ -362,27 +237,3 @@ class FDCAControllerProcess:
                     self.shared_variables.fb_torque = sw_angle_fb * stiffness
                     self.shared_variables.loha_torque = torque_loha
                     self.shared_variables.req_torque = torque_fdca
-
-
-class FDCAControllerSettings:
-    def __init__(self, identifier=''):
-        self.t_lookahead = 0.0
-        self.k_y = 0.15
-        self.k_psi = 2.5
-        self.lohs = 1.0
-        self.sohf = 1.0
-        self.loha = 0.0
-        self.trajectory_name = "MiddleRoadTVRecord_filtered_ffswang_heading_3hz.csv"
-        self.identifier = identifier
-
-        self.haptic_controller_type = HapticControllerTypes.FDCA.value
-
-    def __str__(self):
-        return str(self.identifier)
-
-    def as_dict(self):
-        return self.__dict__
-
-    def set_from_loaded_dict(self, loaded_dict):
-        for key, value in loaded_dict.items():
-            self.__setattr__(key, value)
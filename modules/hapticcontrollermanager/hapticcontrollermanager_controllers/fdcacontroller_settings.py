@@ -0,0 +1,25 @@
+from modules.hapticcontrollermanager.hapticcontrollermanager_controllertypes import HapticControllerTypes
+
+
+class FDCAControllerSettings:
+    def __init__(self, identifier=''):
+        self.t_lookahead = 0.0
+        self.k_y = 0.15
+        self.k_psi = 2.5
+        self.lohs = 1.0
+        self.sohf = 1.0
+        self.loha = 0.0
+        self.trajectory_name = "MiddleRoadTVRecord_filtered_ffswang_heading_3hz.csv"
+        self.identifier = identifier
+
+        self.haptic_controller_type = HapticControllerTypes.FDCA.value
+
+    def __str__(self):
+        return str(self.identifier)
+
+    def as_dict(self):
+        return self.__dict__
+
+    def set_from_loaded_dict(self, loaded_dict):
+        for key, value in loaded_dict.items():
+            self.__setattr__(key, value)
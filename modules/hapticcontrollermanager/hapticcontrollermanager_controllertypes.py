@@ -1,6 +1,8 @@
 import enum
 import os
 
+from tools.lazyimport import import_class
+
 
 class HapticControllerTypes(enum.Enum):
     """
@@ -11,17 +13,15 @@ class HapticControllerTypes(enum.Enum):
 
     @property
     def process(self):
-        from modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller import FDCAControllerProcess
-
-        return {HapticControllerTypes.FDCA: FDCAControllerProcess,
-                }[self]
+        return import_class({HapticControllerTypes.FDCA:
+                                 'modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller_process.FDCAControllerProcess',
+                            }[self])
 
     @property
     def settings_dialog(self):
-        from modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller import FDCAControllerSettingsDialog
-
-        return {HapticControllerTypes.FDCA: FDCAControllerSettingsDialog,
-                }[self]
+        return import_class({HapticControllerTypes.FDCA:
+                                 'modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller_dialog.FDCAControllerSettingsDialog',
+                            }[self])
 
     @property
     def shared_variables(self):
@@ -46,10 +46,9 @@ class HapticControllerTypes(enum.Enum):
 
     @property
     def settings(self):
-        from modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller import FDCAControllerSettings
-
-        return {HapticControllerTypes.FDCA: FDCAControllerSettings,
-                }[self]
+        return import_class({HapticControllerTypes.FDCA:
+                                 'modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller_settings.FDCAControllerSettings',
+                            }[self])
 
     def __str__(self):
         return {HapticControllerTypes.FDCA: 'FDCA'
@@ -8,9 +8,9 @@ class HapticControllerManager(ModuleManager):
     HapticControllerManager keeps track of which haptic controllers are being used with what settings.
     """
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         super().__init__(module=JOANModules.HAPTIC_CONTROLLER_MANAGER, news=news, central_settings=central_settings, signals=signals,
-                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
         self._haptic_controllers = {}
         self.haptic_controller_type = None
         self.haptic_controller_settings = None
@@ -56,7 +56,8 @@ class HapticControllerManager(ModuleManager):
         haptic_controller_settings = self.module_settings.add_haptic_controller(haptic_controller_type, haptic_controller_settings)
 
         # add to module_dialog
-        self.module_dialog.add_haptic_controller(haptic_controller_settings, from_button)
+        if self.module_dialog:
+            self.module_dialog.add_haptic_controller(haptic_controller_settings, from_button)
 
     def remove_haptic_controller(self, identifier):
         """
@@ -67,4 +68,5 @@ class HapticControllerManager(ModuleManager):
         self.module_settings.remove_haptic_controller(identifier)
 
         # remove settings from dialog
-        self.module_dialog.remove_haptic_controller(identifier)
+        if self.module_dialog:
+            self.module_dialog.remove_haptic_controller(identifier)
@@ -1,9 +1,12 @@
 from core.module_process import ModuleProcess
+from core.spanrecorder import span
 from modules.hapticcontrollermanager.hapticcontrollermanager_controllertypes import HapticControllerTypes
 from modules.joanmodules import JOANModules
 
 
 class HapticControllerManagerProcess(ModuleProcess):
+    # calculate the controller output as soon as the carla interface published new vehicle data
+    update_trigger = JOANModules.CARLA_INTERFACE
 
     def __init__(self, module: JOANModules, time_step_in_ms, news, settings, events, settings_singleton, pipe_comm):
         super().__init__(module, time_step_in_ms=time_step_in_ms, news=news, settings=settings, events=events, settings_singleton=settings_singleton,
@@ -34,6 +37,7 @@ class HapticControllerManagerProcess(ModuleProcess):
         """
         for haptic_controllers in self.haptic_controller_objects:
             # will perform the mp input class for each available input
-            self.haptic_controller_objects[haptic_controllers].do(self._time_step_in_ns, carlainterface_shared_variables=self.shared_variables_carla_interface,
-                                                                  hardware_manager_shared_variables=self.shared_variables_hardware,
-                                                                  carla_interface_settings=self.settings_carla_interface)
+            with span(haptic_controllers):
+                self.haptic_controller_objects[haptic_controllers].do(self._time_step_in_ns, carlainterface_shared_variables=self.shared_variables_carla_interface,
+                                                                      hardware_manager_shared_variables=self.shared_variables_hardware,
+                                                                      carla_interface_settings=self.settings_carla_interface)
@@ -0,0 +1,105 @@
+import hid
+
+from core.latencytrace import start_trace
+
+
+class JOANJoystickProcess:
+    """
+    Contains the seperate process of the joystick input, reads the device input and communicates it to the rest of JOAN
+    """
+    def __init__(self, settings, shared_variables):
+        # Initialize Variables
+        self.brake = 0
+        self.steer = 0
+        self.throttle = 0
+        self.handbrake = False
+        self.reverse = False
+
+        self.settings = settings
+        self.shared_variables = shared_variables
+
+        self._joystick_open = False
+        self._joystick = hid.device()
+
+        self._open_connection_to_device()
+
+    def reset(self, settings):
+        """
+        Prepares the joystick for the next trial (warm restart), the connection is kept unless another device is selected
+        :param settings: joystick settings of the next trial
+        :return:
+        """
+        device_changed = (settings.device_vendor_id, settings.device_product_id) != (self.settings.device_vendor_id, self.settings.device_product_id)
+        self.settings = settings
+        self.brake = 0
+        self.steer = 0
+        self.throttle = 0
+        self.handbrake = False
+        self.reverse = False
+
+        if device_changed or not self._joystick_open:
+            self._joystick.close()
+            self._open_connection_to_device()
+
+    def _open_connection_to_device(self):
+        """
+        Starts the connection to a joystick device, sets the boolean 'self._joystick_open' to true if it succeds
+        and to false if it fails
+        """
+        try:
+            self._joystick.open(self.settings.device_vendor_id, self.settings.device_product_id)
+            self._joystick_open = True
+        except OSError:
+            print('Connection to USB Joystick failed')
+            self._joystick_open = False
+
+    def do(self):
+        """
+        Processes all the inputs of the joystick and writes them to self._data which is then written to the news in the
+        action class
+        :return: self._data a dictionary containing :self._data['brake'] = self.brake
+            self._data['throttle'] = self.throttle
+            self._data['steering_angle'] = self.steer
+            self._data['Handbrake'] = self.handbrake
+            self._data['Reverse'] = self.reverse
+        """
+        if self._joystick_open:
+            joystick_data = self._joystick.read(self.settings.degrees_of_freedom, 1)
+        else:
+            joystick_data = False
+
+        if joystick_data:
+            if self.settings.use_separate_brake_channel:
+                self.throttle = ((joystick_data[self.settings.gas_channel]) / 255)
+                self.brake = - ((joystick_data[self.settings.brake_channel]) / 255)
+            else:
+                input_value = 1 - ((joystick_data[self.settings.gas_channel]) / 128)
+                if input_value > 0:
+                    self.throttle = input_value
+                    self.brake = 0
+                elif input_value < 0:
+                    self.throttle = 0
+                    self.brake = -input_value
+
+            if joystick_data[self.settings.hand_brake_channel] == self.settings.hand_brake_value:
+                self.handbrake = True
+            elif joystick_data[self.settings.reverse_channel] == self.settings.reverse_value:
+                self.reverse = True
+            else:
+                self.handbrake = False
+                self.reverse = False
+
+            if self.settings.use_double_steering_resolution:
+                self.steer = (((joystick_data[self.settings.first_steer_channel]) + (
+                    joystick_data[self.settings.second_steer_channel]) * 256) / (256 * 256)) * (
+                                     self.settings.max_steer - self.settings.min_steer) - self.settings.max_steer
+            else:
+                self.steer = ((joystick_data[self.settings.first_steer_channel]) / 255) * (
+                        self.settings.max_steer - self.settings.min_steer) - self.settings.max_steer
+
+        self.shared_variables.brake = self.brake
+        self.shared_variables.throttle = self.throttle
+        self.shared_variables.steering_angle = self.steer
+        self.shared_variables.handbrake = self.handbrake
+        self.shared_variables.reverse = self.reverse
+        start_trace(self.shared_variables, 'input_trace')
@@ -0,0 +1,70 @@
+import math
+
+from modules.hardwaremanager.hardwaremanager_inputtypes import HardwareInputTypes
+
+
+class JoyStickSettings:
+    """
+    Default joystick settings that will load whenever a keyboardinput class is created.
+    """
+
+    def __init__(self, identifier=''):
+        self.min_steer = -0.5 * math.pi
+        self.max_steer = 0.5 * math.pi
+        self.device_vendor_id = 0
+        self.device_product_id = 0
+        self.identifier = identifier
+        self.input_type = HardwareInputTypes.JOYSTICK.value
+
+        self.degrees_of_freedom = 12
+        self.gas_channel = 9
+        self.use_separate_brake_channel = False
+        self.brake_channel = -1
+        self.first_steer_channel = 0
+        self.use_double_steering_resolution = True
+        self.second_steer_channel = 1
+        self.hand_brake_channel = 10
+        self.hand_brake_value = 2
+        self.reverse_channel = 10
+        self.reverse_value = 8
+
+    def as_dict(self):
+        return self.__dict__
+
+    def __str__(self):
+        return str(self.identifier)
+
+    def set_from_loaded_dict(self, loaded_dict):
+        for key, value in loaded_dict.items():
+            self.__setattr__(key, value)
+
+    @staticmethod
+    def get_preset_settings(device='default'):
+        settings_to_return = JoyStickSettings()
+
+        if device == 'xbox':
+            settings_to_return.degrees_of_freedom = 12
+            settings_to_return.gas_channel = 9
+            settings_to_return.use_separate_brake_channel = False
+            settings_to_return.brake_channel = -1
+            settings_to_return.first_steer_channel = 0
+            settings_to_return.use_double_steering_resolution = True
+            settings_to_return.second_steer_channel = 1
+            settings_to_return.hand_brake_channel = 10
+            settings_to_return.hand_brake_value = 2
+            settings_to_return.reverse_channel = 10
+            settings_to_return.reverse_value = 8
+        elif device == 'playstation':
+            settings_to_return.degrees_of_freedom = 12
+            settings_to_return.gas_channel = 9
+            settings_to_return.use_separate_brake_channel = True
+            settings_to_return.brake_channel = 8
+            settings_to_return.first_steer_channel = 1
+            settings_to_return.use_double_steering_resolution = False
+            settings_to_return.second_steer_channel = -1
+            settings_to_return.hand_brake_channel = 5
+            settings_to_return.hand_brake_value = 40
+            settings_to_return.reverse_channel = 6
+            settings_to_return.reverse_value = 10
+
+        return settings_to_return
@@ -0,0 +1,163 @@
+import keyboard
+
+from core.latencytrace import start_trace
+
+# Qt key codes (as stored in the keyboard settings) of the named keys of the keyboard library, without loading Qt (see tools.lazyimport)
+QT_KEY_CODES = {'space': 0x20,
+                'esc': 0x01000000,
+                'tab': 0x01000001,
+                'backspace': 0x01000003,
+                'enter': 0x01000005,
+                'insert': 0x01000006,
+                'delete': 0x01000007,
+                'home': 0x01000010,
+                'end': 0x01000011,
+                'left': 0x01000012,
+                'up': 0x01000013,
+                'right': 0x01000014,
+                'down': 0x01000015,
+                'page up': 0x01000016,
+                'page down': 0x01000017,
+                **{'f%d' % number: 0x01000030 + number - 1 for number in range(1, 13)}}
+
+
+def qt_key_code(key_name):
+    """
+    Converts the name of a key (keyboard library) to its Qt key code, like QtGui.QKeySequence(key_name)[0]
+    :param key_name: e.g. 'a', 'space' or 'left'
+    :return: Qt key code
+    """
+    if len(key_name) == 1:
+        return ord(key_name.upper())
+    try:
+        return QT_KEY_CODES[key_name]
+    except KeyError:
+        # rarely used keys, Qt is only loaded when one of these is pressed
+        from PyQt5 import QtGui
+        QT_KEY_CODES[key_name] = QtGui.QKeySequence(key_name)[0]
+        return QT_KEY_CODES[key_name]
+
+
+class JOANKeyboardProcess:
+    """
+    Main class for the Keyboard input in a seperate multiprocess, this will loop!. Make sure that the things you do
+    in this class are serializable, else it will fail.
+    """
+
+    def __init__(self, settings, shared_variables):
+        self.settings = settings
+
+        self.shared_variables = shared_variables
+
+        # Initialize needed variables:
+        self._throttle = False
+        self._brake = False
+        self._steer_left = False
+        self._steer_right = False
+        self._handbrake = False
+        self._reverse = False
+        self._data = {}
+
+        keyboard.hook(self.key_event, False)
+
+    def reset(self, settings):
+        """
+        Prepares the keyboard for the next trial (warm restart), the keyboard hook is kept
+        :param settings: keyboard settings of the next trial
+        :return:
+        """
+        self.settings = settings
+        self._throttle = False
+        self._brake = False
+        self._steer_left = False
+        self._steer_right = False
+        self._handbrake = False
+        self._reverse = False
+
+    def key_event(self, key):
+        """
+        Distinguishes which key (that has been set before) is pressed and sets a boolean for the appropriate action.
+        :param key:
+        :return:
+        """
+        boolean_key_press_value = key.event_type == keyboard.KEY_DOWN
+        int_key_identifier = qt_key_code(key.name)
+
+        if int_key_identifier == self.settings.throttle_key:
+            self._throttle = boolean_key_press_value
+        elif int_key_identifier == self.settings.brake_key:
+            self._brake = boolean_key_press_value
+        elif int_key_identifier == self.settings.steer_left_key:
+            self._steer_left = boolean_key_press_value
+            if boolean_key_press_value:
+                self._steer_right = False
+        elif int_key_identifier == self.settings.steer_right_key:
+            self._steer_right = boolean_key_press_value
+            if boolean_key_press_value:
+                self._steer_left = False
+        elif int_key_identifier == self.settings.handbrake_key:
+            self._handbrake = boolean_key_press_value
+        elif int_key_identifier == self.settings.reverse_key and boolean_key_press_value:
+            self._reverse = not self._reverse
+
+    def do(self):
+        """
+        Processes all the inputs of the keyboard input and writes them to self._data which is then written to the news
+        in the action class
+        :return: self._data a dictionary containing :
+            self.shared_variables.brake = self.brake
+            self.shared_variables.throttle = self.throttle
+            self.shared_variables.steering_angle = self.steer
+            self.shared_variables.handbrake = self.handbrake
+            self.shared_variables.reverse = self.reverse
+        """
+
+        brake_temp = self.shared_variables.brake
+        throttle_temp = self.shared_variables.throttle
+        steer_temp = self.shared_variables.steering_angle
+
+        # Throttle:
+        if self._throttle and throttle_temp < 1:
+            throttle_temp = throttle_temp + (0.05 * self.settings.throttle_sensitivity / 100)
+        elif throttle_temp > 0 and not self._throttle:
+            throttle_temp = throttle_temp - (0.05 * self.settings.throttle_sensitivity / 100)
+        elif throttle_temp < 0:
+            throttle_temp = 0
+        elif throttle_temp > 1:
+            throttle_temp = 1
+
+        # Brake:
+        if self._brake and brake_temp < 1:
+            brake_temp = brake_temp + (0.05 * self.settings.brake_sensitivity / 100)
+        elif brake_temp > 0 and not self._brake:
+            brake_temp = brake_temp - (0.05 * self.settings.brake_sensitivity / 100)
+        elif brake_temp < 0:
+            brake_temp = 0
+        elif brake_temp > 1:
+            brake_temp = 1
+
+        # Steering:
+        if self._steer_left and self.settings.max_steer >= steer_temp >= self.settings.min_steer:
+            steer_temp -= (self.settings.steer_sensitivity / 2500)
+        elif self._steer_right and self.settings.min_steer <= steer_temp <= self.settings.max_steer:
+            steer_temp += (self.settings.steer_sensitivity / 2500)
+
+        if steer_temp > 0 and self.settings.auto_center:
+            steer_temp -= .25 * (self.settings.steer_sensitivity / 2500)
+        elif steer_temp < 0 and self.settings.auto_center:
+            steer_temp += .25 * (self.settings.steer_sensitivity / 2500)
+
+        if abs(steer_temp) < 0.5 * self.settings.steer_sensitivity / 2500:
+            steer_temp = 0
+
+        # Reverse
+        reverse_temp = self._reverse
+        handbrake_temp = self._handbrake
+
+        # Set the shared variables again:
+        self.shared_variables.brake = brake_temp
+        self.shared_variables.throttle = throttle_temp
+        self.shared_variables.steering_angle = steer_temp
+        self.shared_variables.handbrake = handbrake_temp
+        self.shared_variables.reverse = reverse_temp
+        start_trace(self.shared_variables, 'input_trace')
@@ -0,0 +1,42 @@
+import math
+
+from modules.hardwaremanager.hardwaremanager_inputtypes import HardwareInputTypes
+
+
+class KeyBoardSettings:
+    """
+    Default keyboardinput settings that will load whenever a keyboardinput class is created.
+    """
+
+    def __init__(self, identifier=''):
+        # Qt key codes (QtGui.QKeySequence(...)[0])
+        self.steer_left_key = ord('A')
+        self.steer_right_key = ord('D')
+        self.throttle_key = ord('W')
+        self.brake_key = ord('S')
+        self.reverse_key = ord('R')
+        self.handbrake_key = ord(' ')
+        self.identifier = identifier
+        self.input_type = HardwareInputTypes.KEYBOARD.value
+
+        # Steering Range
+        self.min_steer = - 0.5 * math.pi
+        self.max_steer = 0.5 * math.pi
+
+        # Check auto center
+        self.auto_center = True
+
+        # Sensitivities
+        self.steer_sensitivity = float(50.0)
+        self.throttle_sensitivity = float(50.0)
+        self.brake_sensitivity = float(50.0)
+
+    def as_dict(self):
+        return self.__dict__
+
+    def __str__(self):
+        return str(self.identifier)
+
+    def set_from_loaded_dict(self, loaded_dict):
+        for key, value in loaded_dict.items():
+            self.__setattr__(key, value)
@@ -0,0 +1,73 @@
+import os
+
+from PyQt5 import uic, QtWidgets
+
+from modules.hardwaremanager.hardwaremanager_inputs.joansensodrive_settings import SensoDriveSettings
+
+
+class SensoDriveSettingsDialog(QtWidgets.QDialog):
+    """
+    Class for the settings Dialog of a SensoDrive, this class should pop up whenever it is asked by the user or when
+    creating the joystick class for the first time. NOTE: it should not show whenever settings are loaded by .json file.
+    """
+
+    def __init__(self, module_manager=None, settings=None, parent=None):
+        super().__init__(parent)
+        self.sensodrive_settings = settings
+        self.module_manager = module_manager
+        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/sensodrive_settings_ui.ui"), self)
+
+        self.button_box_settings.button(self.button_box_settings.RestoreDefaults).clicked.connect(
+            self._set_default_values)
+
+        self.btn_apply.clicked.connect(self.update_parameters)
+
+        self.display_values()
+
+    def update_parameters(self):
+        """
+        Updates the parameters without closing the dialog
+        """
+        self.sensodrive_settings.endstops = self.spin_endstop_position.value()
+        self.sensodrive_settings.torque_limit_between_endstops = self.spin_torque_limit_between_endstops.value()
+        self.sensodrive_settings.torque_limit_beyond_endstops = self.spin_torque_limit_beyond_endstops.value()
+        self.sensodrive_settings.friction = self.spin_friction.value()
+        self.sensodrive_settings.damping = self.spin_damping.value()
+        self.sensodrive_settings.spring_stiffness = self.spin_spring_stiffness.value()
+
+    def accept(self):
+        """
+        Accepts the settings of the sensodrive and saves them internally.
+        :return:
+        """
+        self.sensodrive_settings.endstops = self.spin_endstop_position.value()
+        self.sensodrive_settings.torque_limit_between_endstops = self.spin_torque_limit_between_endstops.value()
+        self.sensodrive_settings.torque_limit_beyond_endstops = self.spin_torque_limit_beyond_endstops.value()
+        self.sensodrive_settings.friction = self.spin_friction.value()
+        self.sensodrive_settings.damping = self.spin_damping.value()
+        self.sensodrive_settings.spring_stiffness = self.spin_spring_stiffness.value()
+
+        super().accept()
+
+    def display_values(self, settings_to_display=None):
+        """
+        Displays the currently used settings in the settings dialog.
+        :param settings_to_display:
+        :return:
+        """
+        if not settings_to_display:
+            settings_to_display = self.sensodrive_settings
+
+        self.spin_endstop_position.setValue(settings_to_display.endstops)
+        self.spin_torque_limit_between_endstops.setValue(settings_to_display.torque_limit_between_endstops)
+        self.spin_torque_limit_beyond_endstops.setValue(settings_to_display.torque_limit_beyond_endstops)
+        self.spin_friction.setValue(settings_to_display.friction)
+        self.spin_damping.setValue(settings_to_display.damping)
+        self.spin_spring_stiffness.setValue(settings_to_display.spring_stiffness)
+
+    def _set_default_values(self):
+        """
+        Sets the settings as they are described in hardwarempsettings ->SensodriveSettings().
+        :return:
+        """
+        self.display_values(SensoDriveSettings())
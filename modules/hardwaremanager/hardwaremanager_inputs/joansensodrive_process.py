@@ -1,13 +1,10 @@
 import math
 import multiprocessing as mp
-import os
 import queue
 import time
 
-from PyQt5 import uic, QtWidgets
-
+from core.latencytrace import TraceHop, carry_trace, start_trace
 from modules.hardwaremanager.hardwaremanager_inputs.PCANBasic import *
-from modules.hardwaremanager.hardwaremanager_inputtypes import HardwareInputTypes
 
 """
 These global parameters are used to make the message ID's more identifiable than just the hex nr.
@@ -65,6 +62,19 @@ class JOANSensoDriveProcess:
         comm.start()
         self.parent_pipe.send(self.settings_dict)
 
+    def reset(self, settings):
+        """
+        Prepares the SensoDrive for the next trial (warm restart), the communication process is kept
+        :param settings: sensodrive settings of the next trial
+        :return:
+        """
+        self.settings_dict = settings.settings_dict_for_pipe()
+
+        self.shared_variables.torque = settings.torque
+        self.shared_variables.friction = settings.friction
+        self.shared_variables.damping = settings.damping
+        self.shared_variables.auto_center_stiffness = settings.spring_stiffness
+
     def update_variables(self):
         """
         Updates the variables in the settings dictionary sent to the communication process
@@ -90,138 +100,17 @@ class JOANSensoDriveProcess:
             self.shared_variables.auto_center_stiffness
 
         self.parent_pipe.send(self.settings_dict)
+        # the torque is handed to the communication process, this is the last hop of the trace of the torque
+        carry_trace(self.shared_variables, 'torque_trace', self.shared_variables, 'torque_trace', TraceHop.TORQUE_APPLIED,
+                    self.shared_variables.trace_latencies()['torque_trace'])
+
         values_from_sensodrive = self.parent_pipe.recv()
         self.shared_variables.steering_angle = values_from_sensodrive['steering_angle']
         self.shared_variables.throttle = values_from_sensodrive['throttle']
         self.shared_variables.brake = values_from_sensodrive['brake']
         self.shared_variables.steering_rate = values_from_sensodrive['steering_rate']
         self.shared_variables.measured_torque = values_from_sensodrive['measured_torque']
-
-
-class SensoDriveSettings:
-    """
-    Default sensodrive settings that will load whenever a keyboardinput class is created.
-    """
-
-    def __init__(self, identifier=''):
-        self.endstops = math.radians(360.0)  # rad
-        self.torque_limit_between_endstops = 200  # percent
-        self.torque_limit_beyond_endstops = 200  # percent
-        self.friction = 0  # Nm
-        self.damping = 0.1  # Nm * s / rad
-        self.spring_stiffness = 1  # Nm / rad
-        self.torque = 0  # Nm
-        self.identifier = identifier
-        self.input_type = HardwareInputTypes.SENSODRIVE.value
-
-        self.current_state = 0x00
-
-        self.settings_dict = {'mp_endstops': self.endstops,  # rad
-                              'mp_torque_limit_between_endstops': self.torque_limit_between_endstops,  # percent
-                              'mp_torque_limit_beyond_endstops': self.torque_limit_beyond_endstops,  # percent
-                              'mp_friction': self.friction,  # Nm
-                              'mp_damping': self.damping,  # Nm * s / rad
-                              'mp_spring_stiffness': self.spring_stiffness,  # Nm / rad
-                              'mp_torque': self.torque,  # Nm
-                              'mp_identifier': self.identifier}
-
-    def as_dict(self):
-        """
-        :return: object as dictionary
-        """
-        return self.__dict__
-
-    def __str__(self):
-        return str(self.identifier)
-
-    def set_from_loaded_dict(self, loaded_dict):
-        """
-        Makes an object with attributes out of a dictionary
-        :param loaded_dict:
-        :return:
-        """
-        for key, value in loaded_dict.items():
-            self.__setattr__(key, value)
-
-    def settings_dict_for_pipe(self):
-        self.settings_dict = {'mp_endstops': self.endstops,  # rad
-                              'mp_torque_limit_between_endstops': self.torque_limit_between_endstops,  # percent
-                              'mp_torque_limit_beyond_endstops': self.torque_limit_beyond_endstops,  # percent
-                              'mp_friction': self.friction,  # Nm
-                              'mp_damping': self.damping,  # Nm * s / rad
-                              'mp_spring_stiffness': self.spring_stiffness,  # Nm / rad
-                              'mp_torque': self.torque,  # Nm
-                              'mp_identifier': self.identifier}
-
-        return self.settings_dict
-
-
-class SensoDriveSettingsDialog(QtWidgets.QDialog):
-    """
-    Class for the settings Dialog of a SensoDrive, this class should pop up whenever it is asked by the user or when
-    creating the joystick class for the first time. NOTE: it should not show whenever settings are loaded by .json file.
-    """
-
-    def __init__(self, module_manager=None, settings=None, parent=None):
-        super().__init__(parent)
-        self.sensodrive_settings = settings
-        self.module_manager = module_manager
-        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/sensodrive_settings_ui.ui"), self)
-
-        self.button_box_settings.button(self.button_box_settings.RestoreDefaults).clicked.connect(
-            self._set_default_values)
-
-        self.btn_apply.clicked.connect(self.update_parameters)
-
-        self.display_values()
-
-    def update_parameters(self):
-        """
-        Updates the parameters without closing the dialog
-        """
-        self.sensodrive_settings.endstops = self.spin_endstop_position.value()
-        self.sensodrive_settings.torque_limit_between_endstops = self.spin_torque_limit_between_endstops.value()
-        self.sensodrive_settings.torque_limit_beyond_endstops = self.spin_torque_limit_beyond_endstops.value()
-        self.sensodrive_settings.friction = self.spin_friction.value()
-        self.sensodrive_settings.damping = self.spin_damping.value()
-        self.sensodrive_settings.spring_stiffness = self.spin_spring_stiffness.value()
-
-    def accept(self):
-        """
-        Accepts the settings of the sensodrive and saves them internally.
-        :return:
-        """
-        self.sensodrive_settings.endstops = self.spin_endstop_position.value()
-        self.sensodrive_settings.torque_limit_between_endstops = self.spin_torque_limit_between_endstops.value()
-        self.sensodrive_settings.torque_limit_beyond_endstops = self.spin_torque_limit_beyond_endstops.value()
-        self.sensodrive_settings.friction = self.spin_friction.value()
-        self.sensodrive_settings.damping = self.spin_damping.value()
-        self.sensodrive_settings.spring_stiffness = self.spin_spring_stiffness.value()
-
-        super().accept()
-
-    def display_values(self, settings_to_display=None):
-        """
-        Displays the currently used settings in the settings dialog.
-        :param settings_to_display:
-        :return:
-        """
-        if not settings_to_display:
-            settings_to_display = self.sensodrive_settings
-
-        self.spin_endstop_position.setValue(settings_to_display.endstops)
-        self.spin_torque_limit_between_endstops.setValue(settings_to_display.torque_limit_between_endstops)
-        self.spin_torque_limit_beyond_endstops.setValue(settings_to_display.torque_limit_beyond_endstops)
-        self.spin_friction.setValue(settings_to_display.friction)
-        self.spin_damping.setValue(settings_to_display.damping)
-        self.spin_spring_stiffness.setValue(settings_to_display.spring_stiffness)
-
-    def _set_default_values(self):
-        """
-        Sets the settings as they are described in hardwarempsettings ->SensodriveSettings().
-        :return:
-        """
-        self.display_values(SensoDriveSettings())
+        start_trace(self.shared_variables, 'input_trace')
 
 
 def clear_queue(q):
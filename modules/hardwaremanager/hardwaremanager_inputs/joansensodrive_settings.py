@@ -0,0 +1,61 @@
+import math
+
+from modules.hardwaremanager.hardwaremanager_inputtypes import HardwareInputTypes
+
+
+class SensoDriveSettings:
+    """
+    Default sensodrive settings that will load whenever a keyboardinput class is created.
+    """
+
+    def __init__(self, identifier=''):
+        self.endstops = math.radians(360.0)  # rad
+        self.torque_limit_between_endstops = 200  # percent
+        self.torque_limit_beyond_endstops = 200  # percent
+        self.friction = 0  # Nm
+        self.damping = 0.1  # Nm * s / rad
+        self.spring_stiffness = 1  # Nm / rad
+        self.torque = 0  # Nm
+        self.identifier = identifier
+        self.input_type = HardwareInputTypes.SENSODRIVE.value
+
+        self.current_state = 0x00
+
+        self.settings_dict = {'mp_endstops': self.endstops,  # rad
+                              'mp_torque_limit_between_endstops': self.torque_limit_between_endstops,  # percent
+                              'mp_torque_limit_beyond_endstops': self.torque_limit_beyond_endstops,  # percent
+                              'mp_friction': self.friction,  # Nm
+                              'mp_damping': self.damping,  # Nm * s / rad
+                              'mp_spring_stiffness': self.spring_stiffness,  # Nm / rad
+                              'mp_torque': self.torque,  # Nm
+                              'mp_identifier': self.identifier}
+
+    def as_dict(self):
+        """
+        :return: object as dictionary
+        """
+        return self.__dict__
+
+    def __str__(self):
+        return str(self.identifier)
+
+    def set_from_loaded_dict(self, loaded_dict):
+        """
+        Makes an object with attributes out of a dictionary
+        :param loaded_dict:
+        :return:
+        """
+        for key, value in loaded_dict.items():
+            self.__setattr__(key, value)
+
+    def settings_dict_for_pipe(self):
+        self.settings_dict = {'mp_endstops': self.endstops,  # rad
+                              'mp_torque_limit_between_endstops': self.torque_limit_between_endstops,  # percent
+                              'mp_torque_limit_beyond_endstops': self.torque_limit_beyond_endstops,  # percent
+                              'mp_friction': self.friction,  # Nm
+                              'mp_damping': self.damping,  # Nm * s / rad
+                              'mp_spring_stiffness': self.spring_stiffness,  # Nm / rad
+                              'mp_torque': self.torque,  # Nm
+                              'mp_identifier': self.identifier}
+
+        return self.settings_dict
@@ -1,6 +1,8 @@
 import enum
 import os
 
+from tools.lazyimport import import_class
+
 
 class HardwareInputTypes(enum.Enum):
     """
@@ -21,25 +23,17 @@ class HardwareInputTypes(enum.Enum):
 
     @property
     def process(self):
-        from modules.hardwaremanager.hardwaremanager_inputs.joankeyboard import JOANKeyboardProcess
-        from modules.hardwaremanager.hardwaremanager_inputs.joanjoystick import JOANJoystickProcess
-        from modules.hardwaremanager.hardwaremanager_inputs.joansensodrive import JOANSensoDriveProcess
-
-        return {HardwareInputTypes.KEYBOARD: JOANKeyboardProcess,
-                HardwareInputTypes.JOYSTICK: JOANJoystickProcess,
-                HardwareInputTypes.SENSODRIVE: JOANSensoDriveProcess
-                }[self]
+        return import_class({HardwareInputTypes.KEYBOARD: 'modules.hardwaremanager.hardwaremanager_inputs.joankeyboard_process.JOANKeyboardProcess',
+                            HardwareInputTypes.JOYSTICK: 'modules.hardwaremanager.hardwaremanager_inputs.joanjoystick_process.JOANJoystickProcess',
+                            HardwareInputTypes.SENSODRIVE: 'modules.hardwaremanager.hardwaremanager_inputs.joansensodrive_process.JOANSensoDriveProcess'
+                            }[self])
 
     @property
     def settings_dialog(self):
-        from modules.hardwaremanager.hardwaremanager_inputs.joankeyboard import KeyBoardSettingsDialog
-        from modules.hardwaremanager.hardwaremanager_inputs.joanjoystick import JoystickSettingsDialog
-        from modules.hardwaremanager.hardwaremanager_inputs.joansensodrive import SensoDriveSettingsDialog
-
-        return {HardwareInputTypes.KEYBOARD: KeyBoardSettingsDialog,
-                HardwareInputTypes.JOYSTICK: JoystickSettingsDialog,
-                HardwareInputTypes.SENSODRIVE: SensoDriveSettingsDialog
-                }[self]
+        return import_class({HardwareInputTypes.KEYBOARD: 'modules.hardwaremanager.hardwaremanager_inputs.joankeyboard_dialog.KeyBoardSettingsDialog',
+                            HardwareInputTypes.JOYSTICK: 'modules.hardwaremanager.hardwaremanager_inputs.joanjoystick_dialog.JoystickSettingsDialog',
+                            HardwareInputTypes.SENSODRIVE: 'modules.hardwaremanager.hardwaremanager_inputs.joansensodrive_dialog.SensoDriveSettingsDialog'
+                            }[self])
 
     @property
     def shared_variables(self):
@@ -63,14 +57,10 @@ class HardwareInputTypes(enum.Enum):
 
     @property
     def settings(self):
-        from modules.hardwaremanager.hardwaremanager_inputs.joankeyboard import KeyBoardSettings
-        from modules.hardwaremanager.hardwaremanager_inputs.joanjoystick import JoyStickSettings
-        from modules.hardwaremanager.hardwaremanager_inputs.joansensodrive import SensoDriveSettings
-
-        return {HardwareInputTypes.KEYBOARD: KeyBoardSettings,
-                HardwareInputTypes.JOYSTICK: JoyStickSettings,
-                HardwareInputTypes.SENSODRIVE: SensoDriveSettings
-                }[self]
+        return import_class({HardwareInputTypes.KEYBOARD: 'modules.hardwaremanager.hardwaremanager_inputs.joankeyboard_settings.KeyBoardSettings',
+                            HardwareInputTypes.JOYSTICK: 'modules.hardwaremanager.hardwaremanager_inputs.joanjoystick_settings.JoyStickSettings',
+                            HardwareInputTypes.SENSODRIVE: 'modules.hardwaremanager.hardwaremanager_inputs.joansensodrive_settings.SensoDriveSettings'
+                            }[self])
 
     def __str__(self):
         return {HardwareInputTypes.KEYBOARD: 'Keyboard',
@@ -22,10 +22,11 @@ class SensoDriveEvents:
 class HardwareManager(ModuleManager):
     """Hardwaremanager keeps track of which inputs are being used with what settings. """
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         super().__init__(module=JOANModules.HARDWARE_MANAGER, news=news, central_settings=central_settings,
-                         signals=signals, central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         signals=signals, central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
         self._hardware_inputs = {}
+        self._sensodrive_events = {}  # SensoDriveEvents per identifier, kept while the process is resident (warm restart)
         self.hardware_input_type = None
         self.hardware_input_settings = None
 
@@ -44,12 +45,20 @@ class HardwareManager(ModuleManager):
         timer that also checks the state of a sensodrive (if there are any)
         :return:
         """
+        # a resident process keeps communicating with the SensoDrives through the events it was started with, a new process gets new events (the
+        # events of the previous trial were set by stop() and may hold stale states)
+        if not self.can_restart_warm():
+            self.end_resident_process()
+            self._sensodrive_events = {}
+
         for hw_input in self.module_settings.inputs.values():
             if hw_input.input_type == HardwareInputTypes.SENSODRIVE.value:
-                hw_input.events = SensoDriveEvents()
+                if hw_input.identifier not in self._sensodrive_events:
+                    self._sensodrive_events[hw_input.identifier] = SensoDriveEvents()
+                hw_input.events = self._sensodrive_events[hw_input.identifier]
 
         for inputs in self.module_settings.inputs.values():
-            if inputs.input_type == HardwareInputTypes.SENSODRIVE.value:
+            if inputs.input_type == HardwareInputTypes.SENSODRIVE.value and self.module_dialog:
                 self.module_dialog.update_timer.timeout.connect(self.module_dialog.update_sensodrive_state)
                 self.module_dialog.update_timer.start()
         super().get_ready()
@@ -80,10 +89,34 @@ class HardwareManager(ModuleManager):
             if inputs.input_type == HardwareInputTypes.SENSODRIVE.value:
                 if hasattr(inputs,'events'):
                     inputs.events.turn_off_event.set()
-                    inputs.events.close_event.set()
+                    if not self.warm_restart:
+                        inputs.events.close_event.set()
                     del inputs.events
         super().stop()
 
+    def end_resident_process(self):
+        """
+        Closes the communication with the SensoDrives of the resident process before ending it
+        :return:
+        """
+        if self.has_resident_process:
+            for events in self._sensodrive_events.values():
+                events.close_event.set()
+        self._sensodrive_events = {}
+        super().end_resident_process()
+
+    def settings_for_process(self):
+        """
+        The SensoDrive events cannot be sent through the pipe, the resident process keeps the ones it was started with
+        :return:
+        """
+        settings = super().settings_for_process()
+        inputs = settings[str(self.module)]['inputs']
+        for identifier, input_settings in inputs.items():
+            inputs[identifier] = {key: value for key, value in input_settings.items() if key != 'events'}
+
+        return settings
+
     def load_from_file(self, settings_file_to_load):
         """
         Loads Settings from json file
@@ -115,7 +148,8 @@ class HardwareManager(ModuleManager):
         input_settings = self.module_settings.add_hardware_input(input_type, input_settings)
 
         # add to module_dialog
-        self.module_dialog.add_hardware_input(input_settings, from_button)
+        if self.module_dialog:
+            self.module_dialog.add_hardware_input(input_settings, from_button)
 
     def remove_hardware_input(self, identifier):
         """
@@ -127,7 +161,8 @@ class HardwareManager(ModuleManager):
         self.module_settings.remove_hardware_input(identifier)
 
         # remove settings from dialog
-        self.module_dialog.remove_hardware_input(identifier)
+        if self.module_dialog:
+            self.module_dialog.remove_hardware_input(identifier)
 
     def turn_on_sensodrive(self, identifier):
         """
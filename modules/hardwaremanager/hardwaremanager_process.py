@@ -1,4 +1,5 @@
 from core.module_process import ModuleProcess
+from core.spanrecorder import span
 from modules.hardwaremanager.hardwaremanager_inputtypes import HardwareInputTypes
 from modules.joanmodules import JOANModules
 
@@ -34,6 +35,14 @@ class HardwareManagerProcess(ModuleProcess):
                                                                                    self._module_shared_variables.inputs[
                                                                                        key])
 
+    def reset(self):
+        """
+        Keeps the input objects (keyboard hooks, joystick and SensoDrive connections) for the next trial and only gives them their new settings
+        :return:
+        """
+        for key, value in self._settings_as_object.inputs.items():
+            self.input_objects[key].reset(settings=value)
+
     def do_while_running(self):
         """
         Loops when the module is running on the rate defined by the time_step_in_ms.
@@ -41,4 +50,5 @@ class HardwareManagerProcess(ModuleProcess):
         """
         for inputs in self.input_objects:
             # will perform the mp input class for each available input
-            self.input_objects[inputs].do()
+            with span(inputs):
+                self.input_objects[inputs].do()
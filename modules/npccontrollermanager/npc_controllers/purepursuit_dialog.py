@@ -0,0 +1,70 @@
+import os
+import glob
+
+from PyQt5 import QtWidgets, uic
+
+from modules.npccontrollermanager.npc_controllers.purepursuit_settings import PurePursuitSettings
+from modules.npccontrollermanager.npccontrollertypes import NPCControllerTypes
+
+
+class PurePursuitSettingsDialog(QtWidgets.QDialog):
+    def __init__(self, module_manager, settings: PurePursuitSettings, parent=None):
+        super().__init__(parent=parent)
+        self.module_manager = module_manager
+        self.pure_pursuit_settings = settings
+        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/pure_pursuit_settings_ui.ui"), self)
+
+        self.button_box_settings.button(self.button_box_settings.RestoreDefaults).clicked.connect(
+            self._set_default_values)
+        self.dynamicLADCheckBox.stateChanged.connect(self._update_static_dynamic_look_ahead_distance)
+        self._fill_trajectory_combobox()
+        self.display_values()
+
+        self.show()
+
+    def accept(self):
+        self.pure_pursuit_settings.reference_trajectory_name = self.trajectoryComboBox.currentText()
+        self.pure_pursuit_settings.static_look_ahead_distance = self.staticLADDoubleSpinBox.value()
+        self.pure_pursuit_settings.use_dynamic_look_ahead_distance = self.dynamicLADCheckBox.isChecked()
+        self.pure_pursuit_settings.steering_gain = self.steeringGainDoubleSpinBox.value()
+        self.pure_pursuit_settings.dynamic_lad_a = self.aDoubleSpinBox.value()
+        self.pure_pursuit_settings.dynamic_lad_b = self.bDoubleSpinBox.value()
+        self.pure_pursuit_settings.kp = self.kpDoubleSpinBox.value()
+        self.pure_pursuit_settings.kd = self.kdDoubleSpinBox.value()
+
+        super().accept()
+
+    def display_values(self, settings=None):
+        if not settings:
+            settings = self.pure_pursuit_settings
+
+        self.trajectoryComboBox.setCurrentIndex(self.trajectoryComboBox.findText(settings.reference_trajectory_name))
+        self.staticLADDoubleSpinBox.setValue(settings.static_look_ahead_distance)
+        self.dynamicLADCheckBox.setChecked(settings.use_dynamic_look_ahead_distance)
+        self.steeringGainDoubleSpinBox.setValue(settings.steering_gain)
+        self.aDoubleSpinBox.setValue(settings.dynamic_lad_a)
+        self.bDoubleSpinBox.setValue(settings.dynamic_lad_b)
+        self.kpDoubleSpinBox.setValue(settings.kp)
+        self.kdDoubleSpinBox.setValue(settings.kd)
+
+    def _update_static_dynamic_look_ahead_distance(self):
+        use_dynamic = self.dynamicLADCheckBox.isChecked()
+
+        self.staticLADLabel.setEnabled(not use_dynamic)
+        self.staticLADDoubleSpinBox.setEnabled(not use_dynamic)
+        self.LADExplanationLabel.setEnabled(use_dynamic)
+        self.aLabel.setEnabled(use_dynamic)
+        self.bLabel.setEnabled(use_dynamic)
+        self.aDoubleSpinBox.setEnabled(use_dynamic)
+        self.bDoubleSpinBox.setEnabled(use_dynamic)
+
+    def _set_default_values(self):
+        self.display_values(NPCControllerTypes.PURE_PURSUIT.settings())
+
+    def _fill_trajectory_combobox(self):
+        self.trajectoryComboBox.addItem(' ')
+
+        path_trajectory_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'trajectories')
+        file_names = glob.glob(os.path.join(path_trajectory_directory, '*.csv'))
+        for file in file_names:
+            self.trajectoryComboBox.addItem(os.path.basename(file))
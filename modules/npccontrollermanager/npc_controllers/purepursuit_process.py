@@ -1,14 +1,10 @@
 import os
-import glob
-import copy
-from enum import Enum
 
 import numpy as np
-from PyQt5 import QtWidgets, uic
 
+from core.spanrecorder import span
 from modules.carlainterface.carlainterface_sharedvariables import CarlaInterfaceSharedVariables
 from modules.npccontrollermanager.npccontrollermanager_sharedvariables import NPCControllerSharedVariables
-from modules.npccontrollermanager.npccontrollertypes import NPCControllerTypes
 from tools import AveragedFloat
 
 
@@ -30,6 +26,7 @@ class PurePursuitControllerProcess:
         self.last_velocity_error = 0.
         self.last_control_time_stamp = 0
         self.error_rate = AveragedFloat()
+        self._vehicle_snapshot = None  # reused every tick, such that reading the vehicle state does not allocate
 
         self._max_steering_angle = self.carla_interface_shared_variables.agents[
             self.settings.vehicle_id].max_steering_angle
@@ -53,7 +50,8 @@ class PurePursuitControllerProcess:
 
         if self.rear_axle_position.any() and dt:
             self.last_control_time_stamp = time_stamp
-            closest_way_point_index = self._find_closest_way_point(self.rear_axle_position)
+            with span('find_closest_way_point'):
+                closest_way_point_index = self._find_closest_way_point(self.rear_axle_position)
 
             if np.linalg.norm(self._trajectory[closest_way_point_index, 1:3] - self.rear_axle_position[
                                                                                0:2]) > self.look_ahead_distance:
@@ -175,112 +173,10 @@ class PurePursuitControllerProcess:
         print('Loaded trajectory = ', self.settings.reference_trajectory_name)
 
     def _get_current_state(self):
-        rear_axle_position = self.carla_interface_shared_variables.agents[self.settings.vehicle_id].rear_axle_position
-        vehicle_velocity = self.carla_interface_shared_variables.agents[
-            self.settings.vehicle_id].velocities_in_vehicle_frame
-        vehicle_orientation = self.carla_interface_shared_variables.agents[self.settings.vehicle_id].transform[3:6]
+        self._vehicle_snapshot = self.carla_interface_shared_variables.agents[self.settings.vehicle_id].snapshot(into=self._vehicle_snapshot)
+        rear_axle_position = self._vehicle_snapshot.rear_axle_position_view()
+        vehicle_velocity = self._vehicle_snapshot.velocities_in_vehicle_frame_view()
+        vehicle_orientation = self._vehicle_snapshot.transform_view()[3:6]
         time_stamp = self.carla_interface_shared_variables.time
 
-        return np.array(rear_axle_position), np.array(vehicle_velocity), np.array(vehicle_orientation), time_stamp
-
-
-class PurePursuitSettings:
-    def __init__(self):
-        self.controller_type = NPCControllerTypes.PURE_PURSUIT
-
-        self.kp = 1.5
-        self.kd = 0.0
-
-        self.use_dynamic_look_ahead_distance = True
-        self.static_look_ahead_distance = 15.0
-        self.steering_gain = 4.
-
-        # a dynamic look ahead distance is calculated as LAD = a * v + b where v is velocity
-        self.dynamic_lad_a = 0.5
-        self.dynamic_lad_b = 8.0
-
-        # reference trajectory
-        self.reference_trajectory_name = 'demo_map_human_trajectory.csv'
-
-        # vehicle to control
-        self.vehicle_id = ''
-
-    def as_dict(self):
-        return_dict = copy.copy(self.__dict__)
-        for key, item in self.__dict__.items():
-            if isinstance(item, Enum):
-                return_dict[key] = item.value
-        return return_dict
-
-    def __str__(self):
-        return str('Pure Pursuit Controller Settings')
-
-    def set_from_loaded_dict(self, loaded_dict):
-        for key, value in loaded_dict.items():
-            if key == 'controller_type':
-                self.__setattr__(key, NPCControllerTypes(value))
-            else:
-                self.__setattr__(key, value)
-
-
-class PurePursuitSettingsDialog(QtWidgets.QDialog):
-    def __init__(self, module_manager, settings: PurePursuitSettings, parent=None):
-        super().__init__(parent=parent)
-        self.module_manager = module_manager
-        self.pure_pursuit_settings = settings
-        uic.loadUi(os.path.join(os.path.dirname(os.path.realpath(__file__)), "ui/pure_pursuit_settings_ui.ui"), self)
-
-        self.button_box_settings.button(self.button_box_settings.RestoreDefaults).clicked.connect(
-            self._set_default_values)
-        self.dynamicLADCheckBox.stateChanged.connect(self._update_static_dynamic_look_ahead_distance)
-        self._fill_trajectory_combobox()
-        self.display_values()
-
-        self.show()
-
-    def accept(self):
-        self.pure_pursuit_settings.reference_trajectory_name = self.trajectoryComboBox.currentText()
-        self.pure_pursuit_settings.static_look_ahead_distance = self.staticLADDoubleSpinBox.value()
-        self.pure_pursuit_settings.use_dynamic_look_ahead_distance = self.dynamicLADCheckBox.isChecked()
-        self.pure_pursuit_settings.steering_gain = self.steeringGainDoubleSpinBox.value()
-        self.pure_pursuit_settings.dynamic_lad_a = self.aDoubleSpinBox.value()
-        self.pure_pursuit_settings.dynamic_lad_b = self.bDoubleSpinBox.value()
-        self.pure_pursuit_settings.kp = self.kpDoubleSpinBox.value()
-        self.pure_pursuit_settings.kd = self.kdDoubleSpinBox.value()
-
-        super().accept()
-
-    def display_values(self, settings=None):
-        if not settings:
-            settings = self.pure_pursuit_settings
-
-        self.trajectoryComboBox.setCurrentIndex(self.trajectoryComboBox.findText(settings.reference_trajectory_name))
-        self.staticLADDoubleSpinBox.setValue(settings.static_look_ahead_distance)
-        self.dynamicLADCheckBox.setChecked(settings.use_dynamic_look_ahead_distance)
-        self.steeringGainDoubleSpinBox.setValue(settings.steering_gain)
-        self.aDoubleSpinBox.setValue(settings.dynamic_lad_a)
-        self.bDoubleSpinBox.setValue(settings.dynamic_lad_b)
-        self.kpDoubleSpinBox.setValue(settings.kp)
-        self.kdDoubleSpinBox.setValue(settings.kd)
-
-    def _update_static_dynamic_look_ahead_distance(self):
-        use_dynamic = self.dynamicLADCheckBox.isChecked()
-
-        self.staticLADLabel.setEnabled(not use_dynamic)
-        self.staticLADDoubleSpinBox.setEnabled(not use_dynamic)
-        self.LADExplanationLabel.setEnabled(use_dynamic)
-        self.aLabel.setEnabled(use_dynamic)
-        self.bLabel.setEnabled(use_dynamic)
-        self.aDoubleSpinBox.setEnabled(use_dynamic)
-        self.bDoubleSpinBox.setEnabled(use_dynamic)
-
-    def _set_default_values(self):
-        self.display_values(NPCControllerTypes.PURE_PURSUIT.settings())
-
-    def _fill_trajectory_combobox(self):
-        self.trajectoryComboBox.addItem(' ')
-
-        path_trajectory_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'trajectories')
-        file_names = glob.glob(os.path.join(path_trajectory_directory, '*.csv'))
-        for file in file_names:
-            self.trajectoryComboBox.addItem(os.path.basename(file))
+        return rear_axle_position, vehicle_velocity, vehicle_orientation, time_stamp
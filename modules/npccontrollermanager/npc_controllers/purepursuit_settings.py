@@ -0,0 +1,43 @@
+import copy
+from enum import Enum
+
+from modules.npccontrollermanager.npccontrollertypes import NPCControllerTypes
+
+
+class PurePursuitSettings:
+    def __init__(self):
+        self.controller_type = NPCControllerTypes.PURE_PURSUIT
+
+        self.kp = 1.5
+        self.kd = 0.0
+
+        self.use_dynamic_look_ahead_distance = True
+        self.static_look_ahead_distance = 15.0
+        self.steering_gain = 4.
+
+        # a dynamic look ahead distance is calculated as LAD = a * v + b where v is velocity
+        self.dynamic_lad_a = 0.5
+        self.dynamic_lad_b = 8.0
+
+        # reference trajectory
+        self.reference_trajectory_name = 'demo_map_human_trajectory.csv'
+
+        # vehicle to control
+        self.vehicle_id = ''
+
+    def as_dict(self):
+        return_dict = copy.copy(self.__dict__)
+        for key, item in self.__dict__.items():
+            if isinstance(item, Enum):
+                return_dict[key] = item.value
+        return return_dict
+
+    def __str__(self):
+        return str('Pure Pursuit Controller Settings')
+
+    def set_from_loaded_dict(self, loaded_dict):
+        for key, value in loaded_dict.items():
+            if key == 'controller_type':
+                self.__setattr__(key, NPCControllerTypes(value))
+            else:
+                self.__setattr__(key, value)
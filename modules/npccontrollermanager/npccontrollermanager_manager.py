@@ -2,15 +2,18 @@ from core.module_manager import ModuleManager
 from modules.joanmodules import JOANModules
 from modules.npccontrollermanager.npccontrollermanager_settings import NPCControllerManagerSettings
 from modules.npccontrollermanager.npccontrollertypes import NPCControllerTypes
-from modules.carlainterface.carlainterface_agentclasses.npc_vehicle import NPCVehicleSettings
+from modules.carlainterface.carlainterface_agentclasses.npc_vehicle_settings import NPCVehicleSettings
 
 
 class NPCControllerManager(ModuleManager):
     module_settings: NPCControllerManagerSettings
 
-    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None):
+    # the controllers read the vehicles that are spawned by the carla interface process when they get ready
+    get_ready_after = (JOANModules.CARLA_INTERFACE,)
+
+    def __init__(self, news, central_settings, signals, central_state_monitor, time_step_in_ms=10, parent=None, headless=False):
         super().__init__(module=JOANModules.NPC_CONTROLLER_MANAGER, news=news, central_settings=central_settings,
-                         signals=signals, central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent)
+                         signals=signals, central_state_monitor=central_state_monitor, time_step_in_ms=time_step_in_ms, parent=parent, headless=headless)
         self.controller_identifiers = []
 
     def initialize(self):
@@ -37,16 +40,19 @@ class NPCControllerManager(ModuleManager):
         self.module_settings.load_from_file(settings_file_to_load)
 
         # add all settings tp module_dialog
-        for controller_settings in self.module_settings.all_controllers().values():
-            self.module_dialog.add_controller(controller_settings)
+        if self.module_dialog:
+            for controller_settings in self.module_settings.all_controllers().values():
+                self.module_dialog.add_controller(controller_settings)
 
     def add_controller(self, controller_type: NPCControllerTypes, show_settings_dialog=False):
         identifier, controller_settings = self.module_settings.add_new_controller(controller_type)
-        self.module_dialog.add_controller(identifier, controller_settings, show_settings_dialog)
+        if self.module_dialog:
+            self.module_dialog.add_controller(identifier, controller_settings, show_settings_dialog)
 
     def remove_controller(self, identifier):
         self.module_settings.remove_controller(identifier)
-        self.module_dialog.remove_controller(identifier)
+        if self.module_dialog:
+            self.module_dialog.remove_controller(identifier)
 
     @property
     def all_controller_identifiers(self):
@@ -1,4 +1,5 @@
 from core.module_process import ModuleProcess
+from core.spanrecorder import span
 from modules.joanmodules import JOANModules
 
 
@@ -30,5 +31,6 @@ class NPCControllerManagerProcess(ModuleProcess):
         Loops when the module is running on the rate defined by the time_step_in_ms.
         :return:
         """
-        for _, controller in self.controller_sub_processes.items():
-            controller.do()
+        for identifier, controller in self.controller_sub_processes.items():
+            with span(identifier):
+                controller.do()
@@ -1,6 +1,8 @@
 import enum
 import os
 
+from tools.lazyimport import import_class
+
 
 class NPCControllerTypes(enum.Enum):
     """
@@ -19,17 +21,13 @@ class NPCControllerTypes(enum.Enum):
 
     @property
     def process(self):
-        from modules.npccontrollermanager.npc_controllers.purepursuit import PurePursuitControllerProcess
-
-        return {NPCControllerTypes.PURE_PURSUIT: PurePursuitControllerProcess,
-                }[self]
+        return import_class({NPCControllerTypes.PURE_PURSUIT: 'modules.npccontrollermanager.npc_controllers.purepursuit_process.PurePursuitControllerProcess',
+                            }[self])
 
     @property
     def settings_dialog(self):
-        from modules.npccontrollermanager.npc_controllers.purepursuit import PurePursuitSettingsDialog
-
-        return {NPCControllerTypes.PURE_PURSUIT: PurePursuitSettingsDialog,
-                }[self]
+        return import_class({NPCControllerTypes.PURE_PURSUIT: 'modules.npccontrollermanager.npc_controllers.purepursuit_dialog.PurePursuitSettingsDialog',
+                            }[self])
 
     @property
     def shared_variables(self):
@@ -46,10 +44,8 @@ class NPCControllerTypes(enum.Enum):
 
     @property
     def settings(self):
-        from modules.npccontrollermanager.npc_controllers.purepursuit import PurePursuitSettings
-
-        return {NPCControllerTypes.PURE_PURSUIT: PurePursuitSettings,
-                }[self]
+        return import_class({NPCControllerTypes.PURE_PURSUIT: 'modules.npccontrollermanager.npc_controllers.purepursuit_settings.PurePursuitSettings',
+                            }[self])
 
     def __str__(self):
         return {NPCControllerTypes.PURE_PURSUIT: "Pure Pursuit",
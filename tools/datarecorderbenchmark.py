@@ -0,0 +1,171 @@
+"""
+Throughput benchmark of the data recorder: the number of rows per second in which the variables to be saved are read and formatted, with the
+variables resolved from scratch for every row (as the data recorder did before) and with the compiled AccessorPlan (as it does now), and the
+number of rows per second written to a binary recording (read into a row and appended, without formatting text). The shared variables of a carla
+interface with a number of vehicles and a hardware manager with a number of inputs are created in this process, all their variables are recorded.
+Both methods are checked to give the same rows, and the binary recording to export (joan-export) to the same rows as well. The size of a row in
+CSV and in the binary recording is reported too, with the float variables filled with random values.
+
+Usage (from the JOAN directory):
+    python -m tools.datarecorderbenchmark [--vehicles 10] [--inputs 4] [--rows 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from core.news import News
+from core.sharedvariables import SharedVariables
+from modules.carlainterface.carlainterface_agenttypes import AgentTypes
+from modules.datarecorder.datarecorder_accessorplan import AccessorPlan
+from modules.datarecorder.datarecorder_recording import RecordingReader, RecordingWriter
+from modules.hardwaremanager.hardwaremanager_inputtypes import HardwareInputTypes
+from modules.joanmodules import JOANModules
+from tools.joanexport import export_csv
+
+
+def resolved_row(variables_to_be_saved, news):
+    """
+    A row as the data recorder made it before the AccessorPlan: every variable is resolved from scratch
+    """
+    row = []
+    snapshots = {}
+    for variable in variables_to_be_saved:
+        module = JOANModules.from_string_representation(variable[0])
+        last_object = news.read_news(module)
+
+        for attribute_name in variable[1:]:
+            if isinstance(last_object, SharedVariables):
+                if id(last_object) not in snapshots:
+                    snapshots[id(last_object)] = last_object.snapshot()
+                last_object = snapshots[id(last_object)]
+
+            if isinstance(last_object, dict):
+                last_object = last_object[attribute_name]
+            elif isinstance(last_object, list):
+                last_object = last_object[int(attribute_name)]
+            else:
+                last_object = getattr(last_object, attribute_name)
+
+        row.append(str(last_object))
+
+    return '; '.join(row)
+
+
+def planned_row(accessor_plan):
+    return '; '.join(map(str, accessor_plan.read_row()))
+
+
+def binary_rows_per_second(accessor_plan, rows, file_path):
+    """
+    :return: rows per second written to a binary recording, and the size of a row in the recording in bytes
+    """
+    with RecordingWriter(file_path, accessor_plan.channels) as recording_writer:
+        accessor_plan.bind(recording_writer.row)
+
+        def write_row():
+            accessor_plan.read_into_row()
+            recording_writer.append(time.time_ns())
+
+        return rows_per_second(write_row, rows), recording_writer.row.dtype.itemsize
+
+
+def all_variables(path, value):
+    """
+    :return: the paths of all variables in a shared variables tree, like the tree in the data recorder dialog
+    """
+    if isinstance(value, SharedVariables):
+        variables = [path + [prop] for prop in value.get_all_properties()]
+        for key, inner_value in value.__dict__.items():
+            if key[0] != '_' and not callable(inner_value):
+                variables.extend(all_variables(path + [key], inner_value))
+        return variables
+    elif isinstance(value, dict):
+        return [variable for key, inner_value in value.items() for variable in all_variables(path + [key], inner_value)]
+
+    return [path]
+
+
+def fill_with_values(shared_variables, random_generator):
+    """
+    Give all float variables a value as in a trial (their length in CSV depends on it, zeros would make the CSV rows unrealistically short)
+    """
+    for field in shared_variables.fields():
+        view = shared_variables.view(field.name, writable=True)
+        if view.dtype.kind == 'f':
+            view[...] = random_generator.uniform(-100.0, 100.0, view.shape)
+
+
+def create_news(number_of_vehicles, number_of_inputs):
+    news = News()
+    random_generator = np.random.default_rng(0)
+
+    carla_interface_variables = JOANModules.CARLA_INTERFACE.shared_variables()
+    for index in range(number_of_vehicles):
+        carla_interface_variables.agents['NPC Vehicle_%d' % (index + 1)] = AgentTypes.NPC_VEHICLE.shared_variables()
+        fill_with_values(carla_interface_variables.agents['NPC Vehicle_%d' % (index + 1)], random_generator)
+    news.write_news(JOANModules.CARLA_INTERFACE, carla_interface_variables)
+
+    hardware_manager_variables = JOANModules.HARDWARE_MANAGER.shared_variables()
+    for index in range(number_of_inputs):
+        hardware_manager_variables.inputs['Keyboard_%d' % (index + 1)] = HardwareInputTypes.KEYBOARD.shared_variables()
+        fill_with_values(hardware_manager_variables.inputs['Keyboard_%d' % (index + 1)], random_generator)
+    news.write_news(JOANModules.HARDWARE_MANAGER, hardware_manager_variables)
+
+    return news
+
+
+def rows_per_second(make_row, rows):
+    t0 = time.perf_counter()
+    for _ in range(rows):
+        make_row()
+    return rows / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rows per second of the data recorder, with and without the compiled accessor plan')
+    parser.add_argument('--vehicles', type=int, default=10, help='number of vehicles of the carla interface (default: 10)')
+    parser.add_argument('--inputs', type=int, default=4, help='number of inputs of the hardware manager (default: 4)')
+    parser.add_argument('--rows', type=int, default=2000, help='number of rows per measurement (default: 2000)')
+    arguments = parser.parse_args()
+
+    news = create_news(arguments.vehicles, arguments.inputs)
+    variables_to_be_saved = []
+    for module in (JOANModules.CARLA_INTERFACE, JOANModules.HARDWARE_MANAGER):
+        variables_to_be_saved.extend(all_variables([str(module)], news.read_news(module)))
+
+    t0 = time.perf_counter()
+    accessor_plan = AccessorPlan(variables_to_be_saved, news)
+    compile_time = time.perf_counter() - t0
+
+    if resolved_row(variables_to_be_saved, news) != planned_row(accessor_plan):
+        raise AssertionError('The accessor plan gives a different row than resolving the variables')
+
+    resolved = rows_per_second(lambda: resolved_row(variables_to_be_saved, news), arguments.rows)
+    planned = rows_per_second(lambda: planned_row(accessor_plan), arguments.rows)
+
+    with tempfile.TemporaryDirectory() as directory:
+        recording_path = os.path.join(directory, 'benchmark.joanrec')
+        binary, row_size = binary_rows_per_second(accessor_plan, arguments.rows, recording_path)
+
+        csv_path = os.path.join(directory, 'benchmark.csv')
+        export_csv(RecordingReader(recording_path), csv_path, with_time=False)
+        with open(csv_path) as csv_file:
+            exported_rows = csv_file.read().splitlines()
+        if exported_rows[1:] != [planned_row(accessor_plan)] * arguments.rows:
+            raise AssertionError('The exported binary recording gives different rows than the accessor plan')
+        csv_row_size = len(exported_rows[1]) + 1
+
+    print('%d variables of %d shared variables objects, plan compiled in %.1f ms' %
+          (len(variables_to_be_saved), arguments.vehicles + arguments.inputs + 2, compile_time * 1e3))
+    print('%-28s %10.0f rows/s  (%.3f ms per row)' % ('resolved per row (before)', resolved, 1e3 / resolved))
+    print('%-28s %10.0f rows/s  (%.3f ms per row)' % ('accessor plan (after)', planned, 1e3 / planned))
+    print('%-28s %10.0f rows/s  (%.3f ms per row)' % ('binary recording', binary, 1e3 / binary))
+    print('speed-up: %.1fx (accessor plan), %.1fx (binary recording)' % (planned / resolved, binary / resolved))
+    print('row size: %d bytes (CSV), %d bytes (binary), %.1fx smaller' % (csv_row_size, row_size, csv_row_size / row_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+joan-export: convert a binary recording of the data recorder (.joanrec, or the segments of a .joanseg recording) to CSV, NumPy or pandas after the
+trial.
+
+    csv     semicolon-separated, with the same header and cell format as the CSV files of the data recorder, and the time of every row (in ns since
+            the epoch) as first column (unless --without-time)
+    npz     NumPy archive with an array per channel (under its name) and 'time'; load it with numpy.load
+    pandas  pickled DataFrame with a column per channel element and the time as index (.parquet as output extension for Parquet), needs pandas
+
+Usage (from the JOAN directory):
+    python -m tools.joanexport RECORDING [RECORDING ...] [--format csv|npz|pandas] [--output PATH] [--start S] [--end S] [--without-time]
+    python -m tools.joanexport RECORDING --info
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from modules.datarecorder.datarecorder_recording import open_recording
+
+_EXTENSIONS = {'csv': '.csv', 'npz': '.npz', 'pandas': '.pkl'}
+
+
+def _cell_converter(values):
+    """
+    :param values: column of a recording
+    :return: function that formats a value of the column as the data recorder does in CSV files (str of the Python value)
+    """
+    if values.ndim > 1:
+        return lambda value: str(value.tolist())
+    if values.dtype.kind == 'S':
+        return lambda value: str(value, encoding='utf-8')
+    return lambda value: str(value.item())
+
+
+def export_csv(reader, output_path, start_time=None, end_time=None, with_time=True):
+    columns = reader.columns(start_time, end_time)
+    time = columns.pop('time')
+    names = list(columns)
+    converters = [_cell_converter(columns[name]) for name in names]
+
+    with open(output_path, 'w') as file:
+        file.write('; '.join((['time'] if with_time else []) + names) + '\n')
+        for row in range(len(time)):
+            cells = [converter(columns[name][row]) for name, converter in zip(names, converters)]
+            if with_time:
+                cells.insert(0, str(int(time[row])))
+            file.write('; '.join(cells) + '\n')
+
+
+def export_npz(reader, output_path, start_time=None, end_time=None):
+    np.savez(output_path, **reader.columns(start_time, end_time))
+
+
+def export_pandas(reader, output_path, start_time=None, end_time=None):
+    try:
+        data_frame = reader.to_dataframe(start_time, end_time)
+    except ImportError:
+        raise SystemExit('joan-export: exporting to pandas needs pandas, install it (pip install pandas) or export to csv or npz')
+
+    if output_path.endswith('.parquet'):
+        data_frame.to_parquet(output_path)
+    else:
+        data_frame.to_pickle(output_path)
+
+
+def print_info(reader):
+    header = reader.header
+    print('%s: JOAN recording version %d, created %s%s' % (reader.file_path, header['version'], header['created'],
+                                                          ' (not closed, recovered the complete chunks)' if reader.recovered else ''))
+    for key, value in header['metadata'].items():
+        print('  %s: %s' % (key, value))
+
+    chunk_index = reader.chunk_index
+    if len(chunk_index):
+        duration = (int(chunk_index['last_time'][-1]) - int(chunk_index['first_time'][0])) * 1e-9
+        print('%d rows in %d chunks, %.3f s, %d bytes per row' % (reader.number_of_rows, len(chunk_index), duration, reader.dtype.itemsize))
+    else:
+        print('no rows')
+
+    for channel in reader.channels:
+        shape = '[%s]' % ', '.join(str(size) for size in channel['shape']) if channel['shape'] else ''
+        print('  %-60s %s%s %s' % (channel['name'], np.dtype(channel['dtype']).str[1:], shape, channel['units']))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='joan-export', description='Convert binary recordings of the data recorder to CSV, NumPy or pandas')
+    parser.add_argument('recordings', nargs='+', metavar='RECORDING', help='.joanrec file(s), or .joanseg recording(s) or segment(s)')
+    parser.add_argument('--format', choices=sorted(_EXTENSIONS), default='csv', help='output format (default: csv)')
+    parser.add_argument('--output', metavar='PATH', help='output file (only with one recording); default: the recording with the extension of the format')
+    parser.add_argument('--start', type=float, metavar='S', help='only rows from this time on, in s since the first row')
+    parser.add_argument('--end', type=float, metavar='S', help='only rows up to this time, in s since the first row')
+    parser.add_argument('--without-time', action='store_true', help='csv: leave out the time column, as in the CSV files of the data recorder')
+    parser.add_argument('--info', action='store_true', help='only print the channels and the chunk index')
+    arguments = parser.parse_args()
+
+    if arguments.output and len(arguments.recordings) > 1:
+        parser.error('--output can only be used with one recording')
+
+    for file_path in arguments.recordings:
+        reader = open_recording(file_path)
+        if arguments.info:
+            print_info(reader)
+            continue
+
+        # the time range is relative to the first row, the chunk index is used to read only the chunks in the range
+        first_time = int(reader.chunk_index['first_time'][0]) if len(reader.chunk_index) else 0
+        start_time = first_time + int(arguments.start * 1e9) if arguments.start is not None else None
+        end_time = first_time + int(arguments.end * 1e9) if arguments.end is not None else None
+
+        output_path = arguments.output or os.path.splitext(reader.file_path)[0] + _EXTENSIONS[arguments.format]
+        if arguments.format == 'csv':
+            export_csv(reader, output_path, start_time, end_time, with_time=not arguments.without_time)
+        elif arguments.format == 'npz':
+            export_npz(reader, output_path, start_time, end_time)
+        else:
+            export_pandas(reader, output_path, start_time, end_time)
+
+        print('%s -> %s%s' % (reader.file_path, output_path, ' (recovered, the recording was not closed)' if reader.recovered else ''))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+joan-recover: check a crash-safe recording of the data recorder (the segments of a .joanseg recording) and convert it into one binary recording
+(.joanrec) with everything up to the last committed row, e.g. after JOAN crashed during a trial. The segments are not changed.
+
+Usage (from the JOAN directory):
+    python -m tools.joanrecover RECORDING [--output PATH] [--check]
+
+RECORDING is the recording (joan_data.joanseg) or any of its segments (joan_data.0000.joanseg). Convert the result with joan-export
+(python -m tools.joanexport), which can also read the segments directly.
+"""
+import argparse
+import os
+import sys
+
+from modules.datarecorder.datarecorder_recording import RecordingWriter
+from modules.datarecorder.datarecorder_segments import SegmentedRecordingReader
+
+
+def print_segments(reader):
+    for path, segment in zip(reader.segment_paths, reader.segments):
+        state = 'closed' if segment['closed'] else 'not closed'
+        if segment['repaired']:
+            state += ', incomplete commit repaired'
+        duration = (segment['last_time'] - segment['first_time']) * 1e-9 if segment['rows'] else 0.0
+        print('  %s: %d committed rows, %.3f s (%s)' % (os.path.basename(path), segment['rows'], duration, state))
+
+    for number in reader.missing_segments:
+        print('  segment %04d is missing' % number)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='joan-recover', description='Recover a crash-safe (.joanseg) recording of the data recorder')
+    parser.add_argument('recording', metavar='RECORDING', help='.joanseg recording or one of its segments')
+    parser.add_argument('--output', metavar='PATH', help='binary recording to write; default: the recording with the extension .joanrec')
+    parser.add_argument('--check', action='store_true', help='only report the state of the segments')
+    arguments = parser.parse_args()
+
+    reader = SegmentedRecordingReader(arguments.recording)
+    print('%s: %d segments, %d committed rows%s' % (reader.file_path, len(reader.segments), reader.number_of_rows,
+                                                    ', the recording was not closed' if reader.recovered else ''))
+    print_segments(reader)
+    if arguments.check:
+        return 0
+
+    output_path = arguments.output or os.path.splitext(reader.file_path)[0] + '.joanrec'
+    metadata = dict(reader.header['metadata'], recovered_from=os.path.basename(reader.file_path), recording_was_closed=not reader.recovered)
+    with RecordingWriter(output_path, reader.channels, metadata=metadata) as recording_writer:
+        recording_writer.write_rows(reader.read())
+
+    print('-> %s' % output_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Module processes must not load Qt or the HQ: with 'spawn' (Windows) every module process imports the entry script (main.py, headless.py) as its
+main module, and then the modules it needs. Therefore the entry scripts, core (HQManager, HQWindow), the exception hook and the type registries
+import Qt, the HQ and the classes of the modules on first use only; tools/startupbenchmark.py checks that no module process loads Qt.
+"""
+import functools
+import importlib
+
+
+@functools.lru_cache(maxsize=None)
+def import_class(path):
+    """
+    Import a class on first use, e.g. for a registry such as HardwareInputTypes.process
+    :param path: dotted path of the class, e.g. 'modules.hardwaremanager.hardwaremanager_inputs.joankeyboard_process.JOANKeyboardProcess'
+    :return: the class
+    """
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
@@ -0,0 +1,170 @@
+"""
+Startup benchmark of the module processes: starts a fresh interpreter per process module (the 'spawn' start method, as on Windows) that imports the
+module and its settings, with the entry script (main.py, or headless.py with --main) as main module of the parent, as JOAN starts them. Reports
+the time until it is ready, the peak memory use and whether Qt was loaded (see tools.lazyimport).
+
+Usage (from the JOAN directory):
+    python -m tools.startupbenchmark [--repeat 5] [--main main.py]
+
+The exit code is 1 if any process module loads Qt, such that the benchmark can be used as a check.
+"""
+import argparse
+import contextlib
+import importlib
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import time
+import types
+
+# process modules and the modules they import in get_ready (settings, agents, inputs and controllers), per module process
+PROCESS_MODULES = {'Hardware Manager': ['modules.hardwaremanager.hardwaremanager_process',
+                                        'modules.hardwaremanager.hardwaremanager_settings',
+                                        'modules.hardwaremanager.hardwaremanager_inputs.joankeyboard_process',
+                                        'modules.hardwaremanager.hardwaremanager_inputs.joankeyboard_settings',
+                                        'modules.hardwaremanager.hardwaremanager_inputs.joanjoystick_process',
+                                        'modules.hardwaremanager.hardwaremanager_inputs.joanjoystick_settings',
+                                        'modules.hardwaremanager.hardwaremanager_inputs.joansensodrive_process',
+                                        'modules.hardwaremanager.hardwaremanager_inputs.joansensodrive_settings'],
+                   'Carla Interface': ['modules.carlainterface.carlainterface_process',
+                                       'modules.carlainterface.carlainterface_settings',
+                                       'modules.carlainterface.carlainterface_agentclasses.ego_vehicle_process',
+                                       'modules.carlainterface.carlainterface_agentclasses.ego_vehicle_settings',
+                                       'modules.carlainterface.carlainterface_agentclasses.npc_vehicle_process',
+                                       'modules.carlainterface.carlainterface_agentclasses.npc_vehicle_settings'],
+                   'Haptic Controller Manager': ['modules.hapticcontrollermanager.hapticcontrollermanager_process',
+                                                 'modules.hapticcontrollermanager.hapticcontrollermanager_settings',
+                                                 'modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller_process',
+                                                 'modules.hapticcontrollermanager.hapticcontrollermanager_controllers.fdcacontroller_settings'],
+                   'NPC Controller Manager': ['modules.npccontrollermanager.npccontrollermanager_process',
+                                              'modules.npccontrollermanager.npccontrollermanager_settings',
+                                              'modules.npccontrollermanager.npc_controllers.purepursuit_process',
+                                              'modules.npccontrollermanager.npc_controllers.purepursuit_settings'],
+                   'Data Recorder': ['modules.datarecorder.datarecorder_process',
+                                     'modules.datarecorder.datarecorder_settings'],
+                   'Data Plotter': ['modules.dataplotter.dataplotter_process',
+                                    'modules.dataplotter.dataplotter_settings'],
+                   'Template': ['modules.template.template_process',
+                                'modules.template.template_settings']}
+
+
+def peak_memory_in_mb():
+    """
+    :return: peak resident set size of the calling process (MB), None if it cannot be determined
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, kB on Linux
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, 'peak_wset', memory_info.rss) / 1024 ** 2  # peak working set on Windows
+    except ImportError:
+        return None
+
+
+def _import_modules(module_names, result_pipe):
+    """
+    Runs in the benchmarked process: import the modules and send the result
+    """
+    t0 = time.perf_counter()
+    missing_dependencies = []
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as error:  # e.g. carla, hid or keyboard is not installed, the module is then skipped
+            missing_dependencies.append('%s (%s)' % (module_name.rpartition('.')[2], error))
+
+    result_pipe.send({'import_time': time.perf_counter() - t0,
+                      'peak_memory': peak_memory_in_mb(),
+                      'qt_loaded': sorted(name for name in sys.modules if name.startswith('PyQt5')),
+                      'missing_dependencies': missing_dependencies})
+
+
+@contextlib.contextmanager
+def parent_main_module(file_path):
+    """
+    Let the processes that are started in this context import file_path as the main module of their parent (__mp_main__), as the module processes of
+    JOAN import main.py (or headless.py)
+    :param file_path: entry script
+    """
+    main_module = types.ModuleType('__main__')
+    main_module.__file__ = os.path.abspath(file_path)
+    main_module.__spec__ = None  # spawn imports the main module from its path, not by name
+
+    original_main_module = sys.modules['__main__']
+    sys.modules['__main__'] = main_module
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = original_main_module
+
+
+def benchmark(module_names, repeat, main_path):
+    """
+    :param module_names: modules that are imported in each started process
+    :param repeat: number of processes that are started
+    :param main_path: entry script that the started processes import as the main module of their parent
+    :return: list with a result dict per started process, with the time from start() until the modules were imported ('ready_time', s)
+    """
+    # the target is pickled by name, and this file is not the main module of the parent (see parent_main_module)
+    target = importlib.import_module('tools.startupbenchmark')._import_modules
+
+    context = mp.get_context('spawn')
+    results = []
+    for _ in range(repeat):
+        receiving_pipe, sending_pipe = context.Pipe(duplex=False)
+        process = context.Process(target=target, args=(module_names, sending_pipe), daemon=True)
+
+        t0 = time.perf_counter()
+        with parent_main_module(main_path):
+            process.start()
+        sending_pipe.close()  # such that recv() fails when the process ends without a result
+        try:
+            result = receiving_pipe.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError('The benchmarked process ended before it was ready (exit code %s), does %s import without errors?'
+                               % (process.exitcode, main_path))
+        result['ready_time'] = time.perf_counter() - t0
+
+        process.join()
+        results.append(result)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup time and memory use of the JOAN module processes')
+    parser.add_argument('--repeat', type=int, default=5, help='number of processes started per module (default: 5)')
+    parser.add_argument('--main', default='main.py', metavar='FILE', help='entry script of JOAN, the main module of the parent (default: main.py)')
+    arguments = parser.parse_args()
+
+    # the baseline is an empty process (that only imports the entry script), the difference is what the module itself costs
+    print('Module processes started from %s' % arguments.main)
+    print('%-28s %12s %12s %14s  %s' % ('Module process', 'ready (ms)', 'import (ms)', 'peak RSS (MB)', 'Qt loaded'))
+    qt_loaded_anywhere = False
+    for name, module_names in [('(empty process)', [])] + list(PROCESS_MODULES.items()):
+        results = benchmark(module_names, arguments.repeat, arguments.main)
+        peak_memories = [result['peak_memory'] for result in results if result['peak_memory'] is not None]
+        qt_loaded = results[0]['qt_loaded']
+        qt_loaded_anywhere |= bool(qt_loaded)
+
+        print('%-28s %12.0f %12.0f %14s  %s' % (name,
+                                                 statistics.median(result['ready_time'] for result in results) * 1e3,
+                                                 statistics.median(result['import_time'] for result in results) * 1e3,
+                                                 '%.1f' % statistics.median(peak_memories) if peak_memories else 'n/a',
+                                                 'YES (%s)' % ', '.join(qt_loaded) if qt_loaded else 'no'))
+        for missing_dependency in results[0]['missing_dependencies']:
+            print('    not imported: %s' % missing_dependency)
+
+    return 1 if qt_loaded_anywhere else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())